@@ -7,8 +7,9 @@ def main(params: dict):
         ##Set the variables
         file_path: str = params.get("file_path")
         sheet_name: str = params.get("sheet_name")
-        col_idx1: int = int(params.get("col_idx1"))
-        col_idx2: int = int(params.get("col_idx2"))
+        ##Several key/value pairs can be given separated by commas ("0,5" and "18,20")
+        keys_idx: list[int] = [int(i) for i in str(params.get("col_idx1")).split(",")]
+        values_idx: list[int] = [int(i) for i in str(params.get("col_idx2")).split(",")]
         inconsistencies_file: str = params.get("in_file")
         new_sheet: str = params.get("new_sheet")
         need_iaxis: bool = bool(params.get("need_iaxis"))
@@ -16,9 +17,6 @@ def main(params: dict):
         except_idx = int(params.get("except_idx"))
         sheet_name_list = params.get("sheet_name_list")
 
-        ##Local variables
-        validated_values: dict = {}
-
         ##Validate if all the required inputs are present
         if not all(
             [
@@ -31,6 +29,9 @@ def main(params: dict):
             ]
         ):
             return "Error: an input param is missing"
+        if len(keys_idx) != len(values_idx):
+            return "Error: col_idx1 and col_idx2 must have the same number of columns"
+        pairs: list[tuple[int, int]] = list(zip(keys_idx, values_idx))
 
         ##Read the book and load it
         df: pd.DataFrame = pd.read_excel(
@@ -39,58 +40,43 @@ def main(params: dict):
         list_df: pd.DataFrame = pd.read_excel(
             list_file, sheet_name=sheet_name_list, engine="openpyxl"
         )
+        ##Exception keys built once for every pair
+        exceptions = pd.Index(list_df.iloc[:, except_idx].dropna().astype(str))
 
         ##Apply validation
-        df["is_valid"] = df.apply(
-            lambda row: validate(
-                str(row.iloc[col_idx1]),  ##Key
-                str(row.iloc[col_idx2]),  ##Value
-                validated_values,  ##Dictionary as a global variable
-                list_df.iloc[:, except_idx].dropna().astype(str).values.tolist(),
-            ),
-            axis=1,
-        ).astype(bool)
+        valid_pairs: pd.DataFrame = validate(df, pairs, exceptions)
+        if need_iaxis:
+            ##Every row of a key with an inconsistency is reported
+            for key_idx, _ in pairs:
+                keys = df.iloc[:, key_idx].astype(str)
+                invalid_keys = keys[~valid_pairs[key_idx]].unique()
+                valid_pairs[key_idx] = ~keys.isin(invalid_keys)
+        df["is_valid"] = valid_pairs.all(axis=1)
 
         ##Make a column to know if is "TRUE" or "FALSE"
         filtered_file = df[~df["is_valid"]].copy()
         print(filtered_file)
 
-        if not need_iaxis:
-            if not filtered_file.empty:
-                ##Get the coordinates
-                filtered_file["COORDINATE_1"] = filtered_file.apply(
-                    lambda row: f"{get_excel_column_name(col_idx1 + 1)}{row.name + 2}",
-                    axis=1,
-                )
-                filtered_file["COORDINATE_2"] = filtered_file.apply(
-                    lambda row: f"{get_excel_column_name(col_idx2 + 1)}{row.name + 2}",
-                    axis=1,
-                )
-                ##Store the inconsistencies into the inconsistencies file
-                return append_inconsistencias(
-                    inconsistencies_file, new_sheet, filtered_file
-                )
-            else:
-                return "Validacion realizada, no se encontraron inconsistencias"
-        else:
-            ##Get the inconsistencies values
-            inconsistencies_col = filtered_file.iloc[:, col_idx1]
-            new_df = df[df.iloc[:, col_idx1].isin(inconsistencies_col)].copy()
+        if not filtered_file.empty:
             ##Get the coordinates
-            if not new_df.empty:
-                new_df["COORDINATE_1"] = new_df.apply(
-                    lambda row: f"{get_excel_column_name(col_idx1 + 1)}{row.name + 2}",
-                    axis=1,
+            for n, (key_idx, value_idx) in enumerate(pairs):
+                suffix = "" if len(pairs) == 1 else f"_{n + 1}"
+                rows = (filtered_file.index + 2).astype(str)
+                filtered_file[f"COORDINATE_1{suffix}"] = (
+                    get_excel_column_name(key_idx + 1) + rows
                 )
-                new_df["COORDINATE_2"] = new_df.apply(
-                    lambda row: f"{get_excel_column_name(col_idx2 + 1)}{row.name + 2}",
-                    axis=1,
+                filtered_file[f"COORDINATE_2{suffix}"] = (
+                    get_excel_column_name(value_idx + 1) + rows
                 )
-                ##Store the inconsistencies into the inconsistencies file
-                append_inconsistencias(inconsistencies_file, new_sheet, new_df)
-                return True
-            else:
-                return False
+            ##Store the inconsistencies into the inconsistencies file
+            result = append_inconsistencias(
+                inconsistencies_file, new_sheet, filtered_file
+            )
+            return True if need_iaxis else result
+        elif need_iaxis:
+            return False
+        else:
+            return "Validacion realizada, no se encontraron inconsistencias"
     except Exception as e:
         return f"Error: {e}"
 
@@ -105,15 +91,19 @@ def get_excel_column_name(n):
 
 
 def validate(
-    key: str, value: str, validated: dict[str], exception_list: list[str]
-) -> bool:
-    ##Set the local variables
-    if key in validated:
-        if validated[key] == value or key in exception_list:
-            return True
-    else:
-        validated[key] = value
-        return True
+    df: pd.DataFrame, pairs: list[tuple[int, int]], exceptions: pd.Index
+) -> pd.DataFrame:
+    """Check that each key has only one value (the first one seen) for every
+    (key, value) pair of columns. Return one boolean column per key index,
+    the keys into the exceptions are always valid"""
+    result: dict[int, pd.Series] = {}
+    for key_idx, value_idx in pairs:
+        keys: pd.Series = df.iloc[:, key_idx].astype(str)
+        values: pd.Series = df.iloc[:, value_idx].astype(str)
+        first: pd.Series = values.groupby(keys, sort=False).transform("first")
+        is_valid = (values == first) | keys.isin(exceptions)
+        result[key_idx] = result.get(key_idx, True) & is_valid
+    return pd.DataFrame(result, index=df.index)
 
 
 def append_inconsistencias(file_path: str, new_sheet: str, data_frame) -> None:
@@ -1,5 +1,10 @@
 import pandas as pd #type: ignore
 import os
+import sys
+
+## Make the shared "common" package importable from the bot folders
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.dates import cached_dates
 
 def main(params):
   try:
@@ -19,8 +24,8 @@ def main(params):
     df: pd.DataFrame = pd.read_excel(file_path, engine="openpyxl", sheet_name=sheet_name)
 
     ## Convert both columns to datetime to ensure comparison works
-    df.iloc[:, col_idx1] = pd.to_datetime(df.iloc[:, col_idx1], errors='coerce')  # Convert to datetime
-    df.iloc[:, col_idx2] = pd.to_datetime(df.iloc[:, col_idx2], errors='coerce')  # Convert to datetime
+    for col_idx in (col_idx1, col_idx2):
+      df.iloc[:, col_idx] = cached_dates(file_path, sheet_name, col_idx, df.iloc[:, col_idx]).values  # Parsed once per session
 
     ##Filter data frame
     dic_validation_type = {
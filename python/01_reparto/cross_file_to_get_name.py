@@ -1,5 +1,11 @@
 import pandas as pd  # type: ignore
 import os
+import sys
+
+## Make the shared "common" package importable from the bot folders
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.names import DEFAULT_THRESHOLD, name_similarity, normalize_names
+from common.sql_engine import SqlEngine
 
 
 def main(params: dict) -> None:
@@ -14,6 +20,10 @@ def main(params: dict) -> None:
         col_list: int = int(params.get("col_list"))
         except_sheet_name: str = params.get("except_sheet_name")
         except_col_idx: int = int(params.get("except_col_idx"))
+        ## Similarity (0 to 1) from which the tomador names are the same
+        threshold: float = float(params.get("name_threshold") or DEFAULT_THRESHOLD)
+        ## "sql" runs the join into the SQL engine instead of pandas
+        engine: str = params.get("engine") or "pandas"
 
         ##Validate if all the required input are present
         if not all(
@@ -43,16 +53,27 @@ def main(params: dict) -> None:
         col_file_1_name = file_df.columns[col_idx]
         col_file_2_name = list_df.columns[col_list]
 
-        merged_df = pd.merge(
-            file_df,
-            list_df,
-            how="left",
-            left_on=col_file_1_name,
-            right_on=col_file_2_name,
-            suffixes=("_OLD", "_NEW"),
+        if engine == "sql":
+            with SqlEngine() as sql_engine:
+                merged_df = sql_engine.left_join(
+                    file_df, list_df, col_idx, col_list, ("_OLD", "_NEW")
+                )
+        else:
+            merged_df = pd.merge(
+                file_df,
+                list_df,
+                how="left",
+                left_on=col_file_1_name,
+                right_on=col_file_2_name,
+                suffixes=("_OLD", "_NEW"),
+            )
+        ##Validate and mark inconsistencies: the names of the same poliza are
+        ##compared without accents, punctuation or legal forms (S.A., SAS, ...)
+        merged_df["SIMILITUD TOMADOR"] = name_similarity(
+            normalize_names(merged_df["TOMADOR_OLD"]),
+            normalize_names(merged_df["TOMADOR_NEW"]),
         )
-        ##Validate and mark inconsistencies
-        merged_df["is_valid"] = merged_df["TOMADOR_OLD"] == merged_df["TOMADOR_NEW"]
+        merged_df["is_valid"] = merged_df["SIMILITUD TOMADOR"] >= threshold
         merged_df["exists_in_list"] = merged_df[col_file_1_name].isin(
             except_df.iloc[:, except_col_idx]
         )
@@ -111,6 +132,7 @@ if __name__ == "__main__":
         "col_list": "0",
         "except_sheet_name": "EXCEPCIONES NOMBRES TOMADOR",
         "except_col_idx": "0",
+        "name_threshold": "0.9",
     }
 
     print(main(params))
@@ -1,6 +1,17 @@
 import pandas as pd  # type: ignore
 from datetime import datetime
 import os
+import sys
+from typing import Tuple
+
+## Make the shared "common" package importable from the bot folders
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.sql_engine import SqlEngine
+from common.xlsx_stream import select_rows
+
+##Key name and the columns it is built with
+KEY_NAME: str = "SINIESTRO+RADICADO+AMPARO+RESERVA"
+KEY_COLUMNS: list[int] = [0, 2, 32, 34]
 
 
 def main(params: dict) -> None:
@@ -13,6 +24,7 @@ def main(params: dict) -> None:
         sheet_latest_name: str = params.get("sheet_latest_name")
         col_idx: int = int(params.get("col_idx"))
         cut_date: str = params.get("cut_date")
+        engine: str = params.get("engine") or "pandas"
 
         ##Validate if all the required files are present
         if not all(
@@ -33,61 +45,26 @@ def main(params: dict) -> None:
         cut = pd.to_datetime(cut_date, format="%d/%m/%Y")
         cut_off_date = cut - pd.DateOffset(months=1)
 
-        ##Load the work books needed
-        ##Current base reparto
-        path_file_df: pd.DataFrame = pd.read_excel(
-            path_file, sheet_name=sheet_name, engine="openpyxl"
-        )
-        file_filtered: pd.DataFrame = path_file_df[
-            (path_file_df.iloc[:, col_idx] > initial_date)
-            & (path_file_df.iloc[:, col_idx] < cut_off_date)
-        ]
-
-        # Base reparto latest month
-        latest_file_df: pd.DataFrame = pd.read_excel(
-            latest_file, sheet_name=sheet_latest_name, engine="openpyxl"
-        )
-        latest_filtered: pd.DataFrame = latest_file_df[
-            (latest_file_df.iloc[:, col_idx] > initial_date)
-            & (latest_file_df.iloc[:, col_idx] < cut_off_date)
-        ]
-        file_filtered: pd.DataFrame = file_filtered.iloc[:, :111]
-
-        latest_filtered.columns = file_filtered.columns
-
-        ##Key name
-        key_name = "SINIESTRO+RADICADO+AMPARO+RESERVA"
-
-        file_filtered[key_name] = (
-            file_filtered.iloc[:, 0].astype(str)
-            + "-"
-            + file_filtered.iloc[:, 2].astype(str)
-            + "-"
-            + file_filtered.iloc[:, 32].astype(str)
-            + "-"
-            + file_filtered.iloc[:, 34].astype(str)
-        )
-
-        latest_filtered[key_name] = (
-            latest_filtered.iloc[:, 0].astype(str)
-            + "-"
-            + latest_filtered.iloc[:, 2].astype(str)
-            + "-"
-            + latest_filtered.iloc[:, 32].astype(str)
-            + "-"
-            + latest_filtered.iloc[:, 34].astype(str)
-        )
-
-        file_not_in_latest = file_filtered[
-            ~file_filtered[key_name].isin(latest_filtered[key_name])
-        ].copy()
+        if engine == "sql":
+            ##The bases are read by the engine, not loaded in pandas
+            file_not_in_latest, latest_not_in_file = sql_mismatches(
+                (path_file, sheet_name),
+                (latest_file, sheet_latest_name),
+                col_idx,
+                initial_date,
+                cut_off_date,
+            )
+        else:
+            file_not_in_latest, latest_not_in_file = pandas_mismatches(
+                (path_file, sheet_name),
+                (latest_file, sheet_latest_name),
+                col_idx,
+                initial_date,
+                cut_off_date,
+            )
         if not file_not_in_latest.empty:
             file_not_in_latest["FILE_TO_FIND"] = "ARCHIVO ACTUAL"
 
-        latest_not_in_file = latest_filtered[
-            ~latest_filtered[key_name].isin(file_filtered[key_name])
-        ].copy()
-
         # Initialize inconsistencies as an empty DataFrame
         inconsistencies = pd.DataFrame()
 
@@ -131,6 +108,106 @@ def main(params: dict) -> None:
         return f"ERROR: {e}"
 
 
+def add_key(data_frame: pd.DataFrame) -> None:
+    """Add the key of each record: siniestro, radicado, amparo and reserva"""
+    data_frame[KEY_NAME] = (
+        data_frame.iloc[:, 0].astype(str)
+        + "-"
+        + data_frame.iloc[:, 2].astype(str)
+        + "-"
+        + data_frame.iloc[:, 32].astype(str)
+        + "-"
+        + data_frame.iloc[:, 34].astype(str)
+    )
+
+
+def pandas_mismatches(
+    current: Tuple[str, str],
+    latest: Tuple[str, str],
+    col_idx: int,
+    initial_date: pd.Timestamp,
+    cut_off_date: pd.Timestamp,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Records of the period of each base ((file, sheet)) that are not in the
+    other one, with the bases loaded in pandas"""
+    ##Current base reparto
+    path_file_df: pd.DataFrame = pd.read_excel(
+        current[0], sheet_name=current[1], engine="openpyxl"
+    )
+    file_filtered: pd.DataFrame = path_file_df[
+        (path_file_df.iloc[:, col_idx] > initial_date)
+        & (path_file_df.iloc[:, col_idx] < cut_off_date)
+    ]
+
+    # Base reparto latest month
+    latest_file_df: pd.DataFrame = pd.read_excel(
+        latest[0], sheet_name=latest[1], engine="openpyxl"
+    )
+    latest_filtered: pd.DataFrame = latest_file_df[
+        (latest_file_df.iloc[:, col_idx] > initial_date)
+        & (latest_file_df.iloc[:, col_idx] < cut_off_date)
+    ]
+    file_filtered: pd.DataFrame = file_filtered.iloc[:, :111]
+
+    latest_filtered.columns = file_filtered.columns
+
+    add_key(file_filtered)
+    add_key(latest_filtered)
+
+    file_not_in_latest = file_filtered[
+        ~file_filtered[KEY_NAME].isin(latest_filtered[KEY_NAME])
+    ].copy()
+    latest_not_in_file = latest_filtered[
+        ~latest_filtered[KEY_NAME].isin(file_filtered[KEY_NAME])
+    ].copy()
+    return file_not_in_latest, latest_not_in_file
+
+
+def sql_mismatches(
+    current: Tuple[str, str],
+    latest: Tuple[str, str],
+    col_idx: int,
+    initial_date: pd.Timestamp,
+    cut_off_date: pd.Timestamp,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Same comparison as pandas_mismatches run into the SQL engine. Only the
+    key and date columns are streamed into the engine, the keys are compared
+    as the texts of the cells and the dates are the cells with a date value.
+    Only the rows found are read back from the files"""
+    with SqlEngine() as engine:
+        engine.register_sheet("actual", *current, KEY_COLUMNS + [col_idx])
+        engine.register_sheet("anterior", *latest, KEY_COLUMNS + [col_idx])
+        key: str = " || '-' || ".join(
+            f"COALESCE(c{n}, 'nan')" for n in KEY_COLUMNS
+        )
+        ## The dates are written as "YYYY-MM-DD HH:MM:SS", compared as texts
+        in_period: str = (
+            f"c{col_idx} LIKE '____-__-__ __:__:__' AND c{col_idx} > ?"
+            f" AND c{col_idx} < ?"
+        )
+        period: tuple = (str(initial_date), str(cut_off_date))
+        missing_rows: dict[str, pd.Index] = {
+            table: engine.rows(
+                f"""
+                SELECT _row FROM {table} WHERE {in_period} AND {key} NOT IN (
+                    SELECT {key} FROM {other} WHERE {in_period}
+                )
+                ORDER BY _row
+                """,
+                period + period,
+            )
+            for table, other in (("actual", "anterior"), ("anterior", "actual"))
+        }
+    file_not_in_latest: pd.DataFrame = select_rows(
+        *current, missing_rows["actual"]
+    ).iloc[:, :111]
+    latest_not_in_file: pd.DataFrame = select_rows(*latest, missing_rows["anterior"])
+    latest_not_in_file.columns = file_not_in_latest.columns
+    add_key(file_not_in_latest)
+    add_key(latest_not_in_file)
+    return file_not_in_latest, latest_not_in_file
+
+
 def append_inconsistencias(file_path: str, new_sheet: str, data_frame) -> None:
     """This function get the inconsistencies data frame and append it into the inconsistencies file"""
     if os.path.exists(file_path):
@@ -1,86 +1,47 @@
 import pandas as pd #type: ignore
 import os
-import re
+import sys
+
+## Make the shared "common" package importable from the bot folders
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.workers import run_processes
+
+## Bank statements reconciled against BASE DE REPARTO: the param with the bank
+## file, the sheets to read and the sheet where the inconsistencies are stored
+BANKS = {
+    "sudameris": {
+        "bank_param": "sudameris_bank",
+        "sheets_param": "sheet_sudameris",
+        "sheets": [],
+        "new_sheet": "BancoSudameris",
+        "name": "Banco Sudameris",
+    },
+    "agrario": {
+        "bank_param": "agrario_bank",
+        "sheets_param": None,
+        "sheets": ["DEUDORES - LINEA GENERAL", "EMPLEADOS BANCO AGRARIO", "TARJETAS  BANCO AGRARIO"],
+        "new_sheet": "BancoAgrario",
+        "name": "Banco agrario",
+    },
+}
+
+## Hash index of BASE DE REPARTO by (file, sheet, column, modified time)
+_reparto_index = {}
 
-def sudameris(params: dict):
-    try:
-        ## Set initial variables
-        sudameris_bank = params.get("sudameris_bank")
-        base_reparto = params.get("base_reparto")
-        sheet_sudameris = params.get("sheet_sudameris")
-        sheet_reparto = params.get("sheet_reparto")
-        initial_date = params.get("initial_date")
-        cut_off_date = params.get("cut_off_date")
-        date_col_idx = int(params.get("date_col_idx"))
-        vs_col = int(params.get("vs_col"))
-        in_file = params.get("in_file")
 
-        ## Validate if the dictionary values are present
-        if not all([
-            sudameris_bank, base_reparto, sheet_sudameris, sheet_reparto, 
-            initial_date, cut_off_date, in_file
-        ]):
-            return "Error: an input param required is missing"
-        
-        ## Converts dates to datetime format
-        initial_date = pd.to_datetime(initial_date, format="%d/%m/%Y")
-        cut_off_date = pd.to_datetime(cut_off_date, format="%d/%m/%Y")
+def sudameris(params: dict):
+    return reconcile({**params, "banks": "sudameris"})
 
-        ## Read work books
-        sudameris: pd.DataFrame = pd.read_excel(
-            sudameris_bank, sheet_name=sheet_sudameris, engine="openpyxl"
-        )
-        reparto: pd.DataFrame = pd.read_excel(
-            base_reparto, sheet_name=sheet_reparto, engine="openpyxl"
-        )
-        
-        ## Filter workbooks based on date column
-        filtered_sudameris = sudameris[(sudameris.iloc[:, date_col_idx] >= initial_date) & 
-                                       (sudameris.iloc[:, date_col_idx] <= cut_off_date)]
-
-        filtered_sudameris = filtered_sudameris.copy()
-        ## Check if all values from Sudameris are in Reparto
-        filtered_sudameris["is_in_reparto"] = filtered_sudameris.iloc[:, vs_col].isin(reparto.iloc[:, vs_col])
-        ## Find rows in Sudameris that are not in Reparto
-        not_in_reparto: pd.DataFrame = filtered_sudameris[~filtered_sudameris["is_in_reparto"]].copy()
-
-        not_in_reparto["is_valid"] = not_in_reparto.iloc[:, vs_col].astype(str).apply(
-            lambda x: validate_comments(x)
-        )
 
-        inconsistencies = not_in_reparto[~not_in_reparto["is_valid"].astype(bool)].copy()
-
-        ##!Unit tests
-        print(inconsistencies.iloc[:, -1])
-        #print(reparto.iloc[:, vs_col])
-
-        ## Store and return the inconsistencies
-        if inconsistencies.empty:
-            return "All values from 'Banco Sudameris' are present in 'Base Reparto'"
-        else:
-            inconsistencies['COORDENADAS'] = inconsistencies.apply(
-                lambda row: f"{get_excel_column_name(vs_col + 1)}{row.name + 2}", axis=1
-            )       
-            ## Create a sheet name to store the inconsistencies
-            new_sheet = "BancoSudameris"
-            
-            if os.path.exists(in_file):
-                with pd.ExcelFile(in_file, engine="openpyxl") as xls:
-                    if new_sheet in xls.sheet_names:
-                        existing_file = pd.read_excel(xls, sheet_name=new_sheet, engine="openpyxl")
-                        inconsistencies = pd.concat([existing_file, inconsistencies], ignore_index=True)
-
-            with pd.ExcelWriter(in_file, engine="openpyxl", mode="a", if_sheet_exists="replace") as writer:
-                inconsistencies.to_excel(writer, index=False, sheet_name=new_sheet)
-                return "Inconsistencies registered successfully"
+def agrario(params: dict):
+    return reconcile({**params, "banks": "agrario"})
 
-    except Exception as e:
-        return f"Error: {e}"
 
-def agrario(params: dict):
+def reconcile(params: dict):
+    """Reconcile the bank statements given in "banks" (comma separated, all the
+    configured banks by default) against BASE DE REPARTO, read only once"""
     try:
         ## Set initial variables
-        agrario_bank = params.get("agrario_bank")
         base_reparto = params.get("base_reparto")
         sheet_reparto = params.get("sheet_reparto")
         initial_date = params.get("initial_date")
@@ -88,69 +49,126 @@ def agrario(params: dict):
         date_col_idx = int(params.get("date_col_idx"))
         vs_col = int(params.get("vs_col"))
         in_file = params.get("in_file")
+        banks = [
+            bank.strip().lower() for bank in str(params.get("banks") or ",".join(BANKS)).split(",")
+            if bank.strip()
+        ]
 
         ## Validate if the dictionary values are present
-        if not all(
-            [
-                agrario_bank, base_reparto, sheet_reparto, initial_date, cut_off_date, in_file
-            ]
-        ):
-            return "Error: an input param is missing"
-        
+        unknown = [bank for bank in banks if bank not in BANKS]
+        if unknown:
+            return f"Error: bank not configured: {', '.join(unknown)}"
+        required = [base_reparto, sheet_reparto, initial_date, cut_off_date, in_file]
+        for bank in banks:
+            required.append(params.get(BANKS[bank]["bank_param"]))
+            if BANKS[bank]["sheets_param"]:
+                required.append(params.get(BANKS[bank]["sheets_param"]))
+        if not all(required):
+            return "Error: an input param required is missing"
+
         ## Converts dates to datetime format
         initial_date = pd.to_datetime(initial_date, format="%d/%m/%Y")
         cut_off_date = pd.to_datetime(cut_off_date, format="%d/%m/%Y")
 
-        ## Read work books
-        agrario_sheets = ["DEUDORES - LINEA GENERAL", "EMPLEADOS BANCO AGRARIO", "TARJETAS  BANCO AGRARIO"]
-        data_frames = (pd.read_excel(agrario_bank, sheet_name=sheet) for sheet in agrario_sheets)
-        agrario = pd.concat(data_frames, ignore_index=True)
-        reparto = pd.read_excel(base_reparto, sheet_name=sheet_reparto, engine="openpyxl")
-        
-        ## Filter workbooks based on date column
-        filtered_agrario = agrario[(agrario.iloc[:, date_col_idx] >= initial_date) & 
-                                    (agrario.iloc[:, date_col_idx] <= cut_off_date)]
-
-        ## Check if all values from agrario are in Reparto
-        filtered_agrario = filtered_agrario.copy()
-        filtered_agrario["is_in_reparto"] = filtered_agrario.iloc[:, vs_col].isin(reparto.iloc[:, vs_col])
-
-        ## Find rows in agrario that are not in Reparto
-        not_in_reparto: pd.DataFrame = filtered_agrario[~filtered_agrario["is_in_reparto"]].copy()
-
-        not_in_reparto["is_valid"] = not_in_reparto.iloc[:, vs_col].astype(str).apply(
-            lambda x: validate_comments(x)
-        )
-
-        inconsistencies = not_in_reparto[~not_in_reparto["is_valid"]].copy()
+        ## Read BASE DE REPARTO once and keep the matching column as a hash index
+        index = get_reparto_index(base_reparto, sheet_reparto, vs_col)
 
-        ##!For debugging
-        print(inconsistencies)
-
-        ## Store and return the inconsistencies
-        if inconsistencies.empty:
-            return "All values from 'Banco agrario' are present in 'Base Reparto'"
-        else:
-            inconsistencies['COORDENADAS'] = inconsistencies.apply(
-                lambda row: f"{get_excel_column_name(vs_col + 1)}{row.name + 2}", axis=1
-            )
-
-            ## Create a sheet name to store the inconsistencies
-            new_sheet = "BancoAgrario"
-            
-            if os.path.exists(in_file):
-                with pd.ExcelFile(in_file, engine="openpyxl") as xls:
-                    if new_sheet in xls.sheet_names:
-                        existing_file = pd.read_excel(xls, sheet_name=new_sheet, engine="openpyxl")
-                        inconsistencies = pd.concat([existing_file, inconsistencies], ignore_index=True)
-
-            with pd.ExcelWriter(in_file, engine="openpyxl", mode="a", if_sheet_exists="replace") as writer:
-                inconsistencies.to_excel(writer, index=False, sheet_name=new_sheet)
-                return "Inconsistencies registered successfully"
+        ## Each bank is read and reconciled in its own process, the openpyxl parse
+        ## holds the GIL so threads would read the statements one after another
+        inconsistencies = run_processes(
+            reconcile_bank,
+            [
+                (bank, params, index, initial_date, cut_off_date, date_col_idx, vs_col)
+                for bank in banks
+            ],
+        )
+        results = dict(zip(banks, inconsistencies))
+
+        ## Store every sheet with inconsistencies in a single save
+        messages = []
+        sheets = {}
+        for bank, inconsistencies in results.items():
+            if inconsistencies.empty:
+                messages.append(f"All values from '{BANKS[bank]['name']}' are present in 'Base Reparto'")
+            else:
+                sheets[BANKS[bank]["new_sheet"]] = inconsistencies
+                messages.append(f"{BANKS[bank]['name']}: inconsistencies registered successfully")
+        if sheets:
+            save_sheets(in_file, sheets)
+        if len(messages) == 1 and sheets:
+            return "Inconsistencies registered successfully"
+        return "; ".join(messages)
 
     except Exception as e:
         return f"Error: {e}"
 
+
+def get_reparto_index(base_reparto: str, sheet_reparto: str, vs_col: int) -> frozenset:
+    """Read the matching column of BASE DE REPARTO and return it as a set,
+    the set is reused while the file is not modified"""
+    key = (
+        os.path.abspath(base_reparto), sheet_reparto, vs_col, os.path.getmtime(base_reparto)
+    )
+    if key not in _reparto_index:
+        reparto = pd.read_excel(
+            base_reparto, sheet_name=sheet_reparto, engine="openpyxl", usecols=[vs_col]
+        )
+        _reparto_index[key] = frozenset(reparto.iloc[:, 0].dropna())
+    return _reparto_index[key]
+
+
+def read_bank(bank: str, params: dict) -> pd.DataFrame:
+    """Read and concat the sheets of a bank statement"""
+    config = BANKS[bank]
+    sheets = [params.get(config["sheets_param"])] if config["sheets_param"] else config["sheets"]
+    data_frames = (
+        pd.read_excel(params.get(config["bank_param"]), sheet_name=sheet, engine="openpyxl")
+        for sheet in sheets
+    )
+    return pd.concat(data_frames, ignore_index=True)
+
+
+def reconcile_bank(
+    bank: str, params: dict, index: frozenset, initial_date, cut_off_date, date_col_idx: int, vs_col: int
+) -> pd.DataFrame:
+    """Return the rows of the bank statement that are not in the reparto index"""
+    bank_df = read_bank(bank, params)
+
+    ## Filter workbooks based on date column
+    dates = bank_df.iloc[:, date_col_idx]
+    filtered_bank = bank_df[(dates >= initial_date) & (dates <= cut_off_date)].copy()
+
+    ## Check if all values from the bank are in Reparto
+    filtered_bank["is_in_reparto"] = filtered_bank.iloc[:, vs_col].isin(index)
+    ## Find rows in the bank that are not in Reparto
+    not_in_reparto: pd.DataFrame = filtered_bank[~filtered_bank["is_in_reparto"]].copy()
+
+    ## Values with any character that is not a digit are comments
+    not_in_reparto["is_valid"] = not_in_reparto.iloc[:, vs_col].astype(str).str.contains(
+        r"[^0-9]", regex=True
+    )
+
+    inconsistencies = not_in_reparto[~not_in_reparto["is_valid"].astype(bool)].copy()
+    if not inconsistencies.empty:
+        column_name = get_excel_column_name(vs_col + 1)
+        inconsistencies['COORDENADAS'] = column_name + (inconsistencies.index + 2).astype(str)
+    return inconsistencies
+
+
+def save_sheets(in_file: str, sheets: dict):
+    """Append the inconsistencies of every bank to the existing sheets and
+    write all of them opening the workbook once"""
+    if os.path.exists(in_file):
+        with pd.ExcelFile(in_file, engine="openpyxl") as xls:
+            for new_sheet, inconsistencies in sheets.items():
+                if new_sheet in xls.sheet_names:
+                    existing_file = pd.read_excel(xls, sheet_name=new_sheet, engine="openpyxl")
+                    sheets[new_sheet] = pd.concat([existing_file, inconsistencies], ignore_index=True)
+
+    with pd.ExcelWriter(in_file, engine="openpyxl", mode="a", if_sheet_exists="replace") as writer:
+        for new_sheet, inconsistencies in sheets.items():
+            inconsistencies.to_excel(writer, index=False, sheet_name=new_sheet)
+
 def get_excel_column_name(n):
     """Convert a column number (1-based) to Excel column name (e.g., 1 -> A, 28 -> AB)."""
     result = ''
@@ -160,14 +178,6 @@ def get_excel_column_name(n):
     return result
 
 
-def validate_comments(string: str) -> bool:
-    """This method works to validate is the input has any string character
-    and know if is a comment"""
-    try:
-        return bool(re.search(r"[^0-9]", string))
-    except:
-        return False
-        
 if __name__ == "__main__":
     params = {
         "agrario_bank": "C:\ProgramData\AutomationAnywhere\Bots\Logs\AD_RCSN_SabanaPagosYBasesParaSinestralidad\InputFolder\BANCO AGRARIO 2024.xlsx",
@@ -178,6 +188,7 @@ if __name__ == "__main__":
         "date_col_idx": "24",
         "vs_col": "0",    
         "in_file": "C:/ProgramData/AutomationAnywhere/Bots/Logs/AD_RCSN_SabanaPagosYBasesParaSinestralidad/OutputFolder/Inconsistencias/InconBaseReparto.xlsx",
+        "banks": "agrario",
     }
 
-    print(agrario(params))
\ No newline at end of file
+    print(reconcile(params))
\ No newline at end of file
@@ -1,5 +1,10 @@
 import pandas as pd  # type: ignore
 import os
+import sys
+
+## Make the shared "common" package importable from the bot folders
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.xlsx_stream import filter_copy
 
 
 def main(params):
@@ -33,30 +38,17 @@ def main(params):
         cut_off_date = pd.to_datetime(cut_off_date_input, format="%d/%m/%Y")
         start_date = pd.to_datetime(start_date_input, format="%d/%m/%Y")
 
-        # Open file using pandas
-        df = pd.read_excel(file_path, engine="openpyxl", sheet_name=sheet_name)
-        otros_gastos = pd.read_excel(file_path, sheet_name="OGDS", engine="openpyxl")
-        # Normalize columns
-        df = df.iloc[:, :111]
-        otros_gastos = otros_gastos.iloc[:, :111]
-
-        ## Assign the columns of the first data frame
-        otros_gastos.columns = df.columns
-        df: pd.DataFrame = pd.concat([df, otros_gastos], ignore_index=True)
-
-        # Convert the column to datetime using the column index
-        df.iloc[:, column_index] = pd.to_datetime(
-            df.iloc[:, column_index], format="%d/%m/%Y"
+        # Stream the first 111 columns of the sheet and the OGDS sheet (under the
+        # header of the first one) from start_date to cut_off_date into the temp file
+        filter_copy(
+            [(file_path, sheet_name), (file_path, "OGDS")],
+            temp_file,
+            sheet_name,
+            column_index,
+            start_date,
+            cut_off_date,
+            max_col=111,
         )
-
-        # Filter from start_date to cut_off_date
-        filter_file = df[
-            (df.iloc[:, column_index] >= start_date)
-            & (df.iloc[:, column_index] <= cut_off_date)
-        ]
-
-        # Copy to temp file to make validations
-        filter_file.to_excel(temp_file, index=False, sheet_name=sheet_name)
         return (True, "SUCCESS: file copied successfully")
 
     except Exception as e:
@@ -1,5 +1,10 @@
 import pandas as pd  # type: ignore
 import os
+import sys
+
+## Make the shared "common" package importable from the bot folders
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.xlsx_stream import write_frame
 
 
 def main(params: dict):
@@ -68,8 +73,8 @@ def main(params: dict):
             [otros_ramos_filtered, desempleo_filtered], ignore_index=True
         )
 
-        ##Save changes into a temp folder
-        base_pagos.to_excel(temp_file_path, index=False, sheet_name="PAGOS")
+        ##Save changes into a temp folder (streamed, the base has thousands of rows)
+        write_frame(base_pagos, temp_file_path, "PAGOS")
         return "Temp file created successfully"
 
     except Exception as e:
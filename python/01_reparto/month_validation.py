@@ -1,4 +1,10 @@
 import pandas as pd  # type: ignore
+import os
+import sys
+
+## Make the shared "common" package importable from the bot folders
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.dates import cached_dates
 
 
 def main(params) -> tuple:
@@ -17,32 +23,14 @@ def main(params) -> tuple:
             file_path, engine="openpyxl", sheet_name=sheet_name
         )
 
-        ## Create a dictionary with the names of each month by number
-        months_dict = {
-            1: "ENERO",
-            2: "FEBRERO",
-            3: "MARZO",
-            4: "ABRIL",
-            5: "MAYO",
-            6: "JUNIO",
-            7: "JULIO",
-            8: "AGOSTO",
-            9: "SEPTIEMBRE",
-            10: "OCTUBRE",
-            11: "NOVIEMBRE",
-            12: "DICIEMBRE",
-        }
-
-        ## Create a function to validate both columns the date and the month
-        def validate_month(date: str, month: str) -> bool:
-            date_parse = pd.to_datetime(date, format="%Y-%m-%d", errors="coerce")
-            get_month = date_parse.month
-            standard_month = months_dict.get(get_month)
-            return month == standard_month
-
-        ## Pass data to the function for validating
-        reparto_data_frame["is_valid"] = reparto_data_frame.apply(
-            lambda row: validate_month(row.iloc[24], row.iloc[25]), axis=1
+        ## Get the month name of the assignment date parsed once per session
+        standard_month: pd.Series = cached_dates(
+            file_path, sheet_name, 24, reparto_data_frame.iloc[:, 24]
+        ).month_names()
+
+        ## Compare the month name against the "MES DE ASIGNACION" column
+        reparto_data_frame["is_valid"] = (
+            reparto_data_frame.iloc[:, 25] == standard_month
         )
 
         ## Create a inconsistencies data frame
@@ -0,0 +1,147 @@
+import os
+import sys
+from typing import Tuple
+
+## Make the shared "common" package importable from the bot folders
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.pipeline import Pipeline, Stage, run_pipeline
+
+PIPELINE = Pipeline(
+    "reparto",
+    [
+        ## Check of the sheets and headers of the inputs before any of them is
+        ## read: it has no outputs, so it runs again with the stages after it
+        Stage(
+            "preflight",
+            "01_reparto/preflight.py",
+            args=(
+                {
+                    "base_file": "{base_file}",
+                    "sheet_name": "{sheet_name}",
+                    "exception_file": "{exception_file}",
+                    "previous_year_file": "{previous_year_file}",
+                },
+            ),
+        ),
+        Stage(
+            "filter_copy_files",
+            "01_reparto/filter_copy_files.py",
+            args=(
+                {
+                    "file_path": "{base_file}",
+                    "sheet_name": "{sheet_name}",
+                    "temp_file": "{file_path}",
+                    "cut_off_date": "{cut_off_date}",
+                    "column_index": "{date_col_idx}",
+                    "start_date_input": "{begin_date}",
+                },
+            ),
+            depends_on=("preflight",),
+            inputs=("{base_file}",),
+            outputs=("{file_path}",),
+        ),
+        Stage(
+            "month_validation",
+            "01_reparto/month_validation.py",
+            args=(
+                {
+                    "file_path": "{file_path}",
+                    "sheet_name": "{sheet_name}",
+                    "inconsistencias_file": "{inconsistencies_file}",
+                },
+            ),
+            depends_on=("filter_copy_files",),
+            outputs=("{inconsistencies_file}",),
+        ),
+        Stage(
+            "duplicate_registers",
+            "01_reparto/duplicate_registers.py",
+            args=(
+                {
+                    "file_path": "{file_path}",
+                    "sheet_name": "{sheet_name}",
+                    "inconsistencies_file": "{inconsistencies_file}",
+                    "exception_file": "{exception_file}",
+                    "sheet_exception": "EXCEPCIONES VALIDACION LLAVES",
+                },
+            ),
+            depends_on=("filter_copy_files",),
+            inputs=("{exception_file}",),
+            outputs=("{inconsistencies_file}",),
+        ),
+        Stage(
+            "validate_concepto_column",
+            "01_reparto/validate_concepto_column.py",
+            args=(
+                {
+                    "file_path": "{file_path}",
+                    "inconsistencies_file": "{inconsistencies_file}",
+                    "list_file": "{exception_file}",
+                },
+            ),
+            depends_on=("filter_copy_files",),
+            inputs=("{exception_file}",),
+            outputs=("{inconsistencies_file}",),
+        ),
+        Stage(
+            "previous_year_file",
+            "01_reparto/previous_year_file.py",
+            args=(
+                {
+                    "previous_year_file": "{previous_year_file}",
+                    "current_file": "{file_path}",
+                    "sheet_name": "{sheet_name}",
+                    "exception_file": "{exception_file}",
+                    "exception_sheet_name": "EXCEPCIONES CAMBIO AÑO",
+                    "inconsistencies_file": "{inconsistencies_file}",
+                },
+            ),
+            depends_on=("filter_copy_files",),
+            inputs=("{previous_year_file}", "{exception_file}"),
+            outputs=("{inconsistencies_file}",),
+        ),
+        ## The tables are saved into the base: after every stage that reads it
+        Stage(
+            "only_create_tables",
+            "01_reparto/only_create_tables.py",
+            args=(
+                {
+                    "file_path": "{file_path}",
+                    "sheet_name": "{sheet_name}",
+                    "col_idx": "{date_col_idx}",
+                    "cut_off_date": "{cut_off_date}",
+                    "inconsistencias_file": "{inconsistencies_file}",
+                    "initial_date": "{begin_date}",
+                },
+            ),
+            depends_on=("previous_year_file",),
+            outputs=("{file_path}",),
+        ),
+    ],
+)
+
+
+def main(params: dict) -> Tuple[bool, str]:
+    """Run the reparto process: filter of the base, validations and tables.
+    Only the stages whose inputs changed since the last run (and the ones
+    downstream) are executed when cache_file is given"""
+    try:
+        return run_pipeline(PIPELINE, params)
+    except Exception as e:
+        return False, f"ERROR: {e}"
+
+
+if __name__ == "__main__":
+    params = {
+        "base_file": r"C:\ProgramData\AutomationAnywhere\Bots\Logs\AD_RCSN_SabanaPagosYBasesParaSinestralidad\InputFolder\BASE DE REPARTO 2025.xlsx",
+        "file_path": r"C:\ProgramData\AutomationAnywhere\Bots\Logs\AD_RCSN_SabanaPagosYBasesParaSinestralidad\TempFolder\BASE DE REPARTO 2025.xlsx",
+        "sheet_name": "CASOS NUEVOS",
+        "date_col_idx": "24",
+        "begin_date": "01/01/2025",
+        "cut_off_date": "09/01/2025",
+        "inconsistencies_file": r"C:\ProgramData\AutomationAnywhere\Bots\Logs\AD_RCSN_SabanaPagosYBasesParaSinestralidad\OutputFolder\Inconsistencias\InconBaseReparto.xlsx",
+        "exception_file": r"C:\ProgramData\AutomationAnywhere\Bots\Logs\AD_RCSN_SabanaPagosYBasesParaSinestralidad\InputFolder\EXCEPCIONES BASE REPARTO.xlsx",
+        "previous_year_file": r"C:\ProgramData\AutomationAnywhere\Bots\Logs\AD_RCSN_SabanaPagosYBasesParaSinestralidad\OutputFolder\BASE REPARTO\BASE DE REPARTO 122024.xlsx",
+        "cache_file": r"C:\ProgramData\AutomationAnywhere\Bots\Logs\AD_RCSN_SabanaPagosYBasesParaSinestralidad\TempFolder\pipeline_reparto.json",
+    }
+    print(main(params))
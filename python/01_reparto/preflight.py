@@ -0,0 +1,63 @@
+import os
+import sys
+from typing import Tuple
+
+## Make the shared "common" package importable from the bot folders
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.schema import SheetLayout, preflight
+
+## The rules read the base by position (iloc), the last column used is 98
+BASE_COLUMNS: int = 99
+
+## Sheet read by validate_concepto_column from the temp base
+CONCEPTO_SHEET: str = "CASOS NUEVOS"
+
+
+def main(params: dict) -> Tuple[bool, str]:
+    """Check the sheets and headers of the inputs of the reparto process before
+    the bases are read, the process fails in milliseconds when a sheet was
+    renamed or the columns moved"""
+    try:
+        sheet_name: str = params.get("sheet_name")
+        errors: list[str] = []
+        if sheet_name != CONCEPTO_SHEET:
+            errors.append(
+                f"validate_concepto_column reads the sheet '{CONCEPTO_SHEET}',"
+                f" not '{sheet_name}'"
+            )
+        return preflight(
+            [
+                (
+                    params.get("base_file"),
+                    [
+                        SheetLayout(sheet_name, BASE_COLUMNS),
+                        SheetLayout("OGDS", BASE_COLUMNS),
+                    ],
+                ),
+                (
+                    params.get("previous_year_file"),
+                    [SheetLayout(sheet_name, BASE_COLUMNS)],
+                ),
+                (
+                    params.get("exception_file"),
+                    [
+                        SheetLayout("LISTAS", columns=("CONCEPTO",)),
+                        SheetLayout("EXCEPCIONES VALIDACION LLAVES"),
+                        SheetLayout("EXCEPCIONES CAMBIO AÑO"),
+                    ],
+                ),
+            ],
+            errors,
+        )
+    except Exception as e:
+        return False, f"ERROR: {e}"
+
+
+if __name__ == "__main__":
+    params = {
+        "base_file": r"C:\ProgramData\AutomationAnywhere\Bots\Logs\AD_RCSN_SabanaPagosYBasesParaSinestralidad\InputFolder\BASE DE REPARTO 2025.xlsx",
+        "sheet_name": "CASOS NUEVOS",
+        "exception_file": r"C:\ProgramData\AutomationAnywhere\Bots\Logs\AD_RCSN_SabanaPagosYBasesParaSinestralidad\InputFolder\EXCEPCIONES BASE REPARTO.xlsx",
+        "previous_year_file": r"C:\ProgramData\AutomationAnywhere\Bots\Logs\AD_RCSN_SabanaPagosYBasesParaSinestralidad\OutputFolder\BASE REPARTO\BASE DE REPARTO 122024.xlsx",
+    }
+    print(main(params))
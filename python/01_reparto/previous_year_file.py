@@ -1,7 +1,18 @@
+import os
+import sys
 import pandas as pd  # type: ignore
 from typing import Tuple
 from datetime import datetime
 
+## Make the shared "common" package importable from the bot folders
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.sql_engine import SqlEngine
+from common.xlsx_stream import select_rows
+
+KEYS: list[str] = [f"KEY_{n}" for n in range(1, 8)]
+## Columns of the base used by the keys
+KEY_COLUMNS: list[int] = [0, 2, 18, 27, 32, 34, 98]
+
 
 def main(params: dict) -> Tuple[bool, str]:
     try:
@@ -12,52 +23,60 @@ def main(params: dict) -> Tuple[bool, str]:
         exception_file: str = params.get("exception_file")
         exception_sheet_name: str = params.get("exception_sheet_name")
         inconsistencies_file: str = params.get("inconsistencies_file")
+        engine: str = params.get("engine") or "pandas"
 
-        # Load the previous year and current files
-        previous_df = load_file(file_path=previous_year_file, sheet_name=sheet_name)
-        current_df = load_file(file_path=current_file, sheet_name=sheet_name)
         except_df = load_file(file_path=exception_file, sheet_name=exception_sheet_name)
 
-        # Create a new column with the year into the radicado number
-        current_df["validate_radicado_year"] = current_df.iloc[:, 2].str[:4]
-
         current_year = datetime.now().year
         previous_year = current_year - 1  # Get the previous year subtracting 1
 
-        # Filter current df by the previous year
-        cur_filtered_df = current_df[
-            current_df["validate_radicado_year"] == str(previous_year)
-        ].copy()
-        # Create keys with specific columns
-        add_keys(cur_filtered_df)
-        add_keys(previous_df)
-
-        inconsistencies = cur_filtered_df[
-            (cur_filtered_df["KEY_1"].isin(previous_df["KEY_1"]))
-            & (cur_filtered_df["KEY_2"].isin(previous_df["KEY_2"]))
-            & (cur_filtered_df["KEY_3"].isin(previous_df["KEY_3"]))
-            & (cur_filtered_df["KEY_4"].isin(previous_df["KEY_4"]))
-            & (cur_filtered_df["KEY_5"].isin(previous_df["KEY_5"]))
-            & (cur_filtered_df["KEY_6"].isin(previous_df["KEY_6"]))
-            & (cur_filtered_df["KEY_7"].isin(previous_df["KEY_7"]))
-        ].copy()
-        # Validate if there is any exception record
-        # before report inconsistencies to the user
-        # Filter out records that are in the exceptions DataFrame
-        inconsistencies["is_exception"] = (
-            inconsistencies["KEY_1"].isin(except_df["KEY_1"])
-            & inconsistencies["KEY_2"].isin(except_df["KEY_2"])
-            & inconsistencies["KEY_3"].isin(except_df["KEY_3"])
-            & inconsistencies["KEY_4"].isin(except_df["KEY_4"])
-            & inconsistencies["KEY_5"].isin(except_df["KEY_5"])
-            & inconsistencies["KEY_6"].isin(except_df["KEY_6"])
-            & inconsistencies["KEY_7"].isin(except_df["KEY_7"])
-        )
-
-        # Filter the inconsistencies by the exception records
-        inconsistencies_validated: pd.DataFrame = inconsistencies[
-            ~inconsistencies["is_exception"]
-        ].copy()
+        if engine == "sql":
+            # The bases are read by the engine, not loaded in pandas
+            inconsistencies_validated = sql_inconsistencies(
+                current_file, previous_year_file, sheet_name, except_df, previous_year
+            )
+        else:
+            # Load the previous year and current files
+            previous_df = load_file(file_path=previous_year_file, sheet_name=sheet_name)
+            current_df = load_file(file_path=current_file, sheet_name=sheet_name)
+
+            # Create a new column with the year into the radicado number
+            current_df["validate_radicado_year"] = current_df.iloc[:, 2].str[:4]
+
+            # Filter current df by the previous year
+            cur_filtered_df = current_df[
+                current_df["validate_radicado_year"] == str(previous_year)
+            ].copy()
+            # Create keys with specific columns
+            add_keys(cur_filtered_df)
+            add_keys(previous_df)
+
+            inconsistencies = cur_filtered_df[
+                (cur_filtered_df["KEY_1"].isin(previous_df["KEY_1"]))
+                & (cur_filtered_df["KEY_2"].isin(previous_df["KEY_2"]))
+                & (cur_filtered_df["KEY_3"].isin(previous_df["KEY_3"]))
+                & (cur_filtered_df["KEY_4"].isin(previous_df["KEY_4"]))
+                & (cur_filtered_df["KEY_5"].isin(previous_df["KEY_5"]))
+                & (cur_filtered_df["KEY_6"].isin(previous_df["KEY_6"]))
+                & (cur_filtered_df["KEY_7"].isin(previous_df["KEY_7"]))
+            ].copy()
+            # Validate if there is any exception record
+            # before report inconsistencies to the user
+            # Filter out records that are in the exceptions DataFrame
+            inconsistencies["is_exception"] = (
+                inconsistencies["KEY_1"].isin(except_df["KEY_1"])
+                & inconsistencies["KEY_2"].isin(except_df["KEY_2"])
+                & inconsistencies["KEY_3"].isin(except_df["KEY_3"])
+                & inconsistencies["KEY_4"].isin(except_df["KEY_4"])
+                & inconsistencies["KEY_5"].isin(except_df["KEY_5"])
+                & inconsistencies["KEY_6"].isin(except_df["KEY_6"])
+                & inconsistencies["KEY_7"].isin(except_df["KEY_7"])
+            )
+
+            # Filter the inconsistencies by the exception records
+            inconsistencies_validated: pd.DataFrame = inconsistencies[
+                ~inconsistencies["is_exception"]
+            ].copy()
 
         return save_inconsistencies(
             df=inconsistencies_validated,
@@ -69,6 +88,71 @@ def main(params: dict) -> Tuple[bool, str]:
         return (False, str(e))
 
 
+def key_expressions() -> list[str]:
+    """SQL of the keys add_keys builds over the text columns of the base: the
+    empty cells are "nan" as astype(str) writes them and the column 98 is 0"""
+    text: dict[int, str] = {n: f"COALESCE(c{n}, 'nan')" for n in KEY_COLUMNS}
+    text[98] = "COALESCE(c98, '0')"
+    key_1: str = f"{text[0]} || '-' || {text[2]}"
+    key_2: str = f"{key_1} || '-' || {text[32]}"
+    return [
+        key_1,
+        key_2,
+        f"{key_2} || '-' || {text[34]}",
+        f"{key_2} || '-' || {text[27]}",
+        f"{key_2} || '-' || {text[98]}",
+        f"{text[18]} || '-' || {text[32]} || '-' || {text[34]}",
+        f"{text[18]} || '-' || {text[32]} || '-' || {text[98]}",
+    ]
+
+
+def sql_inconsistencies(
+    current_file: str,
+    previous_year_file: str,
+    sheet_name: str,
+    except_df: pd.DataFrame,
+    previous_year: int,
+) -> pd.DataFrame:
+    """Same validation as the pandas one but run into the SQL engine. Only the
+    key columns of the bases are streamed into the engine and only the rows
+    found are read back from the current file"""
+    with SqlEngine() as engine:
+        engine.register_sheet("actual", current_file, sheet_name, KEY_COLUMNS)
+        engine.register_sheet("anterior", previous_year_file, sheet_name, KEY_COLUMNS)
+        engine.register("excepciones", except_df[KEYS])
+        keys: str = ", ".join(
+            f"{sql} AS {key}" for sql, key in zip(key_expressions(), KEYS)
+        )
+        ## Each key of the record must be in the previous year file
+        in_previous: str = " AND ".join(
+            f"a.{key} IN (SELECT {key} FROM anterior_keys)" for key in KEYS
+        )
+        is_exception: str = " AND ".join(
+            f"a.{key} IN (SELECT c{n} FROM excepciones WHERE c{n} IS NOT NULL)"
+            for n, key in enumerate(KEYS)
+        )
+        rows: pd.Index = engine.rows(
+            f"""
+            WITH actual_keys AS (
+                SELECT _row, {keys} FROM actual WHERE substr(c2, 1, 4) = ?
+            ),
+            anterior_keys AS (SELECT {keys} FROM anterior)
+            SELECT a._row FROM actual_keys a
+            WHERE {in_previous} AND NOT ({is_exception})
+            ORDER BY a._row
+            """,
+            (str(previous_year),),
+        )
+    ## The same columns the pandas validation saves
+    inconsistencies: pd.DataFrame = select_rows(
+        current_file, sheet_name, rows, dtype=str
+    )
+    inconsistencies["validate_radicado_year"] = inconsistencies.iloc[:, 2].str[:4]
+    add_keys(inconsistencies)
+    inconsistencies["is_exception"] = False
+    return inconsistencies
+
+
 def add_keys(base: pd.DataFrame) -> None:
     base.iloc[:, 98] = base.iloc[:, 98].fillna(0)
     base["KEY_1"] = base.iloc[:, 0].astype(str) + "-" + base.iloc[:, 2].astype(str)
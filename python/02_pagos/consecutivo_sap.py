@@ -2,6 +2,12 @@ import pandas as pd  # type: ignore
 import numpy as np  # type: ignore
 from typing import Optional
 from openpyxl import load_workbook  # type: ignore
+import os
+import sys
+
+## Make the shared "common" package importable from the bot folders
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.dates import cached_dates
 
 
 class Consecutivo:
@@ -26,7 +32,12 @@ class Consecutivo:
         return pd.read_excel(file_path, sheet_name=sheet_name, engine="openpyxl")
 
     def filter_file(
-        self, data_frame: pd.DataFrame, cut_off_date: str, col_idx: int
+        self,
+        data_frame: pd.DataFrame,
+        cut_off_date: str,
+        col_idx: int,
+        file_path: str,
+        sheet_name: str,
     ) -> pd.DataFrame:
         """Method to filter the file according to the defined criteria"""
 
@@ -41,7 +52,9 @@ class Consecutivo:
         col_name = data_frame.columns[col_idx]
 
         # Convert the specified column to datetime type and assign it back to the DataFrame
-        data_frame[col_name] = pd.to_datetime(data_frame[col_name], errors="coerce")
+        data_frame[col_name] = cached_dates(
+            file_path, sheet_name, col_idx, data_frame[col_name]
+        ).values
 
         # Filter DataFrame by month and year
         filtered_df: pd.DataFrame = data_frame[
@@ -94,9 +107,17 @@ class Consecutivo:
         # Information from EXCEPTION FILE
         list_df: pd.DataFrame = self.read_excel(self.exception_file, "CONSECUTIVO SAP")
         # Consecutivo data frame after being filtered
-        consecutivo_df = self.filter_file(consecutivo_file, cut_off_date, 0)
+        consecutivo_df = self.filter_file(
+            consecutivo_file,
+            cut_off_date,
+            0,
+            self.consecutivo_sap_file,
+            self.consecutivo_sheet,
+        )
         # Pagos data frame after being filtered
-        pagos_df = self.filter_file(pagos_file, cut_off_date, 72)
+        pagos_df = self.filter_file(
+            pagos_file, cut_off_date, 72, self.path_file, self.sheet_name
+        )
 
         # Initial variables (consecutivo final, consecutivos faltantes)
         final_consecutivo: int = int(list_df.iloc[0, 2])
@@ -1,7 +1,18 @@
 import pandas as pd  # type:ignore
 from typing import Optional
 import os
-import re
+import sys
+
+## Make the shared "common" package importable from the bot folders
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.backend import get_backend, read_excel
+from common.dates import ParsedDates, cached_dates
+from common.inconsistencies import project
+from common.partition import run_partitioned
+from common import rules
+from common.result_cache import ResultCache, cached_result, track_save
+from common.sql_engine import SqlEngine
+from common.strings import StringView, cached_strings
 
 
 class FirstValidationGroup:
@@ -13,17 +24,44 @@ class FirstValidationGroup:
         sheet_name: str,
         inconsistencies_file: str,
         exception_file: str,
+        engine: str = "pandas",
+        backend: Optional[str] = None,
+        result_cache: Optional[str] = None,
+        compact_rows: Optional[str] = None,
+        partition_by: Optional[str] = None,
     ):
         self.path_file = path_file
         self.sheet_name = sheet_name
         self.inconsistencies_file = inconsistencies_file
         self.exception_file = exception_file
+        ## "sql" runs the join rules into the SQL engine instead of pandas
+        self.use_sql = engine == "sql"
+        ## Library used to read the bases (pandas or polars)
+        self.backend = get_backend(backend)
+        ## Folder to keep the results of the rules for the retries and re-runs
+        self.result_cache = ResultCache(result_cache) if result_cache else None
+        ## Rules whose inconsistencies are saved compact (the rows are whole by default)
+        self.compact_rows = compact_rows
+        ## Column to split the base (RAMO) and run the row rules in processes
+        self.partition_by = partition_by
+
+    def evaluate(
+        self, data_frame: pd.DataFrame, rule, col_idxs: list[int], *args
+    ) -> pd.Series:
+        """Method to evaluate a row rule of common.rules over the columns given, by
+        partitions of the base when partition_by is set"""
+        if self.partition_by and self.partition_by in data_frame.columns:
+            return run_partitioned(
+                data_frame, self.partition_by, rule, col_idxs, args
+            )
+        return rule(data_frame, *col_idxs, *args)
 
     def read_excel(self, file_path: str, sheet_name: str) -> pd.DataFrame:
         """Method for returning a data frame"""
-        return pd.read_excel(file_path, sheet_name=sheet_name, engine="openpyxl")
+        return read_excel(file_path, sheet_name, self.backend)
 
     def save_inconsistencies_file(self, df: pd.DataFrame, new_sheet: str) -> bool:
+        track_save(df, new_sheet)
         if os.path.exists(self.inconsistencies_file):
             with pd.ExcelFile(self.inconsistencies_file, engine="openpyxl") as xls:
                 if new_sheet in xls.sheet_names:
@@ -57,17 +95,14 @@ class FirstValidationGroup:
         """Method to validate the inconsistencies before append in a inconsistencies file"""
         if not df.empty:
             df = df.copy()
+            ## Excel row of each record (the header is the row 1)
+            rows: pd.Series = pd.Series(df.index + 2, index=df.index).astype(str)
             if isinstance(col_idx, int):
-                df[f"COORDENADAS"] = df.apply(
-                    lambda row: f"{self.excel_col_name(col_idx + 1)}{row.name + 2}",
-                    axis=1,
-                )
+                df["COORDENADAS"] = self.excel_col_name(col_idx + 1) + rows
             else:
                 for i in col_idx:
-                    df[f"COORDENADAS_{i + 2}"] = df.apply(
-                        lambda row: f"{self.excel_col_name(i+1)}{row.name + 2}",
-                        axis=1,
-                    )
+                    df[f"COORDENADAS_{i + 2}"] = self.excel_col_name(i + 1) + rows
+            df = project(df, col_idx, sheet_name, self.compact_rows)
             self.save_inconsistencies_file(df, sheet_name)
             return "SUCCESS: Inconsistencies guardadas correctamente"
         else:
@@ -102,26 +137,34 @@ class FirstValidationGroup:
             except ValueError:
                 return value in list_exception
 
-        data_frame["is_valid"] = (
-            data_frame.iloc[:, col_idx]
-            .astype(str)
-            .apply(lambda value: validate_with_exception_list(value))
+        data_frame["is_valid"] = self.strings(data_frame, col_idx).values.apply(
+            lambda value: validate_with_exception_list(value)
         )
         inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]]
         return self.validate_inconsistencies(inconsistencies, col_idx, "DatoTipoNumero")
 
+    def parse_dates(self, data_frame: pd.DataFrame, col_idx: int) -> ParsedDates:
+        """Method to get the date column parsed only once per session"""
+        return cached_dates(
+            self.path_file, self.sheet_name, col_idx, data_frame.iloc[:, col_idx]
+        )
+
+    def strings(self, data_frame: pd.DataFrame, col_idx: int) -> StringView:
+        """Method to get the column as text only once per session"""
+        return cached_strings(
+            self.path_file, self.sheet_name, col_idx, data_frame.iloc[:, col_idx]
+        )
+
     def date_type(self, col_idx: int) -> str:
         data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
-        data_frame["is_valid"] = pd.to_datetime(
-            data_frame.iloc[:, col_idx], errors="coerce"
-        ).notna()
+        data_frame["is_valid"] = self.parse_dates(data_frame, col_idx).is_valid
         inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]]
         return self.validate_inconsistencies(inconsistencies, col_idx, "DatosTipoFecha")
 
     def value_length(self, col_idx: int, length: int) -> str:
         data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
-        data_frame["is_valid"] = data_frame.iloc[:, col_idx].apply(
-            lambda value: len(str(value)) == length
+        data_frame["is_valid"] = self.evaluate(
+            data_frame, rules.value_length, [col_idx], length
         )
         inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]]
         return self.validate_inconsistencies(inconsistencies, col_idx, "LongitudValor")
@@ -144,16 +187,11 @@ class FirstValidationGroup:
 
     def no_special_characters(self, col_idx: int) -> str:
         data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
-        data_frame["is_valid"] = (
-            data_frame.iloc[:, col_idx]
-            .astype(str)
-            .apply(
-                lambda value: not pd.isna(value)
-                and bool(re.search(r"[^a-zA-Z0-9]", value))
-            )
+        data_frame["is_valid"] = self.evaluate(
+            data_frame, rules.no_special_characters, [col_idx]
         )
 
-        inconsistencies: pd.DataFrame = data_frame[data_frame["is_valid"]]
+        inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]]
         return self.validate_inconsistencies(
             inconsistencies, col_idx, "ValidacionCaracteresEspaciales"
         )
@@ -169,36 +207,11 @@ class FirstValidationGroup:
             exception_df.iloc[:, exception_idx].astype(str).dropna().to_list()
         )
 
-        ## Create s sub function to know the correct month depends on the number
-        months: dict = {
-            1: "ENERO",
-            2: "FEBRERO",
-            3: "MARZO",
-            4: "ABRIL",
-            5: "MAYO",
-            6: "JUNIO",
-            7: "JULIO",
-            8: "AGOSTO",
-            9: "SEPTIEMBRE",
-            10: "OCTUBRE",
-            11: "NOVIEMBRE",
-            12: "DICIEMBRE",
-        }
-
-        ## Create a sub function to validate the consistency of the date
-        def validate_consistency(date: str, month: str, radicado: str) -> bool:
-            date_parse = pd.to_datetime(date, format="%Y-%m-%d", errors="coerce")
-            get_month = date_parse.month
-            ## Call the dictionary
-            standard_month = months.get(get_month)
-            return (month == standard_month) or (radicado in exception_list)
-
-        data_frame["is_valid"] = data_frame.apply(
-            lambda row: validate_consistency(
-                row.iloc[date_idx], str(row.iloc[month_idx]), str(row.iloc[2])
-            ),
-            axis=1,
-        )
+        ## Compare the month name of the parsed date against the month column
+        standard_month: pd.Series = self.parse_dates(data_frame, date_idx).month_names()
+        data_frame["is_valid"] = (
+            self.strings(data_frame, month_idx).values == standard_month
+        ) | (self.strings(data_frame, 2).values.isin(exception_list))
         inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]]
         return self.validate_inconsistencies(
             inconsistencies, month_idx, "ValidacionMesCorte"
@@ -206,8 +219,8 @@ class FirstValidationGroup:
 
     def radicado_format(self, col_idx) -> str:
         data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
-        data_frame["is_valid"] = data_frame.iloc[:, col_idx].apply(
-            lambda value: bool(re.search(r"^\d{4}\s\d{2}\s\d{3}\s\d{6}$", str(value)))
+        data_frame["is_valid"] = self.evaluate(
+            data_frame, rules.radicado_format, [col_idx]
         )
         inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]]
         return self.validate_inconsistencies(
@@ -250,33 +263,16 @@ class FirstValidationGroup:
 
     def no_white_spaces(self, col_idx: int, new_sheet: str) -> str:
         data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
-        data_frame["is_valid"] = (
-            data_frame.iloc[:, col_idx]
-            .astype(str)
-            .apply(
-                lambda value: (pd.isna(value)) or not (bool(re.search(r"\s\s+", value)))
-            )
+        data_frame["is_valid"] = self.evaluate(
+            data_frame, rules.no_white_spaces, [col_idx]
         )
         inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]]
         return self.validate_inconsistencies(inconsistencies, col_idx, new_sheet)
 
     def percentage_format(self, col_idx: int, can_be_null: bool) -> str:
         data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
-
-        def validate_format(value: str) -> bool:
-            value = value.replace(" ", "")
-            normal_percentage = bool(re.search(r"^\d+\.\d{1,2}$", value))
-            concat_percentage = bool(re.search(r"^\d{2}%;\d{2}%$", value))
-            if not can_be_null:
-                return normal_percentage or concat_percentage or value == "1"
-            else:
-                is_nan: bool = value.lower() == "nan"
-                return normal_percentage or concat_percentage or is_nan
-
-        data_frame["is_valid"] = (
-            data_frame.iloc[:, col_idx]
-            .astype(str)
-            .apply(lambda value: validate_format(value))
+        data_frame["is_valid"] = self.evaluate(
+            data_frame, rules.percentage_format, [col_idx], can_be_null
         )
         inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]]
         return self.validate_inconsistencies(
@@ -291,17 +287,8 @@ class FirstValidationGroup:
         exception_list: pd.Series = (
             exception_df.iloc[:, 5].dropna().astype(str).to_list()
         )
-
-        ## Create a  subfunction to validate the identification
-        def validate_identification(identificador_pagos: str, radicado: str) -> bool:
-            if bool(re.search(r"(^\s+|\s+$|\s{2,})", identificador_pagos)):
-                return False
-            else:
-                return (identificador_pagos != "nan") or (radicado in exception_list)
-
-        data_frame["is_valid"] = data_frame.apply(
-            lambda row: validate_identification(str(row.iloc[75]), str(row.iloc[2])),
-            axis=1,
+        data_frame["is_valid"] = self.evaluate(
+            data_frame, rules.identification_pagos_iaxis, [75, 2], exception_list
         )
 
         inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]]
@@ -329,7 +316,7 @@ class FirstValidationGroup:
         exception_col: list[str] = (
             exception_df.iloc[:, exception_idx].dropna().astype(str).to_list()
         )
-        file_col: pd.Series = data_frame.iloc[:, col_idx].astype(str)
+        file_col: pd.Series = self.strings(data_frame, col_idx).values
         data_frame["is_valid"] = (file_col.isin(exception_col)) | (
             file_col.isin(list_col)
         )
@@ -348,6 +335,29 @@ class FirstValidationGroup:
         exception_list: list[str] = (
             exception_df.iloc[:, 1].dropna().astype(str).to_list()
         )
+        if self.use_sql:
+            with SqlEngine() as engine:
+                ## Only the bank (64) and its value (65) are used
+                engine.register("pagos", data_frame, [64, 65])
+                engine.register("listas", new_list_df)
+                engine.register("excepciones", pd.DataFrame({"banco": exception_list}))
+                ## Bank (64) with a different value (65) than the LISTAS sheet
+                rows: pd.Index = engine.rows(
+                    """
+                    SELECT p._row FROM pagos p
+                    LEFT JOIN listas l ON p.c64 = l.c0
+                    WHERE NOT (
+                        COALESCE(p.c65 = l.c1, FALSE)
+                        OR COALESCE(CAST(p.c64 AS TEXT), 'nan')
+                            IN (SELECT c0 FROM excepciones)
+                    )
+                    ORDER BY p._row
+                    """
+                )
+            inconsistencies: pd.DataFrame = data_frame.loc[rows]
+            return self.validate_inconsistencies(
+                inconsistencies, 64, "ValidacionBancos"
+            )
         col_1_name: str = data_frame.columns[64]
         col_2_name: str = new_list_df.columns[0]
         merged_df: pd.DataFrame = data_frame.merge(
@@ -366,54 +376,36 @@ class FirstValidationGroup:
     def mandatory_desempleo(self, new_sheet: str, col_idx: int) -> str:
         data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
 
-        ## Sub function to validate
-        def validation(desempleo: str, character: str) -> bool:
-            tomadores_allowed: list[str] = ["FONDO NACIONAL DEL AHORRO"]
-            is_desempleo = desempleo in tomadores_allowed
-            is_valid_character = character == "SI" or character == "NO"
-            first_validation = is_desempleo and is_valid_character
-            second_validation = not is_desempleo and character == "nan"
-            return first_validation or second_validation
-
-        data_frame["is_valid"] = data_frame.apply(
-            lambda row: validation(
-                str(row.iloc[15]),  # Tomador column
-                str(row.iloc[col_idx]),  # Special column
-            ),
-            axis=1,
-        )
+        tomadores_allowed: list[str] = ["FONDO NACIONAL DEL AHORRO"]
+        tomador: StringView = self.strings(data_frame, 15)
+        character: StringView = self.strings(data_frame, col_idx)  # Special column
+
+        ## The tomadores allowed answer SI or NO, the others leave it empty
+        is_desempleo: pd.Series = tomador.values.isin(tomadores_allowed)
+        data_frame["is_valid"] = (
+            is_desempleo & character.values.isin(["SI", "NO"])
+        ) | (~is_desempleo & character.is_null)
         inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]]
         return self.validate_inconsistencies(inconsistencies, [12, col_idx], new_sheet)
 
     def no_empty(self, col_idx: int, option: str, new_sheet: str) -> str:
         data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
 
-        ## Sub function to validate
-
-        def validate_empty(value: str) -> bool:
-            return value == "nan" or value == option
-
-        data_frame["is_valid"] = data_frame.iloc[:, col_idx].apply(
-            lambda value: validate_empty(str(value))
-        )
+        ## Empty or the option given
+        column: StringView = self.strings(data_frame, col_idx)
+        data_frame["is_valid"] = column.is_null | (column.values == option)
         inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]]
         return self.validate_inconsistencies(inconsistencies, [col_idx], new_sheet)
 
     def check_sarlaf(self) -> str:
         data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
 
-        ## Sub function to validate
-        def validate_sarlaf(sarlaf: str, bien_diligenciado: str) -> bool:
-            if sarlaf == "SI":
-                return bien_diligenciado == "X"
-            else:
-                return bien_diligenciado == "nan"
+        sarlaf: pd.Series = self.strings(data_frame, 85).values
+        bien_diligenciado: StringView = self.strings(data_frame, 86)
 
-        data_frame["is_valid"] = data_frame.apply(
-            lambda row: validate_sarlaf(
-                str(row.iloc[85]), str(row.iloc[86])  # Special column
-            ),
-            axis=1,
+        ## "X" when the sarlaf is "SI", empty otherwise
+        data_frame["is_valid"] = (bien_diligenciado.values == "X").where(
+            sarlaf == "SI", bien_diligenciado.is_null
         )
 
         inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]]
@@ -430,19 +422,15 @@ class FirstValidationGroup:
             exception_df.iloc[:, 3].dropna().astype(str).to_list()
         )
 
-        ## Sub function to validate the expiration date
-        def validate_date(ramo: str, expiration_date: str) -> bool:
-            if ramo == "DESEMPLEO":
-                return bool(re.search(r"^\d{2}/\d{2}/\d{4};\d{1,12}$", expiration_date))
-            else:
-                return (expiration_date == "nan") or ramo in exception_list
+        ramo: pd.Series = self.strings(data_frame, 12).values
+        expiration_date: StringView = self.strings(data_frame, 97)
 
-        data_frame["is_valid"] = data_frame.apply(
-            lambda row: validate_date(
-                str(row.iloc[12]),  ## Ramo
-                str(row.iloc[97]),  ## Fecha vencimiento
-            ),  # Ramo
-            axis=1,
+        ## DESEMPLEO needs the expiration date, the other ramos must leave it empty
+        data_frame["is_valid"] = rules.EXPIRATION_DATE_FORMAT.match(
+            expiration_date.values, is_text=True
+        ).where(
+            ramo == "DESEMPLEO",
+            expiration_date.is_null | ramo.isin(exception_list),
         )
 
         inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]]
@@ -473,9 +461,8 @@ class FirstValidationGroup:
             except ValueError:
                 return sap in exception_list
 
-        data_frame["is_valid"] = data_frame.apply(
-            lambda row: validate_number(str(row.iloc[77])),
-            axis=1,
+        data_frame["is_valid"] = self.strings(data_frame, 77).values.apply(
+            validate_number
         )
         inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]]
         return self.validate_inconsistencies(inconsistencies, 77, "ValidacionSap")
@@ -484,22 +471,15 @@ class FirstValidationGroup:
         data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
         polizas: list[str] = ["3400004306", "3400003706", "3400003704", "3400004407"]
         allowed: list[str] = ["SI", "NO", "NA"]
-        data_frame = data_frame[data_frame.iloc[:, 11].astype(str) == "334"]
-
-        ## Sub function to validate the cell format
-        def validate_cell_format(poliza: str, value: str) -> bool:
-            if poliza in polizas:
-                return value in allowed
-            else:
-                return value == "nan"
+        poliza: pd.Series = self.strings(data_frame, 6).values
+        otros_documentos: StringView = self.strings(data_frame, 103)
+        ramo: pd.Series = self.strings(data_frame, 11).values
 
-        data_frame["is_valid"] = data_frame.apply(
-            lambda row: validate_cell_format(
-                str(row.iloc[6]),  # Poliza
-                str(row.iloc[103]),  # Otros documentos
-            ),
-            axis=1,
+        ## The polizas listed answer SI, NO or NA, the others leave it empty
+        data_frame["is_valid"] = otros_documentos.values.isin(allowed).where(
+            poliza.isin(polizas), otros_documentos.is_null
         )
+        data_frame = data_frame[ramo == "334"]
         inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]]
         return self.validate_inconsistencies(
             inconsistencies, [6, 103], "ValidacionOtrosDocumentos"
@@ -512,13 +492,10 @@ class FirstValidationGroup:
             exception_df["CONCEPTO"].dropna().astype(str).to_list()
         )
 
-        ## Sub function to validate the concepto
-        def validate_concepto(concepto: str) -> bool:
-            return concepto in exception_list
-
-        data_frame["is_valid"] = data_frame["CONCEPTO"].apply(
-            lambda value: validate_concepto(str(value))
-        )
+        concepto: pd.Series = self.strings(
+            data_frame, data_frame.columns.get_loc("CONCEPTO")
+        ).values
+        data_frame["is_valid"] = concepto.isin(exception_list)
 
         inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]]
         return self.validate_inconsistencies(inconsistencies, 35, "ValidacionConcepto")
@@ -537,16 +514,30 @@ def main(params: dict) -> bool:
         sheet_name: str = params.get("sheet_name")
         inconsistencies_file: str = params.get("inconsistencies_file")
         exception_file: str = params.get("exception_file")
+        engine: str = params.get("engine") or "pandas"
+        backend: Optional[str] = params.get("backend")
+        result_cache: Optional[str] = params.get("result_cache")
+        compact_rows: Optional[str] = params.get("compact_rows")
+        partition_by: Optional[str] = params.get("partition_by")
 
         ## Pass the values to the constructor in the main class
         validation_group = FirstValidationGroup(
-            file_path, sheet_name, inconsistencies_file, exception_file
+            file_path,
+            sheet_name,
+            inconsistencies_file,
+            exception_file,
+            engine,
+            backend,
+            result_cache,
+            compact_rows,
+            partition_by,
         )
         return True
     except Exception as e:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_empty_cols(incomes: dict) -> str:
     try:
         col_idx = int(incomes.get("col_idx"))
@@ -558,6 +549,7 @@ def validate_empty_cols(incomes: dict) -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_number_type(params: dict) -> str:
     try:
         ## Set local variables
@@ -569,6 +561,7 @@ def validate_number_type(params: dict) -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_date_type(incomes: dict) -> str:
     try:
         ## Set local variables
@@ -580,6 +573,7 @@ def validate_date_type(incomes: dict) -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_length(incomes: dict) -> str:
     try:
         ## Set local variables
@@ -592,6 +586,7 @@ def validate_length(incomes: dict) -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_exception_list(params: dict) -> str:
     try:
         ## Set local variables
@@ -608,6 +603,7 @@ def validate_exception_list(params: dict) -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_special_characters(params: dict) -> str:
     try:
         ## Set local variables
@@ -618,6 +614,7 @@ def validate_special_characters(params: dict) -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_month(params: dict) -> str:
     try:
         ## Set local variables
@@ -634,6 +631,7 @@ def validate_month(params: dict) -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_numero_radicado(params: dict) -> str:
     try:
         ## Set local variables
@@ -644,6 +642,7 @@ def validate_numero_radicado(params: dict) -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_acuerdo_range(params: dict) -> str:
     try:
         ## Set local variables
@@ -654,6 +653,7 @@ def validate_acuerdo_range(params: dict) -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_compania_coaseguradora(params: dict) -> str:
     try:
         ## Set local variables
@@ -669,6 +669,7 @@ def validate_compania_coaseguradora(params: dict) -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_only_two_options(params: dict) -> str:
     try:
         ## Set local variables
@@ -681,6 +682,7 @@ def validate_only_two_options(params: dict) -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_no_white_spaces(params: dict) -> str:
     try:
         ## Set local variables
@@ -693,6 +695,7 @@ def validate_no_white_spaces(params: dict) -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_percentage_format(params: dict) -> str:
     try:
         ## Set local variables
@@ -705,6 +708,7 @@ def validate_percentage_format(params: dict) -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_identification_pagos_iaxis() -> str:
     try:
         validation: str = validation_group.identification_pagos_iaxis()
@@ -713,6 +717,7 @@ def validate_identification_pagos_iaxis() -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_need_exception(params: dict) -> str:
     try:
         ## Set local variables
@@ -731,6 +736,7 @@ def validate_need_exception(params: dict) -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_banks() -> str:
     try:
         validation: str = validation_group.banks_validation()
@@ -739,6 +745,7 @@ def validate_banks() -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_mandatory_desempleo(params: dict) -> str:
     try:
         ## Set local variables
@@ -750,6 +757,7 @@ def validate_mandatory_desempleo(params: dict) -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_not_empty(params: dict) -> str:
     try:
         ## Set local variables
@@ -762,6 +770,7 @@ def validate_not_empty(params: dict) -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_check_sarlaf() -> str:
     try:
         validation: str = validation_group.check_sarlaf()
@@ -770,6 +779,7 @@ def validate_check_sarlaf() -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_fecha_vencimiento() -> str:
     try:
         validation: str = validation_group.fecha_vencimiento()
@@ -778,6 +788,7 @@ def validate_fecha_vencimiento() -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_evento_5() -> str:
     try:
         validation: str = validation_group.evento_cinco()
@@ -786,6 +797,7 @@ def validate_evento_5() -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_sap() -> str:
     try:
         validation: str = validation_group.sap()
@@ -794,6 +806,7 @@ def validate_sap() -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_otros_documentos() -> str:
     try:
         validation: str = validation_group.otros_documentos()
@@ -802,6 +815,7 @@ def validate_otros_documentos() -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_concepto() -> str:
     try:
         validation: str = validation_group.concepto()
@@ -0,0 +1,226 @@
+import os
+import sys
+from typing import Tuple
+
+## Make the shared "common" package importable from the bot folders
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.pipeline import Pipeline, Stage, run_pipeline
+
+## Params of the classes of the process (first validation group and coaseguro)
+BASE: dict = {
+    "file_path": "{file_path}",
+    "sheet_name": "{sheet_name}",
+    "inconsistencies_file": "{inconsistencies_file}",
+    "exception_file": "{exception_file}",
+}
+FIRST_VALIDATION_GROUP: str = "02_pagos/first_validation_group.py"
+COASEGURO: str = "02_pagos/coaseguro.py"
+TABLES: str = "02_pagos/tables.py"
+
+
+def validation(name: str, script: str, function: str, init: str) -> Stage:
+    """Validation of a class already created by the stage init"""
+    return Stage(
+        name,
+        script,
+        function,
+        depends_on=(init,),
+        inputs=("{exception_file}",),
+        outputs=("{inconsistencies_file}",),
+    )
+
+
+def table(name: str, function: str) -> Stage:
+    """Pivot table saved into the base, after the validations that read it"""
+    return Stage(
+        name,
+        TABLES,
+        function,
+        depends_on=("tables", "validate_consecutivo_sap"),
+        outputs=("{file_path}",),
+    )
+
+
+PIPELINE = Pipeline(
+    "pagos",
+    [
+        ## Check of the sheets and headers of the inputs before any of them is
+        ## read: it has no outputs, so it runs again with the stages after it
+        Stage(
+            "preflight",
+            "02_pagos/preflight.py",
+            args=(
+                {
+                    "otros_ramos_file": "{otros_ramos_file}",
+                    "desempleo_file": "{desempleo_file}",
+                    "sheet_otros_ramos": "{sheet_otros_ramos}",
+                    "sheet_desempleo": "{sheet_desempleo}",
+                    "sheet_name": "{sheet_name}",
+                    "exception_file": "{exception_file}",
+                    "consecutivo_sap_file": "{consecutivo_sap_file}",
+                    "consecutivo_sheet": "{consecutivo_sheet}",
+                },
+            ),
+        ),
+        Stage(
+            "copy_and_concat_files",
+            "02_pagos/copy_and_concat_files.py",
+            args=(
+                {
+                    "otros_ramos_file": "{otros_ramos_file}",
+                    "desempleo_file": "{desempleo_file}",
+                    "sheet_otros_ramos": "{sheet_otros_ramos}",
+                    "sheet_desempleo": "{sheet_desempleo}",
+                    "begin_date": "{begin_date}",
+                    "cut_off_date": "{cut_off_date}",
+                    "col_idx": "{date_col_idx}",
+                    "destination_path": "{file_path}",
+                },
+            ),
+            depends_on=("preflight",),
+            inputs=("{otros_ramos_file}", "{desempleo_file}"),
+            outputs=("{file_path}",),
+        ),
+        Stage(
+            "first_validation_group",
+            FIRST_VALIDATION_GROUP,
+            args=(BASE,),
+            depends_on=("copy_and_concat_files",),
+        ),
+        validation(
+            "identification_pagos_iaxis",
+            FIRST_VALIDATION_GROUP,
+            "validate_identification_pagos_iaxis",
+            "first_validation_group",
+        ),
+        validation(
+            "banks", FIRST_VALIDATION_GROUP, "validate_banks", "first_validation_group"
+        ),
+        validation(
+            "check_sarlaf",
+            FIRST_VALIDATION_GROUP,
+            "validate_check_sarlaf",
+            "first_validation_group",
+        ),
+        validation(
+            "fecha_vencimiento",
+            FIRST_VALIDATION_GROUP,
+            "validate_fecha_vencimiento",
+            "first_validation_group",
+        ),
+        validation(
+            "sap", FIRST_VALIDATION_GROUP, "validate_sap", "first_validation_group"
+        ),
+        validation(
+            "otros_documentos",
+            FIRST_VALIDATION_GROUP,
+            "validate_otros_documentos",
+            "first_validation_group",
+        ),
+        validation(
+            "concepto",
+            FIRST_VALIDATION_GROUP,
+            "validate_concepto",
+            "first_validation_group",
+        ),
+        Stage(
+            "siniestro_date",
+            "02_pagos/siniestro_date.py",
+            args=(BASE,),
+            depends_on=("copy_and_concat_files",),
+            inputs=("{exception_file}",),
+            outputs=("{inconsistencies_file}",),
+        ),
+        Stage(
+            "coaseguro", COASEGURO, args=(BASE,), depends_on=("copy_and_concat_files",)
+        ),
+        validation(
+            "coaseguro_percentage",
+            COASEGURO,
+            "validate_coaseguro_percentage",
+            "coaseguro",
+        ),
+        validation(
+            "positiva_calculado", COASEGURO, "validate_positiva_calculado", "coaseguro"
+        ),
+        validation(
+            "coasegura_calculado",
+            COASEGURO,
+            "validate_coasegura_calculado",
+            "coaseguro",
+        ),
+        validation(
+            "total_valor_calculado",
+            COASEGURO,
+            "validate_total_valor_calculado",
+            "coaseguro",
+        ),
+        validation("sums", COASEGURO, "validate_sums", "coaseguro"),
+        Stage(
+            "consecutivo_sap",
+            "02_pagos/consecutivo_sap.py",
+            args=(
+                {
+                    "file_path": "{file_path}",
+                    "sheet_name": "{sheet_name}",
+                    "exception_file": "{exception_file}",
+                    "consecutivo_sap_file": "{consecutivo_sap_file}",
+                    "consecutivo_sheet": "{consecutivo_sheet}",
+                },
+            ),
+            depends_on=("copy_and_concat_files",),
+        ),
+        ## The consecutivos missing are saved into the exception file: after
+        ## every stage that reads it (the last validation waits for the others)
+        Stage(
+            "validate_consecutivo_sap",
+            "02_pagos/consecutivo_sap.py",
+            "validate_consecutivo_sap",
+            args=({"cut_off_date": "{cut_off_date}"},),
+            depends_on=("consecutivo_sap", "sums"),
+            inputs=("{consecutivo_sap_file}",),
+            outputs=("{exception_file}",),
+        ),
+        Stage(
+            "tables",
+            TABLES,
+            args=({"file_path": "{file_path}", "sheet_name": "{sheet_name}"},),
+            depends_on=("copy_and_concat_files",),
+        ),
+        table("valor_movimiento", "table_valor_movimiento"),
+        table("cantidad_registros", "table_cantidad_registros"),
+        table("valor_coaseguro_positiva", "table_valor_coaseguro_positiva"),
+        table("valor_positiva", "table_valor_positiva"),
+        table("valor_coaseguradora", "table_valor_coaseguradora"),
+    ],
+)
+
+
+def main(params: dict) -> Tuple[bool, str]:
+    """Run the pagos process: copy of the bases, validations, coaseguro,
+    consecutivo SAP and tables. Only the stages whose inputs changed since the
+    last run (and the ones downstream) are executed when cache_file is given"""
+    try:
+        return run_pipeline(PIPELINE, params)
+    except Exception as e:
+        return False, f"ERROR: {e}"
+
+
+if __name__ == "__main__":
+    params = {
+        "otros_ramos_file": r"C:\ProgramData\AutomationAnywhere\Bots\Logs\AD_RCSN_SabanaPagosYBasesParaSinestralidad\InputFolder\BDD PAGOS RECONOCIMIENTO POLIZAS DE VIDA PAGOS 2024 - OTROS RAMOS.xlsx",
+        "desempleo_file": r"C:\ProgramData\AutomationAnywhere\Bots\Logs\AD_RCSN_SabanaPagosYBasesParaSinestralidad\InputFolder\BDD PAGOS RECONOCIMIENTO POLIZAS DE VIDA – PAGOS 2024 - DESEMPLEO.xlsx",
+        "sheet_otros_ramos": "2024",
+        "sheet_desempleo": "2024 DESEMPLEO",
+        "begin_date": "01/01/2024",
+        "cut_off_date": "28/10/2024",
+        "date_col_idx": "72",
+        "file_path": r"C:\ProgramData\AutomationAnywhere\Bots\Logs\AD_RCSN_SabanaPagosYBasesParaSinestralidad\TempFolder\BASE DE PAGOS.xlsx",
+        "sheet_name": "PAGOS",
+        "inconsistencies_file": r"C:\ProgramData\AutomationAnywhere\Bots\Logs\AD_RCSN_SabanaPagosYBasesParaSinestralidad\OutputFolder\INCONSISTENCIAS\InconBasePagos.xlsx",
+        "exception_file": r"C:\ProgramData\AutomationAnywhere\Bots\Logs\AD_RCSN_SabanaPagosYBasesParaSinestralidad\InputFolder\EXCEPCIONES BASE PAGOS.xlsx",
+        "consecutivo_sap_file": r"C:\ProgramData\AutomationAnywhere\Bots\Logs\AD_RCSN_SabanaPagosYBasesParaSinestralidad\InputFolder\CONSECUTIVO SAP 2023.xlsx",
+        "consecutivo_sheet": "NUMERO DE PAGOO",
+        "cache_file": r"C:\ProgramData\AutomationAnywhere\Bots\Logs\AD_RCSN_SabanaPagosYBasesParaSinestralidad\TempFolder\pipeline_pagos.json",
+    }
+    print(main(params))
@@ -0,0 +1,77 @@
+import os
+import sys
+from typing import Tuple
+
+## Make the shared "common" package importable from the bot folders
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.schema import SheetLayout, preflight
+
+## The bases are cut to their first 111 columns and the rules read them by
+## position (iloc) and some of them by name
+BASE_COLUMNS: int = 111
+BASE_HEADERS: tuple[str, ...] = ("CONCEPTO", "EVENTO 5")
+
+## Sheet written by copy_and_concat_files into the temp base
+PAGOS_SHEET: str = "PAGOS"
+
+
+def main(params: dict) -> Tuple[bool, str]:
+    """Check the sheets and headers of the inputs of the pagos process before
+    the bases are read, the process fails in milliseconds when a sheet was
+    renamed or the columns moved"""
+    try:
+        errors: list[str] = []
+        if params.get("sheet_name") != PAGOS_SHEET:
+            errors.append(
+                f"the sheet of the temp base is '{PAGOS_SHEET}',"
+                f" not '{params.get('sheet_name')}'"
+            )
+        return preflight(
+            [
+                (
+                    params.get("otros_ramos_file"),
+                    [
+                        SheetLayout(
+                            params.get("sheet_otros_ramos"),
+                            BASE_COLUMNS,
+                            columns=BASE_HEADERS,
+                        ),
+                        SheetLayout("OGDS", BASE_COLUMNS),
+                    ],
+                ),
+                (
+                    params.get("desempleo_file"),
+                    [SheetLayout(params.get("sheet_desempleo"), BASE_COLUMNS)],
+                ),
+                (
+                    params.get("exception_file"),
+                    [
+                        SheetLayout("LISTAS", columns=("SAP", "CONCEPTO")),
+                        SheetLayout("OTRAS EXCEPCIONES"),
+                        SheetLayout("COASEGURO"),
+                        SheetLayout("CONSECUTIVO SAP"),
+                    ],
+                ),
+                (
+                    params.get("consecutivo_sap_file"),
+                    [SheetLayout(params.get("consecutivo_sheet"))],
+                ),
+            ],
+            errors,
+        )
+    except Exception as e:
+        return False, f"ERROR: {e}"
+
+
+if __name__ == "__main__":
+    params = {
+        "otros_ramos_file": r"C:\ProgramData\AutomationAnywhere\Bots\Logs\AD_RCSN_SabanaPagosYBasesParaSinestralidad\InputFolder\BDD PAGOS RECONOCIMIENTO POLIZAS DE VIDA PAGOS 2024 - OTROS RAMOS.xlsx",
+        "desempleo_file": r"C:\ProgramData\AutomationAnywhere\Bots\Logs\AD_RCSN_SabanaPagosYBasesParaSinestralidad\InputFolder\BDD PAGOS RECONOCIMIENTO POLIZAS DE VIDA – PAGOS 2024 - DESEMPLEO.xlsx",
+        "sheet_otros_ramos": "2024",
+        "sheet_desempleo": "2024 DESEMPLEO",
+        "sheet_name": "PAGOS",
+        "exception_file": r"C:\ProgramData\AutomationAnywhere\Bots\Logs\AD_RCSN_SabanaPagosYBasesParaSinestralidad\InputFolder\EXCEPCIONES BASE PAGOS.xlsx",
+        "consecutivo_sap_file": r"C:\ProgramData\AutomationAnywhere\Bots\Logs\AD_RCSN_SabanaPagosYBasesParaSinestralidad\InputFolder\CONSECUTIVO SAP 2023.xlsx",
+        "consecutivo_sheet": "NUMERO DE PAGOO",
+    }
+    print(main(params))
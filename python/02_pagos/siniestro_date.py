@@ -1,5 +1,11 @@
 import pandas as pd  # type: ignore
 import traceback
+import os
+import sys
+
+## Make the shared "common" package importable from the bot folders
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.dates import cached_dates
 
 def main(params: dict) -> str:
     try:
@@ -30,13 +36,11 @@ def main(params: dict) -> str:
         aviso_siniestro_index = 21
         email_financiera_index = 72
 
-        # Convert the columns to datetime
-        data_frame.iloc[:, aviso_siniestro_index] = pd.to_datetime(
-            data_frame.iloc[:, aviso_siniestro_index], errors="coerce"
-        )
-        data_frame.iloc[:, email_financiera_index] = pd.to_datetime(
-            data_frame.iloc[:, email_financiera_index], errors="coerce"
-        )
+        # Convert the columns to datetime (parsed once per session)
+        for date_index in (aviso_siniestro_index, email_financiera_index):
+            data_frame.iloc[:, date_index] = cached_dates(
+                file_path, sheet_name, date_index, data_frame.iloc[:, date_index]
+            ).values
 
         # Calculate the difference in years
         data_frame["validate_dates"] = (
@@ -2,18 +2,27 @@ import pandas as pd  # type: ignore
 from datetime import datetime
 import traceback
 from typing import Optional
+import os
+import sys
+
+## Make the shared "common" package importable from the bot folders
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.backend import get_backend, read_excel
+from common.dates import cached_dates
 
 
 class Tables:
     """Clase para manejar la información de coaseguros"""
 
-    def __init__(self, file_path: str, sheet_name: str):
+    def __init__(self, file_path: str, sheet_name: str, backend: Optional[str] = None):
         self.path_file = file_path
         self.sheet_name = sheet_name
+        ## Library used to read the bases (pandas or polars)
+        self.backend = get_backend(backend)
 
     def read_excel(self, file_path: str, sheet_name: str) -> pd.DataFrame:
         """Method for returning a data frame"""
-        return pd.read_excel(file_path, sheet_name=sheet_name, engine="openpyxl")
+        return read_excel(file_path, sheet_name, self.backend)
 
     def create_pivot_table(
         self, df: pd.DataFrame, value_column: str, columna: str, aggfunc: str
@@ -63,27 +72,11 @@ class Tables:
             data_frame.to_excel(writer, sheet_name=sheet_name, index=True)
             return "Tabla guardada correctamente"
 
-    def get_month(self, date: str) -> str:
-        months = {
-            1: "ENERO",
-            2: "FEBRERO",
-            3: "MARZO",
-            4: "ABRIL",
-            5: "MAYO",
-            6: "JUNIO",
-            7: "JULIO",
-            8: "AGOSTO",
-            9: "SEPTIEMBRE",
-            10: "OCTUBRE",
-            11: "NOVIEMBRE",
-            12: "DICIEMBRE",
-        }
-
-        date_variable: pd.Timestamp = pd.to_datetime(
-            date, format="%d/%m/%Y", errors="coerce"
-        )
-        month = months.get(date_variable.month)
-        return month
+    def get_month_names(self, data_frame: pd.DataFrame, col_idx: int) -> pd.Series:
+        """Method to get the month name of each date, parsing the column once per session"""
+        return cached_dates(
+            self.path_file, self.sheet_name, col_idx, data_frame.iloc[:, col_idx]
+        ).month_names()
 
 
 ##* INITIALIZE THE VARIABLE TO INSTANCE THE MAIN CLASS
@@ -98,9 +91,10 @@ def main(params: dict) -> bool:
         ## Get the variables
         file_path: str = params.get("file_path")
         sheet_name: str = params.get("sheet_name")
+        backend: Optional[str] = params.get("backend")
 
         ## Pass the values to the constructor in the main class
-        tables = Tables(file_path, sheet_name)
+        tables = Tables(file_path, sheet_name, backend)
         return True
     except Exception as e:
         return f"ERROR: {e}"
@@ -112,8 +106,8 @@ def table_valor_movimiento():
             tables.path_file, tables.sheet_name
         )
         ## Get the month depends on the "FECHA E MAIL ENVIO FINANCIERA"
-        pagos_data_frame["MES_ENVIO_FINANCIERA"] = pagos_data_frame.iloc[:, 72].apply(
-            lambda date: tables.get_month(date)
+        pagos_data_frame["MES_ENVIO_FINANCIERA"] = tables.get_month_names(
+            pagos_data_frame, 72
         )
         ## Create pivot table for the sum of "VALOR RESERVA" by "MES_ENVIO_FINANCIERA"
         valor_reserva = tables.create_pivot_table(
@@ -136,8 +130,8 @@ def table_cantidad_registros():
             tables.path_file, tables.sheet_name
         )
         ## Get the month depends on the "FECHA E MAIL ENVIO FINANCIERA"
-        pagos_data_frame["MES_ENVIO_FINANCIERA"] = pagos_data_frame.iloc[:, 72].apply(
-            lambda date: tables.get_month(date)
+        pagos_data_frame["MES_ENVIO_FINANCIERA"] = tables.get_month_names(
+            pagos_data_frame, 72
         )
         ## Create pivot table for the sum of "VALOR RESERVA" by "MES_ENVIO_FINANCIERA"
         valor_reserva = tables.create_pivot_table(
@@ -160,8 +154,8 @@ def table_valor_coaseguro_positiva():
             tables.path_file, tables.sheet_name
         )
         ## Get the month depends on the "FECHA E MAIL ENVIO FINANCIERA"
-        pagos_data_frame["MES_ENVIO_FINANCIERA"] = pagos_data_frame.iloc[:, 72].apply(
-            lambda date: tables.get_month(date)
+        pagos_data_frame["MES_ENVIO_FINANCIERA"] = tables.get_month_names(
+            pagos_data_frame, 72
         )
         ## Create pivot table for the sum of "VALOR RESERVA" by "MES_ENVIO_FINANCIERA"
         valor_reserva = pd.pivot_table(
@@ -186,8 +180,8 @@ def table_valor_positiva():
         )
 
         # Get the month depends on the "FECHA E MAIL ENVIO FINANCIERA"
-        pagos_data_frame["MES_ENVIO_FINANCIERA"] = pagos_data_frame.iloc[:, 72].apply(
-            lambda date: tables.get_month(date)
+        pagos_data_frame["MES_ENVIO_FINANCIERA"] = tables.get_month_names(
+            pagos_data_frame, 72
         )
 
         # Create pivot table for the sum of "VALOR RESERVA" by "MES_ENVIO_FINANCIERA"
@@ -224,8 +218,8 @@ def table_valor_coaseguradora():
         )
 
         # Get the month depends on the "FECHA E MAIL ENVIO FINANCIERA"
-        pagos_data_frame["MES_ENVIO_FINANCIERA"] = pagos_data_frame.iloc[:, 72].apply(
-            lambda date: tables.get_month(date)
+        pagos_data_frame["MES_ENVIO_FINANCIERA"] = tables.get_month_names(
+            pagos_data_frame, 72
         )
         # Create pivot table for the sum of "VALOR RESERVA" by "MES_ENVIO_FINANCIERA"
         # y aplicamos el formato decimal directamente en la agregación
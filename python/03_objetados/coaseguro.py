@@ -2,6 +2,25 @@ import pandas as pd  # type: ignore
 import numpy as np  # type: ignore
 from typing import Optional
 import os
+import sys
+
+## Make the shared "common" package importable from the bot folders
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.backend import get_backend, read_excel
+from common.result_cache import ResultCache, cached_result, track_read, track_save
+from common.inconsistencies import project
+from common.coaseguro_sheet import COASEGURO_SHEET, merge_coaseguro
+from common.money import (
+    CENTS,
+    MONEY_TOLERANCE,
+    PERCENTAGE_TOLERANCE,
+    apply_percentage,
+    equal_within,
+    to_basis_points,
+    to_cents,
+    to_pesos,
+    to_rate,
+)
 
 
 class Coaseguro:
@@ -13,17 +32,30 @@ class Coaseguro:
         sheet_name: str,
         inconsistencies_file: str,
         exception_file: str,
+        backend: Optional[str] = None,
+        result_cache: Optional[str] = None,
+        compact_rows: Optional[str] = None,
     ):
         self.path_file = file_path
         self.sheet_name = sheet_name
         self.inconsistencies_file = inconsistencies_file
         self.exception_file = exception_file
+        ## Library used to read the bases (pandas or polars)
+        self.backend = get_backend(backend)
+        ## Data frames with the calculated columns, computed once per session
+        self.computed_df: Optional[pd.DataFrame] = None
+        self.money_df: Optional[pd.DataFrame] = None
+        ## Folder to keep the results of the rules for the retries and re-runs
+        self.result_cache = ResultCache(result_cache) if result_cache else None
+        ## Rules whose inconsistencies are saved compact (the rows are whole by default)
+        self.compact_rows = compact_rows
 
     def read_excel(self, file_path: str, sheet_name: str) -> pd.DataFrame:
         """Method for returning a data frame"""
-        return pd.read_excel(file_path, sheet_name=sheet_name, engine="openpyxl")
+        return read_excel(file_path, sheet_name, self.backend)
 
     def save_inconsistencies_file(self, df: pd.DataFrame, new_sheet: str) -> bool:
+        track_save(df, new_sheet)
         if os.path.exists(self.inconsistencies_file):
             with pd.ExcelFile(self.inconsistencies_file, engine="openpyxl") as xls:
                 if new_sheet in xls.sheet_names:
@@ -52,22 +84,20 @@ class Coaseguro:
         return result
 
     def validate_inconsistencies(
-        self, df: pd.DataFrame, col_idx, sheet_name: str
+        self, df: pd.DataFrame, col_idx, sheet_name: str, base_rows: bool = True
     ) -> str:
-        """Method to validate the inconsistencies before append in a inconsistencies file"""
+        """Method to validate the inconsistencies before append in a inconsistencies file
+        base_rows=False saves the frames that are not rows of the base as they are"""
         if not df.empty:
             df = df.copy()
+            rows: pd.Series = pd.Series(df.index + 2, index=df.index).astype(str)
             if isinstance(col_idx, int):
-                df[f"COORDENADAS"] = df.apply(
-                    lambda row: f"{self.excel_col_name(col_idx + 1)}{row.name + 2}",
-                    axis=1,
-                )
+                df[f"COORDENADAS"] = self.excel_col_name(col_idx + 1) + rows
             else:
                 for i in col_idx:
-                    df[f"COORDENADAS_{i + 2}"] = df.apply(
-                        lambda row: f"{self.excel_col_name(i + 1)}{row.name + 2}",
-                        axis=1,
-                    )
+                    df[f"COORDENADAS_{i + 2}"] = self.excel_col_name(i + 1) + rows
+            if base_rows:
+                df = project(df, col_idx, sheet_name, self.compact_rows)
             self.save_inconsistencies_file(df, sheet_name)
             return "SUCCESS: Inconsistencies guardadas correctamente"
         else:
@@ -95,44 +125,107 @@ class Coaseguro:
 
     def data_from_coaseguro_sheet(self) -> str:
         data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
-        coaseguro_df: pd.DataFrame = self.read_excel(self.exception_file, "COASEGURO")
-        coaseguro_df = coaseguro_df.iloc[:, 0:6]
-        ## Merge data
-        name_col_pagos: str = data_frame.columns[6]
-        name_col_coaseguro: str = coaseguro_df.columns[0]
-        merged_df: pd.DataFrame = data_frame.merge(
-            coaseguro_df,
-            left_on=name_col_pagos,
-            right_on=name_col_coaseguro,
-            how="left",
-            suffixes=("_PAGOS", "_COASEGURO"),
+        coaseguro_df: pd.DataFrame = self.read_excel(
+            self.exception_file, COASEGURO_SHEET
         )
-
-        def validate_equals(pagos: str, coaseguro: str) -> bool:
-            print(pagos, coaseguro)
-            print(type(pagos), type(coaseguro))
-            return float(pagos) == float(coaseguro)
-
-        merged_df["is_valid"] = merged_df.apply(
-            lambda row: validate_equals(float(row.iloc[48]), float(row.iloc[114])),
-            axis=1,
+        ## Merge data by the poliza (6), the rows keep the coordinates of the base
+        merged_df: pd.DataFrame = merge_coaseguro(data_frame, coaseguro_df)
+
+        ## Porcentaje positiva of the base (48) vs the one of the sheet (114)
+        merged_df["is_valid"] = equal_within(
+            to_basis_points(merged_df.iloc[:, 48]),
+            to_basis_points(merged_df.iloc[:, 114]),
+            PERCENTAGE_TOLERANCE,
         )
         inconsistencies: pd.DataFrame = merged_df[~merged_df["is_valid"]]
         return self.validate_inconsistencies(
             inconsistencies, 48, "ValidacionValorPositiva"
         )
 
+    def parse_coaseguradora_percentage(self, column: pd.Series) -> pd.Series:
+        """Method to parse the coaseguradora percentage for the whole column.
+        The values come as a decimal ("0.4") or as two percentages ("20%;20%")"""
+        values: pd.Series = (
+            column.astype(str)
+            .str.replace("%", "", regex=False)
+            .str.replace(" ", "", regex=False)
+        )
+        is_concat: pd.Series = values.str.contains(";", regex=False)
+
+        ## Decimal values, "nan" stays as NaN like the float conversion does
+        result: pd.Series = pd.to_numeric(values.where(~is_concat), errors="coerce")
+        is_wrong: pd.Series = ~is_concat & result.isna() & (values.str.lower() != "nan")
+
+        ## Concatenated values are the sum of the first two percentages
+        parts: pd.DataFrame = values.where(is_concat).str.split(";", expand=True)
+        if parts.shape[1] > 1:
+            ## Only integer percentages are allowed in each part
+            first: pd.Series = parts[0].where(
+                parts[0].str.fullmatch(r"[+-]?\d+", na=False)
+            )
+            second: pd.Series = parts[1].where(
+                parts[1].str.fullmatch(r"[+-]?\d+", na=False)
+            )
+            concat_sum: pd.Series = (
+                pd.to_numeric(first, errors="coerce")
+                + pd.to_numeric(second, errors="coerce")
+            ) / 100.0
+            result = result.where(~is_concat, concat_sum)
+            is_wrong |= is_concat & concat_sum.isna()
+
+        ## The values with a wrong format count as zero
+        return result.mask(is_wrong, 0.0)
+
+    def compute_coaseguro(self) -> pd.DataFrame:
+        """Method to compute the calculated columns used by the coaseguro validations.
+        The file is read and the columns are calculated only the first time"""
+        track_read(self.path_file)
+        if self.computed_df is None:
+            data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
+            porcentaje_coaseguradora: pd.Series = self.parse_coaseguradora_percentage(
+                data_frame.iloc[:, 50]
+            )
+
+            ## Money in cents and percentages with 8 decimals to compare integers
+            money: pd.DataFrame = pd.DataFrame(
+                {
+                    "VR_MOVIMIENTO": to_cents(data_frame.iloc[:, 45]),
+                    "PORCENTAJE_POSITIVA": to_rate(data_frame.iloc[:, 48]),
+                    "VR_POSITIVA": to_cents(data_frame.iloc[:, 49]),
+                    "PORCENTAJE_COASEGURADORA": to_rate(porcentaje_coaseguradora),
+                    "VR_COASEGURADORA": to_cents(data_frame.iloc[:, 51]),
+                }
+            )
+            money["POSITIVA_CALCULADOS"] = apply_percentage(
+                money["VR_MOVIMIENTO"], money["PORCENTAJE_POSITIVA"]
+            )
+            money["COASEGURADORA_CALCULADO"] = apply_percentage(
+                money["VR_MOVIMIENTO"], money["PORCENTAJE_COASEGURADORA"]
+            )
+            money["VALOR_CIEN_PORCIENTO_CALCULADO"] = money[
+                "POSITIVA_CALCULADOS"
+            ].fillna(0) + money["COASEGURADORA_CALCULADO"].fillna(0)
+
+            ## Calculated columns to show in the inconsistencies file
+            data_frame["POSITIVA_CALCULADOS"] = to_pesos(money["POSITIVA_CALCULADOS"])
+            data_frame["PORCENTAJE_COASEGURADORA"] = porcentaje_coaseguradora
+            data_frame["COASEGURADORA_CALCULADO"] = to_pesos(
+                money["COASEGURADORA_CALCULADO"]
+            )
+            data_frame["VALOR_CIEN_PORCIENTO_CALCULADO"] = to_pesos(
+                money["VALOR_CIEN_PORCIENTO_CALCULADO"]
+            )
+            self.computed_df = data_frame
+            self.money_df = money
+        return self.computed_df.copy()
+
     def positiva_calculados(self) -> str:
-        data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
-        ## Columns
-        vr_movimiento: pd.Series = data_frame.iloc[:, 45]
-        porcentaje_positiva: pd.Series = data_frame.iloc[:, 48]
-        vr_positiva: pd.Series = data_frame.iloc[:, 49].astype(float).round(2)
+        data_frame: pd.DataFrame = self.compute_coaseguro()
+        money: pd.DataFrame = self.money_df
 
-        data_frame["POSITIVA_CALCULADOS"] = (
-            (vr_movimiento * porcentaje_positiva).astype(float).round(2)
+        data_frame["VALIDACION"] = equal_within(
+            money["POSITIVA_CALCULADOS"], money["VR_POSITIVA"], MONEY_TOLERANCE
         )
-        data_frame["VALIDACION"] = data_frame["POSITIVA_CALCULADOS"] == vr_positiva
         inconsistencies: pd.DataFrame = data_frame[~data_frame["VALIDACION"]]
         ## Save inconsistencies into file
         return self.validate_inconsistencies(
@@ -140,103 +233,29 @@ class Coaseguro:
         )
 
     def coasegura_calculado(self) -> str:
-        data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
-        vr_100: pd.Series = data_frame.iloc[:, 45].astype(float).round(2)
-        porcentaje_coaseguradora: pd.Series = data_frame.iloc[:, 50]
-
-        ## Subfunction to validate and fix the coaseguradora percentage
-        def fix_coaseguradora_percentage(value: str) -> float:
-            try:
-                # Eliminar caracteres innecesarios
-                value = value.replace("%", "").replace(" ", "")
-                # Si el valor contiene un ';', procesarlo como suma
-                if ";" in value:
-                    values = value.split(";")
-                    # Convertir los dos valores y calcular el resultado
-                    total_percentage = int(values[0]) + int(values[1])
-                    result = total_percentage / 100.0
-                else:
-                    # Si no contiene ';', convertir directamente a flotante
-                    result = float(value)
-                return result
-            except (ValueError, IndexError) as e:
-                # Si hay algún error en la conversión o el formato, manejarlo aquí
-                print(f"Error al procesar el valor '{value}': {e}")
-                return 0.0  # Devolver un valor por defecto en caso de error
-
-        data_frame = data_frame[data_frame.iloc[:, 42] == "COASEGURO"]
-
-        data_frame["PORCENTAJE_COASEGURADORA"] = porcentaje_coaseguradora.astype(
-            str
-        ).apply(lambda value: fix_coaseguradora_percentage(value))
-
-        data_frame["COASEGURADORA_CALCULADO"] = (
-            data_frame["PORCENTAJE_COASEGURADORA"] * vr_100
-        )
-
-        ## Sub function to validate the belonging
-        def validate_belonging(vr_coaseguro: float, coaseguro_calculado: float) -> bool:
-            return round(vr_coaseguro, 2) == round(coaseguro_calculado, 2)
+        data_frame: pd.DataFrame = self.compute_coaseguro()
+        data_frame = data_frame[data_frame.iloc[:, 42] == "COASEGURO"].copy()
+        money: pd.DataFrame = self.money_df.loc[data_frame.index]
 
-        data_frame["VR_COASEGURO_VS_COASEGURO_CALCULADO"] = data_frame.apply(
-            lambda row: validate_belonging(float(row.iloc[51]), float(row.iloc[112])),
-            axis=1,
+        ## Validate the belonging of the VR COASEGURO with the calculated value
+        data_frame["VR_COASEGURO_VS_COASEGURO_CALCULADO"] = equal_within(
+            money["VR_COASEGURADORA"], money["COASEGURADORA_CALCULADO"], MONEY_TOLERANCE
         )
         inconsistencies: pd.DataFrame = data_frame[
             ~data_frame["VR_COASEGURO_VS_COASEGURO_CALCULADO"]
         ]
         return self.validate_inconsistencies(
-            inconsistencies, [51, 112], "ValidacionCoaseguroCalculado"
+            inconsistencies, [51, 113], "ValidacionCoaseguroCalculado"
         )
 
     def valor_cien_porciento_calculado(self) -> str:
-        data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
-        ## Columns
-        vr_movimiento: pd.Series = data_frame.iloc[:, 45]
-        porcentaje_positiva: pd.Series = data_frame.iloc[:, 48]
-        vr_100: pd.Series = data_frame.iloc[:, 45].astype(float).round(2)
-        porcentaje_coaseguradora: pd.Series = data_frame.iloc[:, 50]
-
-        data_frame["POSITIVA_CALCULADOS"] = (
-            (vr_movimiento * porcentaje_positiva).astype(float).round(2)
-        ).fillna(0)
-
-        ## Subfunction to validate and fix the coaseguradora percentage
-        def fix_coaseguradora_percentage(value: str) -> float:
-            try:
-                # Eliminar caracteres innecesarios
-                value = value.replace("%", "").replace(" ", "")
-                # Si el valor contiene un ';', procesarlo como suma
-                if ";" in value:
-                    values = value.split(";")
-                    # Convertir los dos valores y calcular el resultado
-                    total_percentage = int(values[0]) + int(values[1])
-                    result = total_percentage / 100.0
-                else:
-                    # Si no contiene ';', convertir directamente a flotante
-                    result = float(value)
-                return result
-            except (ValueError, IndexError) as e:
-                # Si hay algún error en la conversión o el formato, manejarlo aquí
-                print(f"Error al procesar el valor '{value}': {e}")
-                return 0.0  # Devolver un valor por defecto en caso de error
-
-        data_frame["PORCENTAJE_COASEGURADORA"] = (
-            porcentaje_coaseguradora.astype(str)
-            .apply(lambda value: fix_coaseguradora_percentage(value))
-            .fillna(0)
-        )
-
-        data_frame["COASEGURADORA_CALCULADO"] = (
-            data_frame["PORCENTAJE_COASEGURADORA"] * vr_100
-        ).fillna(0)
+        data_frame: pd.DataFrame = self.compute_coaseguro()
+        money: pd.DataFrame = self.money_df
 
-        data_frame["VALOR_CIEN_PORCIENTO_CALCULADO"] = (
-            data_frame["POSITIVA_CALCULADOS"] + data_frame["COASEGURADORA_CALCULADO"]
-        ).fillna(0)
-
-        data_frame["VR_CALCULADO_VS_VR_100_PORCIENTO"] = (
-            data_frame["VALOR_CIEN_PORCIENTO_CALCULADO"] == vr_100
+        data_frame["VR_CALCULADO_VS_VR_100_PORCIENTO"] = equal_within(
+            money["VALOR_CIEN_PORCIENTO_CALCULADO"],
+            money["VR_MOVIMIENTO"],
+            MONEY_TOLERANCE,
         )
 
         inconsistencies: pd.DataFrame = data_frame[
@@ -248,27 +267,28 @@ class Coaseguro:
         )
 
     def validate_sums(self) -> str:
-        data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
-        ## 45, 49, 51
-        vr_cien_porciento = round(float(data_frame.iloc[:, 45].astype(float).sum()), 2)
-        vr_positiva = round(float(data_frame.iloc[:, 49].astype(float).sum()), 2)
-        vr_coaseguradora = round(float(data_frame.iloc[:, 51].astype(float).sum()), 2)
+        self.compute_coaseguro()
+        money: pd.DataFrame = self.money_df
+        ## 45, 49, 51 summed as integer cents
+        vr_cien_porciento = int(money["VR_MOVIMIENTO"].sum())
+        vr_positiva = int(money["VR_POSITIVA"].sum())
+        vr_coaseguradora = int(money["VR_COASEGURADORA"].sum())
 
         total_calculado = vr_positiva + vr_coaseguradora
 
-        is_valid = vr_cien_porciento == total_calculado
+        is_valid = abs(vr_cien_porciento - total_calculado) <= MONEY_TOLERANCE
 
         totales = {
-            "VR_CIEN_PORCIENTO": vr_cien_porciento,
-            "VR_POSITIVA": vr_positiva,
-            "VR_COASEGURADORA": vr_coaseguradora,
-            "TOTAL_CALCULADO": total_calculado,
+            "VR_CIEN_PORCIENTO": vr_cien_porciento / CENTS,
+            "VR_POSITIVA": vr_positiva / CENTS,
+            "VR_COASEGURADORA": vr_coaseguradora / CENTS,
+            "TOTAL_CALCULADO": total_calculado / CENTS,
             "IS_VALID": is_valid,
         }
         new_df: pd.DataFrame = pd.DataFrame([totales])
         inconsistencies: pd.DataFrame = new_df[~new_df["IS_VALID"].astype(bool)]
         return self.validate_inconsistencies(
-            inconsistencies, [45, 49, 51], "ValidacionSumasTotales"
+            inconsistencies, [45, 49, 51], "ValidacionSumasTotales", base_rows=False
         )
 
 
@@ -286,16 +306,26 @@ def main(params: dict) -> bool:
         sheet_name: str = params.get("sheet_name")
         inconsistencies_file: str = params.get("inconsistencies_file")
         exception_file: str = params.get("exception_file")
+        backend: Optional[str] = params.get("backend")
+        result_cache: Optional[str] = params.get("result_cache")
+        compact_rows: Optional[str] = params.get("compact_rows")
 
         ## Pass the values to the constructor in the main class
         coaseguro = Coaseguro(
-            file_path, sheet_name, inconsistencies_file, exception_file
+            file_path,
+            sheet_name,
+            inconsistencies_file,
+            exception_file,
+            backend,
+            result_cache,
+            compact_rows,
         )
         return True
     except Exception as e:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: coaseguro)
 def validate_coaseguro_percentage() -> str:
     try:
         ## Set local variables
@@ -305,6 +335,7 @@ def validate_coaseguro_percentage() -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: coaseguro)
 def validate_data_from_coaseguro() -> str:
     try:
         ## Set local variables
@@ -314,6 +345,7 @@ def validate_data_from_coaseguro() -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: coaseguro)
 def validate_positiva_calculado() -> str:
     try:
         ## Set local variables
@@ -323,6 +355,7 @@ def validate_positiva_calculado() -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: coaseguro)
 def validate_coasegura_calculado() -> str:
     try:
         ## Set local variables
@@ -332,6 +365,7 @@ def validate_coasegura_calculado() -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: coaseguro)
 def validate_total_valor_calculado() -> str:
     try:
         ## Set local variables
@@ -341,6 +375,7 @@ def validate_total_valor_calculado() -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: coaseguro)
 def validate_sums() -> str:
     try:
         ## Set local variables
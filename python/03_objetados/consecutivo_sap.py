@@ -3,6 +3,12 @@ import numpy as np  # type: ignore
 from typing import Optional
 import os
 from openpyxl import load_workbook  # type: ignore
+import sys
+
+## Make the shared "common" package importable from the bot folders
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.dates import cached_dates, parse_dates
+from common.xlsx_stream import iter_frames
 
 
 class Consecutivo:
@@ -15,12 +21,15 @@ class Consecutivo:
         inconsistencies_file: str,
         exception_file: str,
         consecutivo_sap_file: str,
+        chunk_size: Optional[int] = None,
     ):
         self.path_file = file_path
         self.sheet_name = sheet_name
         self.inconsistencies_file = inconsistencies_file
         self.exception_file = exception_file
         self.consecutivo_sap_file = consecutivo_sap_file
+        ## Rows per chunk to stream the base in the out-of-core mode (None: whole)
+        self.chunk_size = chunk_size
 
     def read_excel(self, file_path: str, sheet_name: str) -> pd.DataFrame:
         """Method for returning a data frame"""
@@ -77,7 +86,12 @@ class Consecutivo:
             return "INFO: Validacion realizada, no se encontraron inconsistencias"
 
     def filter_file(
-        self, data_frame: pd.DataFrame, cut_off_date: str, col_idx: int
+        self,
+        data_frame: pd.DataFrame,
+        cut_off_date: str,
+        col_idx: int,
+        file_path: str,
+        sheet_name: str,
     ) -> pd.DataFrame:
         """Method to filter the file according to the defined criteria"""
 
@@ -92,7 +106,9 @@ class Consecutivo:
         col_name = data_frame.columns[col_idx]
 
         # Convert the specified column to datetime type and assign it back to the DataFrame
-        data_frame[col_name] = pd.to_datetime(data_frame[col_name], errors="coerce")
+        data_frame[col_name] = cached_dates(
+            file_path, sheet_name, col_idx, data_frame[col_name]
+        ).values
 
         # Filter DataFrame by month and year
         filtered_df: pd.DataFrame = data_frame[
@@ -102,9 +118,32 @@ class Consecutivo:
 
         return filtered_df  # Return the filtered DataFrame
 
+    def pagos_consecutivos(self, cut_off_date: str) -> list:
+        """Method to get the consecutivos of the pagos of the month of the cut off
+        date without duplicates. In the out-of-core mode the base is read by chunks
+        and only the consecutivos found are kept between them"""
+        if not self.chunk_size:
+            pagos_file: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
+            pagos_df = self.filter_file(
+                pagos_file, cut_off_date, 72, self.path_file, self.sheet_name
+            )
+            return pagos_df.iloc[:, 73].drop_duplicates().to_list()
+
+        date: pd.Timestamp = pd.to_datetime(
+            cut_off_date, format="%d/%m/%Y", errors="coerce"
+        )
+        consecutivos: pd.Series = pd.Series(dtype=object)
+        for chunk in iter_frames(self.path_file, self.sheet_name, self.chunk_size):
+            dates: pd.Series = parse_dates(chunk.iloc[:, 72]).values
+            in_month: pd.Series = (dates.dt.month == date.month) & (
+                dates.dt.year == date.year
+            )
+            consecutivos = pd.concat(
+                [consecutivos, chunk.loc[in_month].iloc[:, 73]]
+            ).drop_duplicates()
+        return consecutivos.to_list()
+
     def consecutivo(self, cut_off_date: str) -> str:
-        ## Pagos data frame
-        pagos_file: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
         ## Consecutivo data frame
         consecutivo_file: pd.DataFrame = self.read_excel(
             self.consecutivo_sap_file, "NUEMRO DE PAGO"
@@ -112,9 +151,13 @@ class Consecutivo:
         ## Information from EXCEPTION FILE
         list_df: pd.DataFrame = self.read_excel(self.exception_file, "CONSECUTIVO SAP")
         ## Consecutivo data frame after being filtered
-        consecutivo_df = self.filter_file(consecutivo_file, cut_off_date, 0)
-        ## Pagos data frame after being filtered
-        pagos_df = self.filter_file(pagos_file, cut_off_date, 72)
+        consecutivo_df = self.filter_file(
+            consecutivo_file,
+            cut_off_date,
+            0,
+            self.consecutivo_sap_file,
+            "NUEMRO DE PAGO",
+        )
 
         ##* Local variables
         initial_consecutivo: int = int(list_df.iloc[0, 1])
@@ -122,7 +165,7 @@ class Consecutivo:
         ## List of values from the EXCEPTION FILE TODO: Validate first
         pending_list: list[int] = list_df.iloc[:, 0].dropna().astype(int).to_list()
         ## List of values from PAGOS FILE without duplicates
-        consecutivos_pagos: list = pagos_df.iloc[:, 73].drop_duplicates().to_list()
+        consecutivos_pagos: list = self.pagos_consecutivos(cut_off_date)
 
         ##! FIXED BUG: Make a copy to store the temp list
         consecutivos_pagos_copy = consecutivos_pagos.copy()
@@ -235,6 +278,7 @@ def main(params: dict) -> bool:
         inconsistencies_file: str = params.get("inconsistencies_file")
         exception_file: str = params.get("exception_file")
         consecutivo_sap_file: str = params.get("consecutivo_sap_file")
+        chunk_size = params.get("chunk_size")
 
         ## Pass the values to the constructor in the main class
         consecutivo = Consecutivo(
@@ -243,6 +287,7 @@ def main(params: dict) -> bool:
             inconsistencies_file,
             exception_file,
             consecutivo_sap_file,
+            int(chunk_size) if chunk_size else None,
         )
         return True
     except Exception as e:
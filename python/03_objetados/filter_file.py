@@ -1,5 +1,11 @@
+import os
+import sys
 import pandas as pd  # type: ignore
 
+## Make the shared "common" package importable from the bot folders
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.xlsx_stream import filter_copy
+
 
 def main(params: dict):
     try:
@@ -19,24 +25,16 @@ def main(params: dict):
         begin_date = pd.to_datetime(begin_date, format="%d/%m/%Y")
         cut_off_date = pd.to_datetime(cut_off_date, format="%d/%m/%Y")
 
-        ##Read the books and make a filter
-        objetados_df: pd.DataFrame = pd.read_excel(
-            path_file, sheet_name=sheet_name, engine="openpyxl"
-        ).iloc[:, :111]
-
-        ## Convert the column to date type
-        objetados_df.iloc[:, col_idx] = pd.to_datetime(
-            objetados_df.iloc[:, col_idx], format="%d/%m/%Y"
+        ## Stream the rows of the first 111 columns between the dates into the temp file
+        filter_copy(
+            [(path_file, sheet_name)],
+            temp_file,
+            sheet_name,
+            col_idx,
+            begin_date,
+            cut_off_date,
+            max_col=111,
         )
-
-        ## Make a filter
-        objetados_df = objetados_df[
-            (objetados_df.iloc[:, col_idx] >= begin_date)
-            & (objetados_df.iloc[:, col_idx] <= cut_off_date)
-        ]
-
-        ## Save changes into a temp folder
-        objetados_df.to_excel(temp_file, index=False, sheet_name=sheet_name)
         return True, "Temp file created successfully"
 
     except Exception as e:
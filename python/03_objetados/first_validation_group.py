@@ -1,6 +1,18 @@
 import pandas as pd  # type:ignore
-from typing import Optional
-import re
+from typing import Callable, Optional
+import os
+import sys
+
+## Make the shared "common" package importable from the bot folders
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.backend import get_backend, read_excel
+from common.dates import ParsedDates, cached_dates, parse_dates
+from common.inconsistencies import project
+from common.partition import run_partitioned
+from common import rules
+from common.result_cache import ResultCache, cached_result, track_read, track_save
+from common.strings import StringView, cached_strings, string_view
+from common.xlsx_stream import iter_frames
 
 
 class FirstValidationGroup:
@@ -12,18 +24,45 @@ class FirstValidationGroup:
         sheet_name: str,
         inconsistencies_file: str,
         exception_file: str,
+        backend: Optional[str] = None,
+        result_cache: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+        compact_rows: Optional[str] = None,
+        partition_by: Optional[str] = None,
     ):
         self.path_file = path_file
         self.sheet_name = sheet_name
         self.inconsistencies_file = inconsistencies_file
         self.exception_file = exception_file
+        ## Library used to read the bases (pandas or polars)
+        self.backend = get_backend(backend)
+        ## Folder to keep the results of the rules for the retries and re-runs
+        self.result_cache = ResultCache(result_cache) if result_cache else None
+        ## Rows per chunk to stream the base in the out-of-core mode (None: whole)
+        self.chunk_size = chunk_size
+        ## Rules whose inconsistencies are saved compact (the rows are whole by default)
+        self.compact_rows = compact_rows
+        ## Column to split the base (RAMO) and run the row rules in processes
+        self.partition_by = partition_by
+
+    def evaluate(
+        self, data_frame: pd.DataFrame, rule, col_idxs: list[int], *args
+    ) -> pd.Series:
+        """Method to evaluate a row rule of common.rules over the columns given, by
+        partitions of the base when partition_by is set"""
+        if self.partition_by and self.partition_by in data_frame.columns:
+            return run_partitioned(
+                data_frame, self.partition_by, rule, col_idxs, args
+            )
+        return rule(data_frame, *col_idxs, *args)
 
     def read_excel(self, file_path: str, sheet_name: str) -> pd.DataFrame:
         """Method for returning a data frame"""
-        return pd.read_excel(file_path, sheet_name=sheet_name, engine="openpyxl")
+        return read_excel(file_path, sheet_name, self.backend)
 
     def save_inconsistencies_file(self, df: pd.DataFrame, new_sheet: str) -> bool:
         """Method to save the inconsistencies in a new sheet or update an existing one"""
+        track_save(df, new_sheet)
         with pd.ExcelFile(self.inconsistencies_file, engine="openpyxl") as xls:
             if new_sheet in xls.sheet_names:
                 existing = pd.read_excel(xls, engine="openpyxl", sheet_name=new_sheet)
@@ -46,77 +85,126 @@ class FirstValidationGroup:
             result = chr(65 + reminder) + result
         return result
 
+    def add_coordinates(self, df: pd.DataFrame, col_idx) -> pd.DataFrame:
+        """Method to add the Excel coordinates of the columns given to each row"""
+        df = df.copy()
+        ## Excel row of each record (the header is the row 1)
+        rows: pd.Series = pd.Series(df.index + 2, index=df.index).astype(str)
+        if isinstance(col_idx, int):
+            df["COORDENADAS"] = self.excel_col_name(col_idx + 1) + rows
+        else:
+            for i in col_idx:
+                df[f"COORDENADAS_{i + 2}"] = self.excel_col_name(i + 1) + rows
+        return df
+
     def validate_inconsistencies(
         self, df: pd.DataFrame, col_idx, sheet_name: str
     ) -> str:
         """Method to validate the inconsistencies before append in a inconsistencies file"""
         if not df.empty:
-            df = df.copy()
-            if isinstance(col_idx, int):
-                df[f"COORDENADAS"] = df.apply(
-                    lambda row: f"{self.excel_col_name(col_idx + 1)}{row.name + 2}",
-                    axis=1,
-                )
-            else:
-                for i in col_idx:
-                    df[f"COORDENADAS_{i + 2}"] = df.apply(
-                        lambda row: f"{self.excel_col_name(i+1)}{row.name + 2}",
-                        axis=1,
-                    )
+            df = self.add_coordinates(df, col_idx)
+            df = project(df, col_idx, sheet_name, self.compact_rows)
             self.save_inconsistencies_file(df, sheet_name)
             return "SUCCESS: Inconsistencies guardadas correctamente"
         else:
             return "INFO: Validacion realizada, no se encontraron inconsistencias"
 
-    def validate_empty_col(self, col_idx: int, mandatory: bool) -> str:
-        # Leer el archivo de Excel
-        data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
+    def validate_rows(
+        self,
+        check: Callable[[pd.DataFrame], pd.DataFrame],
+        col_idx,
+        sheet_name: str,
+    ) -> str:
+        """Method to run a row rule (check returns the inconsistencies of a data
+        frame) over the base. In the out-of-core mode the inconsistencies are
+        saved each time chunk_size of them are found, so memory stays bounded"""
+        if not self.chunk_size:
+            data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
+            return self.validate_inconsistencies(check(data_frame), col_idx, sheet_name)
+
+        ## The chunks keep the index of the rows in the sheet for the coordinates
+        track_read(self.path_file)
+        found: bool = False
+        pending: list[pd.DataFrame] = []
+        for data_frame in iter_frames(self.path_file, self.sheet_name, self.chunk_size):
+            inconsistencies: pd.DataFrame = check(data_frame)
+            if inconsistencies.empty:
+                continue
+            found = True
+            inconsistencies = self.add_coordinates(inconsistencies, col_idx)
+            pending.append(
+                project(inconsistencies, col_idx, sheet_name, self.compact_rows)
+            )
+            if sum(len(df) for df in pending) >= self.chunk_size:
+                self.save_inconsistencies_file(pd.concat(pending), sheet_name)
+                pending = []
+        if pending:
+            self.save_inconsistencies_file(pd.concat(pending), sheet_name)
+        if found:
+            return "SUCCESS: Inconsistencies guardadas correctamente"
+        return "INFO: Validacion realizada, no se encontraron inconsistencias"
 
+    def validate_empty_col(self, col_idx: int, mandatory: bool) -> str:
         # Validar si las celdas están vacías (NaN o espacios vacíos)
-        data_frame["is_empty"] = data_frame.iloc[:, col_idx].isna()
-
-        # Validar las inconsistencias según si la columna es obligatoria
+        def check(data_frame: pd.DataFrame) -> pd.DataFrame:
+            data_frame["is_empty"] = data_frame.iloc[:, col_idx].isna()
+            # Validar las inconsistencias según si la columna es obligatoria
+            if mandatory:
+                return data_frame[~data_frame["is_empty"]]
+            return data_frame[data_frame["is_empty"]]
+
+        # Retornar el resultado
         if mandatory:
-            inconsistencies: pd.DataFrame = data_frame[~data_frame["is_empty"]]
-            # Retornar el resultado
-            return self.validate_inconsistencies(
-                inconsistencies, col_idx, "ColumnasVacias"
-            )
+            return self.validate_rows(check, col_idx, "ColumnasVacias")
         else:
-            # Retornar el resultado
-            inconsistencies: pd.DataFrame = data_frame[data_frame["is_empty"]]
-            return self.validate_inconsistencies(
-                inconsistencies, col_idx, "ColumnasNoVacias"
-            )
+            return self.validate_rows(check, col_idx, "ColumnasNoVacias")
 
     def number_type(self, col_idx: int) -> str:
-        data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
-
         # Sub function to validate if the value is a number type
         def is_number(value: str) -> bool:
             return value.replace(";", "").replace(".", "").isdigit()
 
-        data_frame["is_valid"] = data_frame.iloc[:, col_idx].apply(
-            lambda value: is_number(str(value))
+        def check(data_frame: pd.DataFrame) -> pd.DataFrame:
+            data_frame["is_valid"] = data_frame.iloc[:, col_idx].apply(
+                lambda value: is_number(str(value))
+            )
+            return data_frame[~data_frame["is_valid"]]
+
+        return self.validate_rows(check, col_idx, "DatoTipoNumero")
+
+    def parse_dates(self, data_frame: pd.DataFrame, col_idx: int) -> ParsedDates:
+        """Method to get the date column parsed only once per session, the chunks
+        of the out-of-core mode are parsed each time"""
+        if self.chunk_size:
+            return parse_dates(data_frame.iloc[:, col_idx])
+        return cached_dates(
+            self.path_file, self.sheet_name, col_idx, data_frame.iloc[:, col_idx]
+        )
+
+    def strings(self, data_frame: pd.DataFrame, col_idx: int) -> StringView:
+        """Method to get the column as text only once per session, the chunks of
+        the out-of-core mode are converted each time"""
+        if self.chunk_size:
+            return string_view(data_frame.iloc[:, col_idx])
+        return cached_strings(
+            self.path_file, self.sheet_name, col_idx, data_frame.iloc[:, col_idx]
         )
-        inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]]
-        return self.validate_inconsistencies(inconsistencies, col_idx, "DatoTipoNumero")
 
     def date_type(self, col_idx: int) -> str:
-        data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
-        data_frame["is_valid"] = pd.to_datetime(
-            data_frame.iloc[:, col_idx], errors="coerce"
-        ).notna()
-        inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]]
-        return self.validate_inconsistencies(inconsistencies, col_idx, "DatosTipoFecha")
+        def check(data_frame: pd.DataFrame) -> pd.DataFrame:
+            data_frame["is_valid"] = self.parse_dates(data_frame, col_idx).is_valid
+            return data_frame[~data_frame["is_valid"]]
+
+        return self.validate_rows(check, col_idx, "DatosTipoFecha")
 
     def value_length(self, col_idx: int, length: int) -> str:
-        data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
-        data_frame["is_valid"] = data_frame.iloc[:, col_idx].apply(
-            lambda value: len(str(value)) == length
-        )
-        inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]]
-        return self.validate_inconsistencies(inconsistencies, col_idx, "LongitudValor")
+        def check(data_frame: pd.DataFrame) -> pd.DataFrame:
+            data_frame["is_valid"] = self.evaluate(
+                data_frame, rules.value_length, [col_idx], length
+            )
+            return data_frame[~data_frame["is_valid"]]
+
+        return self.validate_rows(check, col_idx, "LongitudValor")
 
     def validate_exception_list(
         self,
@@ -125,35 +213,29 @@ class FirstValidationGroup:
         exception_sheet: str,
         new_sheet: str,
     ) -> str:
-        data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
         exception_data_frame: pd.DataFrame = self.read_excel(
             self.exception_file, exception_sheet
         )
         col_exception: pd.Series = exception_data_frame[exception_col_name].dropna()
-        data_frame["is_valid"] = data_frame.iloc[:, col_idx].isin(col_exception)
-        inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]]
-        return self.validate_inconsistencies(inconsistencies, col_idx, new_sheet)
+
+        def check(data_frame: pd.DataFrame) -> pd.DataFrame:
+            data_frame["is_valid"] = data_frame.iloc[:, col_idx].isin(col_exception)
+            return data_frame[~data_frame["is_valid"]]
+
+        return self.validate_rows(check, col_idx, new_sheet)
 
     def no_special_characters(self, col_idx: int) -> str:
-        data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
-        data_frame["is_valid"] = (
-            data_frame.iloc[:, col_idx]
-            .astype(str)
-            .apply(
-                lambda value: not pd.isna(value)
-                and bool(re.search(r"[^a-zA-Z0-9]", value))
+        def check(data_frame: pd.DataFrame) -> pd.DataFrame:
+            data_frame["is_valid"] = self.evaluate(
+                data_frame, rules.no_special_characters, [col_idx]
             )
-        )
+            return data_frame[~data_frame["is_valid"]]
 
-        inconsistencies: pd.DataFrame = data_frame[data_frame["is_valid"]]
-        return self.validate_inconsistencies(
-            inconsistencies, col_idx, "ValidacionCaracteresEspaciales"
-        )
+        return self.validate_rows(check, col_idx, "ValidacionCaracteresEspaciales")
 
     def month_depends_on_date(
         self, date_idx: int, month_idx: int, exception_sheet: str, exception_idx: int
     ) -> str:
-        data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
         exception_df: pd.DataFrame = self.read_excel(
             self.exception_file, exception_sheet
         )
@@ -161,143 +243,93 @@ class FirstValidationGroup:
             exception_df.iloc[:, exception_idx].astype(str).dropna().to_list()
         )
 
-        ## Create s sub function to know the correct month depends on the number
-        months: dict = {
-            1: "ENERO",
-            2: "FEBRERO",
-            3: "MARZO",
-            4: "ABRIL",
-            5: "MAYO",
-            6: "JUNIO",
-            7: "JULIO",
-            8: "AGOSTO",
-            9: "SEPTIEMBRE",
-            10: "OCTUBRE",
-            11: "NOVIEMBRE",
-            12: "DICIEMBRE",
-        }
-
-        ## Create a sub function to validate the consistency of the date
-        def validate_consistency(date: str, month: str, radicado: str) -> bool:
-            date_parse = pd.to_datetime(date, format="%Y-%m-%d", errors="coerce")
-            get_month = date_parse.month
-            ## Call the dictionary
-            standard_month = months.get(get_month)
-            return (month == standard_month) or (radicado in exception_list)
-
-        data_frame["is_valid"] = data_frame.apply(
-            lambda row: validate_consistency(
-                row.iloc[date_idx], str(row.iloc[month_idx]), str(row.iloc[2])
-            ),
-            axis=1,
-        )
-        inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]]
-        return self.validate_inconsistencies(
-            inconsistencies, month_idx, "ValidacionMesCorte"
-        )
+        ## Compare the month name of the parsed date against the month column
+        def check(data_frame: pd.DataFrame) -> pd.DataFrame:
+            standard_month: pd.Series = self.parse_dates(
+                data_frame, date_idx
+            ).month_names()
+            data_frame["is_valid"] = (
+                self.strings(data_frame, month_idx).values == standard_month
+            ) | (self.strings(data_frame, 2).values.isin(exception_list))
+            return data_frame[~data_frame["is_valid"]]
+
+        return self.validate_rows(check, month_idx, "ValidacionMesCorte")
 
     def radicado_format(self, col_idx) -> str:
-        data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
-        data_frame["is_valid"] = data_frame.iloc[:, col_idx].apply(
-            lambda value: bool(re.search(r"^\d{4}\s\d{2}\s\d{3}\s\d{6}$", str(value)))
-        )
-        inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]]
-        return self.validate_inconsistencies(
-            inconsistencies, col_idx, "FormatoNumeroRadicado"
-        )
+        def check(data_frame: pd.DataFrame) -> pd.DataFrame:
+            data_frame["is_valid"] = self.evaluate(
+                data_frame, rules.radicado_format, [col_idx]
+            )
+            return data_frame[~data_frame["is_valid"]]
+
+        return self.validate_rows(check, col_idx, "FormatoNumeroRadicado")
 
     def acuerdo_range(self, col_idx: int) -> str:
-        data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
-        data_frame["is_valid"] = data_frame.iloc[:, col_idx].apply(
-            lambda value: 1 <= value <= 30
-        )
-        inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]]
-        return self.validate_inconsistencies(
-            inconsistencies, col_idx, "ValidacionAcuerdo"
-        )
+        def check(data_frame: pd.DataFrame) -> pd.DataFrame:
+            data_frame["is_valid"] = data_frame.iloc[:, col_idx].apply(
+                lambda value: 1 <= value <= 30
+            )
+            return data_frame[~data_frame["is_valid"]]
+
+        return self.validate_rows(check, col_idx, "ValidacionAcuerdo")
 
     def coaseguradora(
         self, file_idx: int, exception_sheet: str, exception_col: str
     ) -> str:
-        data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
         exception_df: pd.DataFrame = self.read_excel(
             self.exception_file, exception_sheet
         )
         exception_col: pd.Series = exception_df[exception_col].dropna()
-        file_col: pd.Series = data_frame.iloc[:, file_idx]
-        data_frame["is_valid"] = (file_col.isin(exception_col)) | (pd.isna(file_col))
 
-        inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]]
-        return self.validate_inconsistencies(
-            inconsistencies, file_idx, "CompañiaCoaseguradora"
-        )
+        def check(data_frame: pd.DataFrame) -> pd.DataFrame:
+            file_col: pd.Series = data_frame.iloc[:, file_idx]
+            data_frame["is_valid"] = (file_col.isin(exception_col)) | (
+                pd.isna(file_col)
+            )
+            return data_frame[~data_frame["is_valid"]]
+
+        return self.validate_rows(check, file_idx, "CompañiaCoaseguradora")
 
     def only_two_options(self, col_idx: int, options: list[str], new_sheet: str) -> str:
-        data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
-        data_frame["id_valid"] = data_frame.iloc[:, col_idx].apply(
-            lambda value: (value in options) or (pd.isna(value))
-        )
-        inconsistencies: pd.DataFrame = data_frame[~data_frame["id_valid"]]
-        return self.validate_inconsistencies(inconsistencies, col_idx, new_sheet)
+        def check(data_frame: pd.DataFrame) -> pd.DataFrame:
+            data_frame["id_valid"] = data_frame.iloc[:, col_idx].apply(
+                lambda value: (value in options) or (pd.isna(value))
+            )
+            return data_frame[~data_frame["id_valid"]]
+
+        return self.validate_rows(check, col_idx, new_sheet)
 
     def no_white_spaces(self, col_idx: int, new_sheet: str) -> str:
-        data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
-        data_frame["is_valid"] = (
-            data_frame.iloc[:, col_idx]
-            .astype(str)
-            .apply(
-                lambda value: (pd.isna(value)) or not (bool(re.search(r"\s\s+", value)))
+        def check(data_frame: pd.DataFrame) -> pd.DataFrame:
+            data_frame["is_valid"] = self.evaluate(
+                data_frame, rules.no_white_spaces, [col_idx]
             )
-        )
-        inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]]
-        return self.validate_inconsistencies(inconsistencies, col_idx, new_sheet)
+            return data_frame[~data_frame["is_valid"]]
+
+        return self.validate_rows(check, col_idx, new_sheet)
 
     def percentage_format(self, col_idx: int, can_be_null: bool) -> str:
-        data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
-
-        def validate_format(value: str) -> bool:
-            value = value.replace(" ", "")
-            normal_percentage = bool(re.search(r"^\d+\.\d{1,2}$", value))
-            concat_percentage = bool(re.search(r"^\d{2}%;\d{2}%$", value))
-            if not can_be_null:
-                return normal_percentage or concat_percentage or value == "1"
-            else:
-                is_nan: bool = value.lower() == "nan"
-                return normal_percentage or concat_percentage or is_nan
-
-        data_frame["is_valid"] = (
-            data_frame.iloc[:, col_idx]
-            .astype(str)
-            .apply(lambda value: validate_format(value))
-        )
-        inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]]
-        return self.validate_inconsistencies(
-            inconsistencies, col_idx, "FormatoPorcentaje"
-        )
+        def check(data_frame: pd.DataFrame) -> pd.DataFrame:
+            data_frame["is_valid"] = self.evaluate(
+                data_frame, rules.percentage_format, [col_idx], can_be_null
+            )
+            return data_frame[~data_frame["is_valid"]]
+
+        return self.validate_rows(check, col_idx, "FormatoPorcentaje")
 
     def identification_pagos_iaxis(self) -> str:
-        data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
         exception_df: pd.DataFrame = self.read_excel(
             self.exception_file, "OTRAS EXCEPCIONES"
         )
         exception_list: list = exception_df.iloc[:, 5].dropna().astype(str).to_list()
 
-        ## Create a  subfunction to validate the identification
-        def validate_identification(identificador_pagos: str, radicado: str) -> bool:
-            if bool(re.search(r"(^\s+|\s+$|\s{2,})", identificador_pagos)):
-                return False
-            else:
-                return (identificador_pagos != "nan") or (radicado in exception_list)
-
-        data_frame["is_valid"] = data_frame.apply(
-            lambda row: validate_identification(str(row.iloc[75]), str(row.iloc[2])),
-            axis=1,
-        )
+        def check(data_frame: pd.DataFrame) -> pd.DataFrame:
+            data_frame["is_valid"] = self.evaluate(
+                data_frame, rules.identification_pagos_iaxis, [75, 2], exception_list
+            )
+            return data_frame[~data_frame["is_valid"]]
 
-        inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]]
-        return self.validate_inconsistencies(
-            inconsistencies, [12, 75], "IdentificacionPagosIaxis"
-        )
+        return self.validate_rows(check, [12, 75], "IdentificacionPagosIaxis")
 
     def need_exception(
         self,
@@ -308,7 +340,6 @@ class FirstValidationGroup:
         list_sheet: str,
         list_idx: int,
     ) -> str:
-        data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
         ## List data frame
         list_df: pd.DataFrame = self.read_excel(self.exception_file, list_sheet)
         list_col: list[str] = list_df.iloc[:, list_idx].dropna().astype(str).to_list()
@@ -319,17 +350,18 @@ class FirstValidationGroup:
         exception_col: list[str] = (
             exception_df.iloc[:, exception_idx].dropna().astype(str).to_list()
         )
-        file_col: pd.Series = data_frame.iloc[:, col_idx].astype(str)
-        data_frame["is_valid"] = (file_col.isin(exception_col)) | (
-            file_col.isin(list_col)
-        )
 
-        inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]]
-        return self.validate_inconsistencies(inconsistencies, col_idx, new_sheet)
+        def check(data_frame: pd.DataFrame) -> pd.DataFrame:
+            file_col: pd.Series = self.strings(data_frame, col_idx).values
+            data_frame["is_valid"] = (file_col.isin(exception_col)) | (
+                file_col.isin(list_col)
+            )
+            return data_frame[~data_frame["is_valid"]]
+
+        return self.validate_rows(check, col_idx, new_sheet)
 
     def banks_validation(self) -> str:
         ## Data frames
-        data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
         list_df: pd.DataFrame = self.read_excel(self.exception_file, "LISTAS")
         exception_df: pd.DataFrame = self.read_excel(
             self.exception_file, "OTRAS EXCEPCIONES"
@@ -338,85 +370,67 @@ class FirstValidationGroup:
         exception_list: list[str] = (
             exception_df.iloc[:, 1].dropna().astype(str).to_list()
         )
-        col_1_name: str = data_frame.columns[64]
-        col_2_name: str = new_list_df.columns[0]
-        merged_df: pd.DataFrame = data_frame.merge(
-            new_list_df,
-            how="left",
-            left_on=col_1_name,
-            right_on=col_2_name,
-            suffixes=("_PAGOS", "_LISTAS"),
-        )
-        merged_df["is_valid"] = (merged_df.iloc[:, 65] == merged_df.iloc[:, -1]) | (
-            merged_df.iloc[:, 64].astype(str).isin(exception_list)
-        )
-        inconsistencies: pd.DataFrame = merged_df[~merged_df["is_valid"]]
-        return self.validate_inconsistencies(inconsistencies, 64, "ValidacionBancos")
+
+        def check(data_frame: pd.DataFrame) -> pd.DataFrame:
+            col_1_name: str = data_frame.columns[64]
+            col_2_name: str = new_list_df.columns[0]
+            merged_df: pd.DataFrame = data_frame.merge(
+                new_list_df,
+                how="left",
+                left_on=col_1_name,
+                right_on=col_2_name,
+                suffixes=("_PAGOS", "_LISTAS"),
+            )
+            ## Keep the rows of the chunk in their place in the sheet
+            if len(merged_df) == len(data_frame):
+                merged_df.index = data_frame.index
+            merged_df["is_valid"] = (
+                merged_df.iloc[:, 65] == merged_df.iloc[:, -1]
+            ) | (merged_df.iloc[:, 64].astype(str).isin(exception_list))
+            return merged_df[~merged_df["is_valid"]]
+
+        return self.validate_rows(check, 64, "ValidacionBancos")
 
     def mandatory_desempleo(self, new_sheet: str, col_idx: int) -> str:
-        data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
-
-        ## Sub function to validate
-        def validation(desempleo: str, character: str) -> bool:
-            tomadores_allowed: list[str] = ["FONDO NACIONAL DEL AHORRO"]
-            is_desempleo = desempleo in tomadores_allowed
-            is_valid_character = character == "SI" or character == "NO"
-            first_validation = is_desempleo and is_valid_character
-            second_validation = not is_desempleo and character == "nan"
-            return first_validation or second_validation
-
-        data_frame["is_valid"] = data_frame.apply(
-            lambda row: validation(
-                str(row.iloc[15]),  # Tomador column
-                str(row.iloc[col_idx]),  # Special column
-            ),
-            axis=1,
-        )
-        inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]]
-        return self.validate_inconsistencies(inconsistencies, [15, col_idx], new_sheet)
+        tomadores_allowed: list[str] = ["FONDO NACIONAL DEL AHORRO"]
 
-    def no_empty(self, col_idx: int, option: str, new_sheet: str) -> str:
-        data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
+        def check(data_frame: pd.DataFrame) -> pd.DataFrame:
+            tomador: StringView = self.strings(data_frame, 15)
+            character: StringView = self.strings(data_frame, col_idx)  # Special
 
-        ## Sub function to validate
+            ## The tomadores allowed answer SI or NO, the others leave it empty
+            is_desempleo: pd.Series = tomador.values.isin(tomadores_allowed)
+            data_frame["is_valid"] = (
+                is_desempleo & character.values.isin(["SI", "NO"])
+            ) | (~is_desempleo & character.is_null)
+            return data_frame[~data_frame["is_valid"]]
 
-        def validate_empty(value: str) -> bool:
-            return value == "nan" or value == option
+        return self.validate_rows(check, [15, col_idx], new_sheet)
 
-        data_frame["is_valid"] = data_frame.iloc[:, col_idx].apply(
-            lambda value: validate_empty(str(value))
-        )
-        inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]]
-        return self.validate_inconsistencies(inconsistencies, [col_idx], new_sheet)
+    def no_empty(self, col_idx: int, option: str, new_sheet: str) -> str:
+        ## Empty or the option given
+        def check(data_frame: pd.DataFrame) -> pd.DataFrame:
+            column: StringView = self.strings(data_frame, col_idx)
+            data_frame["is_valid"] = column.is_null | (column.values == option)
+            return data_frame[~data_frame["is_valid"]]
+
+        return self.validate_rows(check, [col_idx], new_sheet)
 
     def check_sarlaf(self) -> str:
-        data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
-
-        ## Sub function to validate
-        def validate_sarlaf(sarlaf: str, bien_diligenciado: str, exento: str) -> bool:
-            if sarlaf == "SI":
-                return bien_diligenciado == "X"
-            elif sarlaf == "NO":
-                return bien_diligenciado == "nan" and exento == "X"
-            else:
-                return False
-
-        data_frame["is_valid"] = data_frame.apply(
-            lambda row: validate_sarlaf(
-                str(row.iloc[85]),  # Sarlaf column
-                str(row.iloc[86]),  # Bien diligenciado column
-                str(row.iloc[89]),  # Exento column
-            ),
-            axis=1,
-        )
+        def check(data_frame: pd.DataFrame) -> pd.DataFrame:
+            sarlaf: pd.Series = self.strings(data_frame, 85).values
+            bien_diligenciado: StringView = self.strings(data_frame, 86)
+            exento: pd.Series = self.strings(data_frame, 89).values
 
-        inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]]
-        return self.validate_inconsistencies(
-            inconsistencies, [85, 86, 89], "CheckBeneficiarioSarlaf"
-        )
+            ## SI: bien diligenciado "X", NO: empty and exento "X", else invalid
+            data_frame["is_valid"] = (
+                (sarlaf == "SI") & (bien_diligenciado.values == "X")
+            ) | ((sarlaf == "NO") & bien_diligenciado.is_null & (exento == "X"))
+            return data_frame[~data_frame["is_valid"]]
+
+        return self.validate_rows(check, [85, 86, 89], "CheckBeneficiarioSarlaf")
 
     def fecha_vencimiento(self) -> str:
-        data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
         exception_df: pd.DataFrame = self.read_excel(
             self.exception_file, "OTRAS EXCEPCIONES"
         )
@@ -429,43 +443,32 @@ class FirstValidationGroup:
             list_df["FECHA DE VENCIMIENTO"].dropna().astype(str).to_list()
         )
 
-        ## Sub function to validate the expiration date
-        def validate_date(radicado: str, ramo: str, expiration_date: str) -> bool:
-            if ramo == "DESEMPLEO":
-                return (
-                    bool(re.search(r"^\d{2}/\d{2}/\d{4};\d{1,12}$", expiration_date))
-                    or (expiration_date in list_fecha)
-                    or radicado in exception_list
-                )
-            else:
-                return (expiration_date == "nan") or (radicado in exception_list)
-
-        data_frame["is_valid"] = data_frame.apply(
-            lambda row: validate_date(
-                str(row.iloc[2]),  # Radicado casa matriz
-                str(row.iloc[12]),  # Ramo
-                str(row.iloc[97]),  # Fecha vencimiento
-            ),  # Ramo
-            axis=1,
-        )
+        def check(data_frame: pd.DataFrame) -> pd.DataFrame:
+            radicado: pd.Series = self.strings(data_frame, 2).values
+            ramo: pd.Series = self.strings(data_frame, 12).values
+            expiration_date: StringView = self.strings(data_frame, 97)
 
-        inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]]
-        return self.validate_inconsistencies(
-            inconsistencies, [12, 97], "FechaVencimiento"
-        )
+            ## DESEMPLEO needs the expiration date, the other ramos must leave it empty
+            is_exception: pd.Series = radicado.isin(exception_list)
+            data_frame["is_valid"] = (
+                rules.EXPIRATION_DATE_FORMAT.match(expiration_date.values, is_text=True)
+                | expiration_date.values.isin(list_fecha)
+                | is_exception
+            ).where(ramo == "DESEMPLEO", expiration_date.is_null | is_exception)
+            return data_frame[~data_frame["is_valid"]]
+
+        return self.validate_rows(check, [12, 97], "FechaVencimiento")
 
     def evento_cinco(self) -> str:
-        data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
-        data_frame["is_valid"] = data_frame["EVENTO 5"].apply(
-            lambda value: (pd.isna(value)) | (value == "SI" or value == "NO")
-        )
-        inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]]
-        return self.validate_inconsistencies(
-            inconsistencies, 110, "ValidacionEventoCinco"
-        )
+        def check(data_frame: pd.DataFrame) -> pd.DataFrame:
+            data_frame["is_valid"] = data_frame["EVENTO 5"].apply(
+                lambda value: (pd.isna(value)) | (value == "SI" or value == "NO")
+            )
+            return data_frame[~data_frame["is_valid"]]
+
+        return self.validate_rows(check, 110, "ValidacionEventoCinco")
 
     def sap(self) -> str:
-        data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
         exception_df: pd.DataFrame = self.read_excel(self.exception_file, "LISTAS")
         exception_list: list[str] = exception_df["SAP"].dropna().astype(str).to_list()
 
@@ -477,124 +480,97 @@ class FirstValidationGroup:
             except ValueError:
                 return sap in exception_list
 
-        data_frame["is_valid"] = data_frame.apply(
-            lambda row: validate_number(str(row.iloc[77])),
-            axis=1,
-        )
-        inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]]
-        return self.validate_inconsistencies(inconsistencies, 77, "ValidacionSap")
+        def check(data_frame: pd.DataFrame) -> pd.DataFrame:
+            data_frame["is_valid"] = self.strings(data_frame, 77).values.apply(
+                validate_number
+            )
+            return data_frame[~data_frame["is_valid"]]
+
+        return self.validate_rows(check, 77, "ValidacionSap")
 
     def otros_documentos(self) -> str:
-        data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
         polizas: list[str] = ["3400004306", "3400003706", "3400003704", "3400004407"]
         allowed: list[str] = ["SI", "NO", "NA"]
-        data_frame = data_frame[data_frame.iloc[:, 11].astype(str) == "334"]
-
-        ## Sub function to validate the cell format
-        def validate_cell_format(poliza: str, value: str) -> bool:
-            if poliza in polizas:
-                return value in allowed
-            else:
-                return value == "nan"
-
-        data_frame["is_valid"] = data_frame.apply(
-            lambda row: validate_cell_format(
-                str(row.iloc[6]),  # Poliza
-                str(row.iloc[103]),  # Otros documentos
-            ),
-            axis=1,
-        )
-        inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]]
-        return self.validate_inconsistencies(
-            inconsistencies, [6, 103], "ValidacionOtrosDocumentos"
-        )
+
+        def check(data_frame: pd.DataFrame) -> pd.DataFrame:
+            poliza: pd.Series = self.strings(data_frame, 6).values
+            otros_documentos: StringView = self.strings(data_frame, 103)
+            ramo: pd.Series = self.strings(data_frame, 11).values
+
+            ## The polizas listed answer SI, NO or NA, the others leave it empty
+            data_frame["is_valid"] = otros_documentos.values.isin(allowed).where(
+                poliza.isin(polizas), otros_documentos.is_null
+            )
+            data_frame = data_frame[ramo == "334"]
+            return data_frame[~data_frame["is_valid"]]
+
+        return self.validate_rows(check, [6, 103], "ValidacionOtrosDocumentos")
 
     def concepto(self) -> str:
-        data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
         exception_df: pd.DataFrame = self.read_excel(self.exception_file, "LISTAS")
         exception_list: list[str] = (
             exception_df["CONCEPTO OBJECION"].dropna().astype(str).to_list()
         )
 
-        ## Sub function to validate the concepto
-        def validate_concepto(concepto: str) -> bool:
-            return concepto in exception_list
-
-        data_frame["is_valid"] = data_frame["CONCEPTO"].apply(
-            lambda value: validate_concepto(str(value))
-        )
+        def check(data_frame: pd.DataFrame) -> pd.DataFrame:
+            concepto: pd.Series = self.strings(
+                data_frame, data_frame.columns.get_loc("CONCEPTO")
+            ).values
+            data_frame["is_valid"] = concepto.isin(exception_list)
+            return data_frame[~data_frame["is_valid"]]
 
-        inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]]
-        return self.validate_inconsistencies(inconsistencies, 35, "ValidacionConcepto")
+        return self.validate_rows(check, 35, "ValidacionConcepto")
 
     def code_prefixes(self) -> str:
-        # Create data frame
-        data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
-
-        # Get the code prefixes
-        siniestro = data_frame.iloc[:, 0].astype(str)
-        poliza = data_frame.iloc[:, 6].astype(str).str[:2]
-        ramo = data_frame.iloc[:, 11].astype(str).str[-2:]
-        dni_riesgo = data_frame.iloc[:, 18].astype(str)
-
-        data_frame["validation"] = ((siniestro.str[:2] == ramo) & (poliza == ramo)) | (
-            siniestro == dni_riesgo
-        )
-        # Get the inconsistencies
-        inconsistencies: pd.DataFrame = data_frame[~data_frame["validation"]]
-        print(inconsistencies)
-        return self.validate_inconsistencies(
-            inconsistencies, [0, 6, 11, 18], "ValidacionCodePrefixes"
-        )
+        def check(data_frame: pd.DataFrame) -> pd.DataFrame:
+            # Get the code prefixes
+            siniestro = self.strings(data_frame, 0).values
+            poliza = self.strings(data_frame, 6).values.str[:2]
+            ramo = self.strings(data_frame, 11).values.str[-2:]
+            dni_riesgo = self.strings(data_frame, 18).values
+
+            data_frame["validation"] = (
+                (siniestro.str[:2] == ramo) & (poliza == ramo)
+            ) | (siniestro == dni_riesgo)
+            # Get the inconsistencies
+            inconsistencies: pd.DataFrame = data_frame[~data_frame["validation"]]
+            print(inconsistencies)
+            return inconsistencies
+
+        return self.validate_rows(check, [0, 6, 11, 18], "ValidacionCodePrefixes")
 
     def valor_coaseguradora(self) -> str:
-        data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
-
-        # Subfunction to validate the column valor coaseguradora
-        def validate_coaseguradora(
-            porcentaje_positiva: str, valor_coaseguradora: str
-        ) -> bool:
-            if float(porcentaje_positiva) == 1.0:
-                return valor_coaseguradora == "nan"
-            else:
-                return (
-                    valor_coaseguradora.replace(";", "")
-                    .replace(",", "")
-                    .replace(".", "")
-                    .isdigit()
-                )
-
-        data_frame["is_valid"] = data_frame.apply(
-            lambda row: validate_coaseguradora(
-                str(row.iloc[48]),  # Porcentaje positiva
-                str(row.iloc[51]),  # Valor coaseguradora
-            ),
-            axis=1,
-        )
-        # Validate inconsistencies
-        inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]]
-        return self.validate_inconsistencies(
-            inconsistencies, [48, 51], "ValidacionValorCoaseguradora"
-        )
+        def check(data_frame: pd.DataFrame) -> pd.DataFrame:
+            porcentaje_positiva: pd.Series = pd.to_numeric(
+                self.strings(data_frame, 48).values
+            )
+            valor_coaseguradora: StringView = self.strings(data_frame, 51)
+
+            # Empty when positiva has the 100%, else digits with ";", "," or "."
+            is_number: pd.Series = valor_coaseguradora.values.str.replace(
+                r"[;,.]", "", regex=True
+            ).str.isdigit()
+            data_frame["is_valid"] = valor_coaseguradora.is_null.where(
+                porcentaje_positiva == 1.0, is_number
+            )
+            # Validate inconsistencies
+            return data_frame[~data_frame["is_valid"]]
+
+        return self.validate_rows(check, [48, 51], "ValidacionValorCoaseguradora")
 
     def beneficiario_phone(self) -> str:
-        data_frame: pd.DataFrame = self.read_excel(self.path_file, self.sheet_name)
         exception_df: pd.DataFrame = self.read_excel(self.exception_file, "LISTAS")
         exception_list: list[str] = (
             exception_df["TELEFONO BENEFICIARIO"].dropna().astype(str).to_list()
         )
 
-        # sub function to validate if the beneficiario phone is a valid number o are in the list exception
-        def validate_phone(value: str) -> bool:
-            return value.isdigit() or value in exception_list
+        # The beneficiario phone is a valid number or it is in the exception list
+        def check(data_frame: pd.DataFrame) -> pd.DataFrame:
+            phone: pd.Series = self.strings(data_frame, 58).values
+            data_frame["is_valid"] = phone.str.isdigit() | phone.isin(exception_list)
+            return data_frame[~data_frame["is_valid"]]
 
-        data_frame["is_valid"] = data_frame.iloc[:, 58].apply(
-            lambda value: validate_phone(str(value))
-        )
-        inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]]
-        return self.validate_inconsistencies(
-            inconsistencies, 58, "ValidacionBeneficiarioTelefono"
-        )
+        return self.validate_rows(check, 58, "ValidacionBeneficiarioTelefono")
 
 
 ## Set global variables
@@ -610,16 +586,30 @@ def main(params: dict) -> bool:
         sheet_name: str = params.get("sheet_name")
         inconsistencies_file: str = params.get("inconsistencies_file")
         exception_file: str = params.get("exception_file")
+        backend: Optional[str] = params.get("backend")
+        result_cache: Optional[str] = params.get("result_cache")
+        chunk_size = params.get("chunk_size")
+        compact_rows: Optional[str] = params.get("compact_rows")
+        partition_by: Optional[str] = params.get("partition_by")
 
         ## Pass the values to the constructor in the main class
         validation_group = FirstValidationGroup(
-            file_path, sheet_name, inconsistencies_file, exception_file
+            file_path,
+            sheet_name,
+            inconsistencies_file,
+            exception_file,
+            backend,
+            result_cache,
+            int(chunk_size) if chunk_size else None,
+            compact_rows,
+            partition_by,
         )
         return True
     except Exception as e:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_empty_cols(incomes: dict) -> str:
     try:
         col_idx = int(incomes.get("col_idx"))
@@ -631,6 +621,7 @@ def validate_empty_cols(incomes: dict) -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_number_type(params: dict) -> str:
     try:
         ## Set local variables
@@ -642,6 +633,7 @@ def validate_number_type(params: dict) -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_date_type(incomes: dict) -> str:
     try:
         ## Set local variables
@@ -653,6 +645,7 @@ def validate_date_type(incomes: dict) -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_length(incomes: dict) -> str:
     try:
         ## Set local variables
@@ -665,6 +658,7 @@ def validate_length(incomes: dict) -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_exception_list(params: dict) -> str:
     try:
         ## Set local variables
@@ -681,6 +675,7 @@ def validate_exception_list(params: dict) -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_special_characters(params: dict) -> str:
     try:
         ## Set local variables
@@ -691,6 +686,7 @@ def validate_special_characters(params: dict) -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_month(params: dict) -> str:
     try:
         ## Set local variables
@@ -707,6 +703,7 @@ def validate_month(params: dict) -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_numero_radicado(params: dict) -> str:
     try:
         ## Set local variables
@@ -717,6 +714,7 @@ def validate_numero_radicado(params: dict) -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_acuerdo_range(params: dict) -> str:
     try:
         ## Set local variables
@@ -727,6 +725,7 @@ def validate_acuerdo_range(params: dict) -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_compania_coaseguradora(params: dict) -> str:
     try:
         ## Set local variables
@@ -742,6 +741,7 @@ def validate_compania_coaseguradora(params: dict) -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_only_two_options(params: dict) -> str:
     try:
         ## Set local variables
@@ -754,6 +754,7 @@ def validate_only_two_options(params: dict) -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_no_white_spaces(params: dict) -> str:
     try:
         ## Set local variables
@@ -766,6 +767,7 @@ def validate_no_white_spaces(params: dict) -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_percentage_format(params: dict) -> str:
     try:
         ## Set local variables
@@ -778,6 +780,7 @@ def validate_percentage_format(params: dict) -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_identification_pagos_iaxis() -> str:
     try:
         validation: str = validation_group.identification_pagos_iaxis()
@@ -786,6 +789,7 @@ def validate_identification_pagos_iaxis() -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_need_exception(params: dict) -> str:
     try:
         ## Set local variables
@@ -804,6 +808,7 @@ def validate_need_exception(params: dict) -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_banks() -> str:
     try:
         validation: str = validation_group.banks_validation()
@@ -812,6 +817,7 @@ def validate_banks() -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_mandatory_desempleo(params: dict) -> str:
     try:
         ## Set local variables
@@ -823,6 +829,7 @@ def validate_mandatory_desempleo(params: dict) -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_not_empty(params: dict) -> str:
     try:
         ## Set local variables
@@ -835,6 +842,7 @@ def validate_not_empty(params: dict) -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_check_sarlaf() -> str:
     try:
         validation: str = validation_group.check_sarlaf()
@@ -843,6 +851,7 @@ def validate_check_sarlaf() -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_fecha_vencimiento() -> str:
     try:
         validation: str = validation_group.fecha_vencimiento()
@@ -851,6 +860,7 @@ def validate_fecha_vencimiento() -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_evento_5() -> str:
     try:
         validation: str = validation_group.evento_cinco()
@@ -859,6 +869,7 @@ def validate_evento_5() -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_sap() -> str:
     try:
         validation: str = validation_group.sap()
@@ -867,6 +878,7 @@ def validate_sap() -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_otros_documentos() -> str:
     try:
         validation: str = validation_group.otros_documentos()
@@ -875,6 +887,7 @@ def validate_otros_documentos() -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_concepto() -> str:
     try:
         validation: str = validation_group.concepto()
@@ -883,6 +896,7 @@ def validate_concepto() -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_code_prefixes() -> str:
     try:
         validation: str = validation_group.code_prefixes()
@@ -891,6 +905,7 @@ def validate_code_prefixes() -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_valor_coaseguradora() -> str:
     try:
         validation: str = validation_group.valor_coaseguradora()
@@ -899,6 +914,7 @@ def validate_valor_coaseguradora() -> str:
         return f"ERROR: {e}"
 
 
+@cached_result(lambda: validation_group)
 def validate_beneficiario_phone() -> str:
     try:
         validation: str = validation_group.beneficiario_phone()
@@ -0,0 +1,196 @@
+import os
+import sys
+from typing import Tuple
+
+## Make the shared "common" package importable from the bot folders
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.pipeline import Pipeline, Stage, run_pipeline
+
+## Params of the classes of the process (first validation group and coaseguro)
+BASE: dict = {
+    "file_path": "{file_path}",
+    "sheet_name": "{sheet_name}",
+    "inconsistencies_file": "{inconsistencies_file}",
+    "exception_file": "{exception_file}",
+}
+EXCEPTIONS: tuple = ("{exception_file}",)
+INCONSISTENCIES: tuple = ("{inconsistencies_file}",)
+FIRST_VALIDATION_GROUP: str = "03_objetados/first_validation_group.py"
+COASEGURO: str = "03_objetados/coaseguro.py"
+
+
+def validation(name: str, script: str, function: str, init: str) -> Stage:
+    """Validation of a class already created by the stage init"""
+    return Stage(
+        name,
+        script,
+        function,
+        depends_on=(init,),
+        inputs=EXCEPTIONS,
+        outputs=INCONSISTENCIES,
+    )
+
+
+PIPELINE = Pipeline(
+    "objetados",
+    [
+        ## Check of the sheets and headers of the inputs before any of them is
+        ## read: it has no outputs, so it runs again with the stages after it
+        Stage(
+            "preflight",
+            "03_objetados/preflight.py",
+            args=(
+                {
+                    "base_file": "{base_file}",
+                    "sheet_name": "{sheet_name}",
+                    "exception_file": "{exception_file}",
+                    "consecutivo_sap_file": "{consecutivo_sap_file}",
+                },
+            ),
+        ),
+        Stage(
+            "filter_file",
+            "03_objetados/filter_file.py",
+            args=(
+                {
+                    "path_file": "{base_file}",
+                    "sheet_name": "{sheet_name}",
+                    "temp_file": "{file_path}",
+                    "col_idx": "{date_col_idx}",
+                    "begin_date": "{begin_date}",
+                    "cut_off_date": "{cut_off_date}",
+                },
+            ),
+            depends_on=("preflight",),
+            inputs=("{base_file}",),
+            outputs=("{file_path}",),
+        ),
+        Stage(
+            "first_validation_group",
+            FIRST_VALIDATION_GROUP,
+            args=(BASE,),
+            depends_on=("filter_file",),
+        ),
+        validation(
+            "identification_pagos_iaxis",
+            FIRST_VALIDATION_GROUP,
+            "validate_identification_pagos_iaxis",
+            "first_validation_group",
+        ),
+        validation(
+            "banks",
+            FIRST_VALIDATION_GROUP,
+            "validate_banks",
+            "first_validation_group",
+        ),
+        Stage(
+            "siniestro_date",
+            "03_objetados/siniestro_date.py",
+            args=(BASE,),
+            depends_on=("filter_file",),
+            inputs=EXCEPTIONS,
+            outputs=INCONSISTENCIES,
+        ),
+        Stage(
+            "presciption_date",
+            "03_objetados/presciption_date.py",
+            args=(BASE,),
+            depends_on=("filter_file",),
+            inputs=EXCEPTIONS,
+            outputs=INCONSISTENCIES,
+        ),
+        Stage("coaseguro", COASEGURO, args=(BASE,), depends_on=("filter_file",)),
+        validation(
+            "coaseguro_percentage",
+            COASEGURO,
+            "validate_coaseguro_percentage",
+            "coaseguro",
+        ),
+        validation(
+            "positiva_calculado", COASEGURO, "validate_positiva_calculado", "coaseguro"
+        ),
+        validation(
+            "coasegura_calculado",
+            COASEGURO,
+            "validate_coasegura_calculado",
+            "coaseguro",
+        ),
+        validation(
+            "total_valor_calculado",
+            COASEGURO,
+            "validate_total_valor_calculado",
+            "coaseguro",
+        ),
+        validation("sums", COASEGURO, "validate_sums", "coaseguro"),
+        Stage(
+            "consecutivo_sap",
+            "03_objetados/consecutivo_sap.py",
+            args=(dict(BASE, consecutivo_sap_file="{consecutivo_sap_file}"),),
+            depends_on=("filter_file",),
+        ),
+        ## The consecutivos missing are saved into the exception file: after
+        ## every stage that reads it
+        Stage(
+            "validate_consecutivo_sap",
+            "03_objetados/consecutivo_sap.py",
+            "validate_consecutivo_sap",
+            args=({"cut_off_date": "{cut_off_date}"},),
+            depends_on=(
+                "consecutivo_sap",
+                "identification_pagos_iaxis",
+                "banks",
+                "siniestro_date",
+                "presciption_date",
+                "sums",
+            ),
+            inputs=("{consecutivo_sap_file}",),
+            outputs=("{inconsistencies_file}", "{exception_file}"),
+        ),
+        ## The table is saved into the base: after every stage that reads it
+        Stage(
+            "tables_comparation",
+            "03_objetados/tables_comparation.py",
+            args=(
+                {
+                    "file_path": "{file_path}",
+                    "sheet_name": "{sheet_name}",
+                    "latest_file": "{latest_file}",
+                    "col_idx": "{date_col_idx}",
+                    "cut_off_date": "{cut_off_date}",
+                    "inconsistencias_file": "{inconsistencies_file}",
+                    "initial_date": "{begin_date}",
+                },
+            ),
+            depends_on=("validate_consecutivo_sap",),
+            inputs=("{latest_file}",),
+            outputs=("{file_path}", "{inconsistencies_file}"),
+        ),
+    ],
+)
+
+
+def main(params: dict) -> Tuple[bool, str]:
+    """Run the objetados process: filter of the base, validations, coaseguro,
+    consecutivo SAP and tables. Only the stages whose inputs changed since the
+    last run (and the ones downstream) are executed when cache_file is given"""
+    try:
+        return run_pipeline(PIPELINE, params)
+    except Exception as e:
+        return False, f"ERROR: {e}"
+
+
+if __name__ == "__main__":
+    params = {
+        "base_file": r"C:\ProgramData\AutomationAnywhere\Bots\AD_GI_BaseObjetados_SabanaPagosBasesSiniestralidad\Input\Objetados 2022 - 2023 - 2024.xlsx",
+        "file_path": r"C:\ProgramData\AutomationAnywhere\Bots\AD_GI_BaseObjetados_SabanaPagosBasesSiniestralidad\Temp\Objetados.xlsx",
+        "sheet_name": "Objeciones 2022 - 2023 -2024",
+        "date_col_idx": "44",
+        "begin_date": "01/01/2024",
+        "cut_off_date": "29/06/2024",
+        "inconsistencies_file": r"C:\ProgramData\AutomationAnywhere\Bots\AD_GI_BaseObjetados_SabanaPagosBasesSiniestralidad\Temp\InconsistenciasObjetados.xlsx",
+        "exception_file": r"C:\ProgramData\AutomationAnywhere\Bots\AD_GI_BaseObjetados_SabanaPagosBasesSiniestralidad\Input\EXCEPCIONES BASE OBJETADOS.xlsx",
+        "consecutivo_sap_file": r"C:\ProgramData\AutomationAnywhere\Bots\AD_GI_BaseObjetados_SabanaPagosBasesSiniestralidad\Input\CONSECUTIVO SAP.xlsx",
+        "latest_file": r"C:\ProgramData\AutomationAnywhere\Bots\AD_GI_BaseObjetados_SabanaPagosBasesSiniestralidad\Output\Objetados mes anterior.xlsx",
+        "cache_file": r"C:\ProgramData\AutomationAnywhere\Bots\AD_GI_BaseObjetados_SabanaPagosBasesSiniestralidad\Temp\pipeline_objetados.json",
+    }
+    print(main(params))
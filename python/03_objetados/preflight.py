@@ -0,0 +1,70 @@
+import os
+import sys
+from typing import Tuple
+
+## Make the shared "common" package importable from the bot folders
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.schema import SheetLayout, preflight
+
+## The base is cut to its first 111 columns and the rules read it by position
+## (iloc) and some of them by name
+BASE_COLUMNS: int = 111
+BASE_HEADERS: tuple[str, ...] = ("CONCEPTO", "EVENTO 5")
+
+## Sheet of the consecutivo SAP file read by consecutivo_sap
+CONSECUTIVO_SHEET: str = "NUEMRO DE PAGO"
+
+
+def main(params: dict) -> Tuple[bool, str]:
+    """Check the sheets and headers of the inputs of the objetados process before
+    the base is read, the process fails in milliseconds when a sheet was renamed
+    or the columns moved"""
+    try:
+        return preflight(
+            [
+                (
+                    params.get("base_file"),
+                    [
+                        SheetLayout(
+                            params.get("sheet_name"),
+                            BASE_COLUMNS,
+                            columns=BASE_HEADERS,
+                        )
+                    ],
+                ),
+                (
+                    params.get("exception_file"),
+                    [
+                        SheetLayout(
+                            "LISTAS",
+                            columns=(
+                                "FECHA DE VENCIMIENTO",
+                                "SAP",
+                                "CONCEPTO OBJECION",
+                                "TELEFONO BENEFICIARIO",
+                            ),
+                        ),
+                        SheetLayout("OTRAS EXCEPCIONES"),
+                        SheetLayout("PRESCRIPCION"),
+                        SheetLayout("COASEGURO"),
+                        SheetLayout("CONSECUTIVO SAP"),
+                    ],
+                ),
+                (
+                    params.get("consecutivo_sap_file"),
+                    [SheetLayout(CONSECUTIVO_SHEET)],
+                ),
+            ]
+        )
+    except Exception as e:
+        return False, f"ERROR: {e}"
+
+
+if __name__ == "__main__":
+    params = {
+        "base_file": r"C:\ProgramData\AutomationAnywhere\Bots\AD_GI_BaseObjetados_SabanaPagosBasesSiniestralidad\Input\Objetados 2022 - 2023 - 2024.xlsx",
+        "sheet_name": "Objeciones 2022 - 2023 -2024",
+        "exception_file": r"C:\ProgramData\AutomationAnywhere\Bots\AD_GI_BaseObjetados_SabanaPagosBasesSiniestralidad\Input\EXCEPCIONES BASE OBJETADOS.xlsx",
+        "consecutivo_sap_file": r"C:\ProgramData\AutomationAnywhere\Bots\AD_GI_BaseObjetados_SabanaPagosBasesSiniestralidad\Input\CONSECUTIVO SAP.xlsx",
+    }
+    print(main(params))
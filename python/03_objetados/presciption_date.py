@@ -1,4 +1,10 @@
 import pandas as pd  # type: ignore
+import os
+import sys
+
+## Make the shared "common" package importable from the bot folders
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.dates import cached_dates
 
 
 def main(params: dict) -> str:
@@ -26,13 +32,15 @@ def main(params: dict) -> str:
             exception_df.iloc[:, 0].dropna().astype(str).to_list()
         )
 
+        # Convert date columns to datetime (parsed once per session over the whole sheet)
+        for date_index in (44, 27):
+            data_frame.iloc[:, date_index] = cached_dates(
+                file_path, sheet_name, date_index, data_frame.iloc[:, date_index]
+            ).values
+
         # Get only "CONCEPTO" values that are equal to "PRESCRIPCIÓN"
         data_frame = data_frame[data_frame.iloc[:, 35] == "PRESCRIPCION"]
 
-        # Convert date columns to datetime
-        data_frame.iloc[:, 44] = pd.to_datetime(data_frame.iloc[:, 44], errors="coerce")
-        data_frame.iloc[:, 27] = pd.to_datetime(data_frame.iloc[:, 27], errors="coerce")
-
         # Create rule for cases where the "PRESCRIPCION" date are less than 2 years
         # FECHA MOVIMIENTO: 44
         # FECHA SINIESTRO: 27
@@ -1,6 +1,11 @@
-import pandas as pd  # type: ignore
+import os
+import sys
 from typing import Tuple
 
+## Make the shared "common" package importable from the bot folders
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.xlsx_stream import reduce_column
+
 
 def get_initial_date(incomes: dict) -> Tuple[bool, str]:
     try:
@@ -9,32 +14,29 @@ def get_initial_date(incomes: dict) -> Tuple[bool, str]:
         propuesta_sheet: str = incomes.get("propuesta_sheet")
         col_idx = int(incomes.get("col_idx"))
 
-        # Read the Propuesta de Pago file
-        data_frame: pd.DataFrame = pd.read_excel(
+        # Get the minimum year from the "Radicado casa matriz" column
+        # The column is streamed without loading the whole Propuesta de Pago file
+        initial_date = reduce_column(
             propuesta_file,
             propuesta_sheet,
-            engine="openpyxl",
-        )
-        # Get the initial date from the "Radicado casa matriz" column
-        radicado_list: list[str] = (
-            data_frame.iloc[:, col_idx].dropna().astype(str).str[:4].to_list()
+            col_idx,
+            "min",
+            transform=lambda radicado: int(str(radicado)[:4]),
         )
-
-        # Convert string list into int list
-        radicado_list = [int(radicado) for radicado in radicado_list]
-        # Get the minimum radicado
-        initial_date = str(min(radicado_list))
-        return True, initial_date
+        if initial_date is None:
+            return False, "The radicado column is empty"
+        return True, str(initial_date)
     except Exception as e:
         return False, str(e)
 
 
-print(
-    get_initial_date(
-        {
-            "propuesta_file": r"C:\ProgramData\AutomationAnywhere\Bots\AD_GI_BasePagosRedAsistencial_SabanaPagosBasesSiniestralidad\Input\PROPUESTA DE PAGO 1 Y 2  (02-01-2025).xlsx",
-            "propuesta_sheet": "Propuesta",
-            "col_idx": "2",
-        }
+if __name__ == "__main__":
+    print(
+        get_initial_date(
+            {
+                "propuesta_file": r"C:\ProgramData\AutomationAnywhere\Bots\AD_GI_BasePagosRedAsistencial_SabanaPagosBasesSiniestralidad\Input\PROPUESTA DE PAGO 1 Y 2  (02-01-2025).xlsx",
+                "propuesta_sheet": "Propuesta",
+                "col_idx": "2",
+            }
+        )
     )
-)
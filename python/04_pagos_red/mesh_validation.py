@@ -1,6 +1,27 @@
+import os
+import sys
+import numpy as np  # type: ignore
 import pandas as pd  # type: ignore
 from typing import Optional, Tuple
 
+## Make the shared "common" package importable from the bot folders
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.acm_report import acm_columns
+from common.coaseguro_sheet import COASEGURO_SHEET, equal_as_text, merge_coaseguro
+from common.backend import get_backend, read_excel
+from common.dates import parse_dates
+from common.inconsistencies import project
+from common import rules
+from common.result_cache import ResultCache, cached_result, track_read, track_save
+from common.sql_engine import SqlEngine
+from common.money import (
+    BASIS_POINTS,
+    PERCENTAGE_TOLERANCE,
+    equal_within,
+    to_basis_points,
+    to_cents,
+)
+
 
 class MeshValidation:
     def __init__(
@@ -10,17 +31,34 @@ class MeshValidation:
         exception_file: str,
         inconsistencies_file: str,
         acm_report: str,
+        backend: Optional[str] = None,
+        result_cache: Optional[str] = None,
+        compact_rows: Optional[str] = None,
+        acm_cache: Optional[str] = None,
+        engine: str = "pandas",
     ):
         self.file_path = file_path
         self.sheet_name = sheet_name
         self.exception_file = exception_file
         self.inconsistencies_file = inconsistencies_file
         self.acm_report = acm_report
+        # Folder to keep the parsed ACM report for the next steps (optional)
+        self.acm_cache = acm_cache
+        # Library used to read the bases (pandas or polars)
+        self.backend = get_backend(backend)
+        # "sql" runs the join rules into the SQL engine instead of pandas
+        self.use_sql = engine == "sql"
+        # Exception lists already read by (sheet name, column index)
+        self.exception_indexes: dict[tuple[str, int], pd.Index] = {}
+        # Folder to keep the results of the validations for the retries and re-runs
+        self.result_cache = ResultCache(result_cache) if result_cache else None
+        # Rules whose inconsistencies are saved compact (the rows are whole by default)
+        self.compact_rows = compact_rows
 
     def read_excel(self, file_path: str, sheet_name: str, **kwargs) -> pd.DataFrame:
         """Method for returning a data frame"""
-        data_frame: pd.DataFrame = pd.read_excel(
-            file_path, sheet_name=sheet_name, engine="openpyxl", **kwargs
+        data_frame: pd.DataFrame = read_excel(
+            file_path, sheet_name, self.backend, **kwargs
         )
         # Get the data frame using the name of the column with the index 2
         # To avoid the NaN into data frame with the aim the next validations
@@ -29,10 +67,28 @@ class MeshValidation:
 
     def save_inconsistencies_file(self, df: pd.DataFrame, new_sheet: str) -> bool:
         """Method to save the inconsistencies in a new sheet or update an existing one"""
+        return self.save_inconsistencies_sheets({new_sheet: df})
+
+    def save_inconsistencies_sheets(self, sheets: dict[str, pd.DataFrame]) -> bool:
+        """Method to save the inconsistencies of several sheets opening the file
+        once, each sheet is created or appended to the existing one"""
+        for new_sheet, df in sheets.items():
+            track_save(df, new_sheet)
         with pd.ExcelFile(self.inconsistencies_file, engine="openpyxl") as xls:
-            if new_sheet in xls.sheet_names:
-                existing = pd.read_excel(xls, engine="openpyxl", sheet_name=new_sheet)
-                df = pd.concat([existing, df], ignore_index=True)
+            sheets = {
+                new_sheet: (
+                    pd.concat(
+                        [
+                            pd.read_excel(xls, engine="openpyxl", sheet_name=new_sheet),
+                            df,
+                        ],
+                        ignore_index=True,
+                    )
+                    if new_sheet in xls.sheet_names
+                    else df
+                )
+                for new_sheet, df in sheets.items()
+            }
 
         with pd.ExcelWriter(
             self.inconsistencies_file,
@@ -40,7 +96,8 @@ class MeshValidation:
             mode="a",
             if_sheet_exists="replace",
         ) as writer:
-            df.to_excel(writer, sheet_name=new_sheet, index=False)
+            for new_sheet, df in sheets.items():
+                df.to_excel(writer, sheet_name=new_sheet, index=False)
             return True
 
     def excel_col_name(self, number) -> str:
@@ -51,105 +108,106 @@ class MeshValidation:
             result = chr(65 + reminder) + result
         return result
 
+    def inconsistencies_frame(
+        self, df: pd.DataFrame, col_idx, sheet_name: str
+    ) -> pd.DataFrame:
+        """Method to add the coordinates to the inconsistencies and keep the
+        columns to save"""
+        df = df.copy()
+        rows: pd.Series = pd.Series(df.index + 2, index=df.index).astype(str)
+        if isinstance(col_idx, int):
+            df[f"COORDENADAS"] = self.excel_col_name(col_idx + 1) + rows
+        else:
+            for i in col_idx:
+                df[f"COORDENADAS_{i + 2}"] = self.excel_col_name(i + 1) + rows
+        return project(df, col_idx, sheet_name, self.compact_rows)
+
     def validate_inconsistencies(
         self, df: pd.DataFrame, col_idx, sheet_name: str
     ) -> str:
         """Method to validate the inconsistencies before append in a inconsistencies file"""
         if not df.empty:
-            df = df.copy()
-            if isinstance(col_idx, int):
-                df[f"COORDENADAS"] = df.apply(
-                    lambda row: f"{self.excel_col_name(col_idx + 1)}{row.name + 2}",
-                    axis=1,
-                )
-            else:
-                for i in col_idx:
-                    df[f"COORDENADAS_{i + 2}"] = df.apply(
-                        lambda row: f"{self.excel_col_name(i+1)}{row.name + 2}",
-                        axis=1,
-                    )
+            df = self.inconsistencies_frame(df, col_idx, sheet_name)
             self.save_inconsistencies_file(df, sheet_name)
             return "SUCCESS: Inconsistencies guardadas correctamente"
         else:
             return "INFO: Validacion realizada, no se encontraron inconsistencias"
 
-    def transform_acm_report(self, acm_report: pd.DataFrame) -> pd.DataFrame:
-        """Method to transform the ACM report"""
-        acm_report: pd.DataFrame = acm_report.iloc[3:, 1:]
-        acm_report.columns = acm_report.iloc[0]
-        acm_report = acm_report.iloc[1:].reset_index(drop=True)
-        # Select only the columns needed
-        acm_report = acm_report[["id cuenta", "prefijo factura", "factura"]]
-        return acm_report
-
-    def validate_vs_coaseguro(
-        self, data_frame: pd.DataFrame, column1: int, column2: int, sheet_name: str
-    ) -> Tuple[bool, str]:
-        """Method to validate the tipo expedición poliza"""
-        # Validate if the dataframe is empty
-        if data_frame.empty:
-            return False
-
-        try:
-            # If the validation made is a number type then convert to integers and the string to validate
-            if column1 == 16:
-                data_frame.iloc[:, column1] = (
-                    data_frame.iloc[:, column1].astype(int).astype(str)
-                )
-            # Validate if the tipo expedición poliza is correct
-            data_frame["is_valid"] = data_frame.apply(
-                lambda row: str(row.iloc[column1]) == str(row.iloc[column2]), axis=1
-            )
-            # Validate inconsistencies
-            inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]].copy()
-            report_inconsistencies = self.validate_inconsistencies(
-                inconsistencies, [column1, column2], sheet_name
-            )
-            print(report_inconsistencies)
-            return (True, "Validacion realizada correctamente")
-        except Exception as e:
-            return (False, str(e))
-
-    def validate_sum_percentage(
-        self, data_frame: pd.DataFrame, positiva: int, coaseguradora: int
-    ) -> Tuple[bool, str]:
-        """Method to validate the sum of the percentages"""
-        try:
-            data_frame["percentage_valid"] = data_frame.apply(
-                lambda row: row.iloc[positiva] + row.iloc[coaseguradora] == 1, axis=1
+    def get_exception_index(self, sheet_name: str, col_idx: int) -> pd.Index:
+        """Method to get the values of a column of the exception file as an index,
+        the sheet is read only the first time"""
+        key: tuple[str, int] = (sheet_name, col_idx)
+        track_read(self.exception_file)
+        if key not in self.exception_indexes:
+            exception_df: pd.DataFrame = pd.read_excel(
+                self.exception_file,
+                sheet_name=sheet_name,
+                engine="openpyxl",
+                dtype=str,
             )
-            # Validate inconsistencies
-            inconsistencies: pd.DataFrame = data_frame[
-                ~data_frame["percentage_valid"]
-            ].copy()
-            report_inconsistencies = self.validate_inconsistencies(
-                inconsistencies, [positiva, coaseguradora], "ValidacionPorcentajes"
+            self.exception_indexes[key] = pd.Index(
+                exception_df.iloc[:, col_idx].dropna().astype(str).unique()
             )
-            print(report_inconsistencies)
-            return (True, "Validacion realizada correctamente")
-        except Exception as e:
-            return (False, str(e))
-
-    def validate_positiva_plus_movimiento(
-        self, data_frame: pd.DataFrame, vr_movimiento: int, positiva_percentage: int
-    ) -> Tuple[bool, str]:
-        """Method to validate the sum of the VR movimiento and the positiva percentage"""
-        try:
-            data_frame["is_valid"] = data_frame.apply(
-                lambda row: row.iloc[vr_movimiento] * row.iloc[positiva_percentage] > 0,
-                axis=1,
-            )
-            # Validate inconsistencies
-            inconsistencies: pd.DataFrame = data_frame[~data_frame["is_valid"]].copy()
-            report_inconsistencies = self.validate_inconsistencies(
-                inconsistencies,
-                [vr_movimiento, positiva_percentage],
-                "ValidacionVRMovimiento",
-            )
-            print(report_inconsistencies)
-            return (True, "Validacion realizada correctamente")
-        except Exception as e:
-            return (False, str(e))
+        return self.exception_indexes[key]
+
+    def get_acm_report(self) -> pd.DataFrame:
+        """Method to get the id cuenta, prefijo factura and factura of the ACM report"""
+        return acm_columns(
+            self.acm_report, ["prefijo factura", "factura"], self.acm_cache
+        )
+
+    def coaseguro_sheet_checks(
+        self, merged_df: pd.DataFrame
+    ) -> dict[str, tuple[list[int], pd.Series]]:
+        """Method to evaluate the checks of the propuesta against the COASEGURO
+        sheet over the merged data frame: {sheet: (columns, is_valid mask)}"""
+        # Documento tomador is a number in the propuesta and a text in the sheet,
+        # the empty or not integer values are inconsistencies of the check
+        numbers: pd.Series = pd.to_numeric(merged_df.iloc[:, 16], errors="coerce")
+        documento_tomador: pd.Series = (
+            numbers.where(numbers % 1 == 0).astype("Int64").astype("string")
+        )
+        # Percentages in basis points, the sum must be 100%
+        total: pd.Series = to_basis_points(merged_df.iloc[:, 48]) + to_basis_points(
+            merged_df.iloc[:, 50]
+        )
+        # VR movimiento (45) x positiva percentage of the sheet (118)
+        product: pd.Series = to_cents(merged_df.iloc[:, 45]) * to_basis_points(
+            merged_df.iloc[:, 118]
+        )
+        return {
+            # "TIPO EXPEDICIÓN PÓLIZA"
+            "ValidacionTipoExpedicionPoliza": (
+                [42, 120],
+                equal_as_text(merged_df, 42, 120),
+            ),
+            # "TOMADOR"
+            "ValidacionTomadorCoaseguro": (
+                [15, 116],
+                equal_as_text(merged_df, 15, 116),
+            ),
+            # "DOCUMENTO TOMADOR"
+            "ValidacionDocumentoTomador": (
+                [16, 117],
+                (documento_tomador == merged_df.iloc[:, 117].astype(str))
+                .fillna(False)
+                .astype(bool),
+            ),
+            # PORCENTAJE POSITIVA + PORCENTAJE COASEGURADORA
+            "ValidacionPorcentajes": (
+                [48, 50],
+                equal_within(
+                    total,
+                    pd.Series(BASIS_POINTS, index=total.index),
+                    PERCENTAGE_TOLERANCE,
+                ),
+            ),
+            # Valor Positiva MOVIMIENTO x %
+            "ValidacionVRMovimiento": (
+                [45, 118],
+                (product > 0).fillna(False).astype(bool),
+            ),
+        }
 
 
 mesh_validation: Optional[MeshValidation] = None
@@ -166,12 +224,18 @@ def main(params: dict) -> tuple:
                 exception_file=params.get("exception_file"),
                 inconsistencies_file=params.get("inconsistencies_file"),
                 acm_report=params.get("acm_report"),
+                backend=params.get("backend"),
+                result_cache=params.get("result_cache"),
+                compact_rows=params.get("compact_rows"),
+                acm_cache=params.get("acm_cache"),
+                engine=params.get("engine") or "pandas",
             )
         return True, f"Atributos de clase '{main.__name__}' inicializados correctamente"
     except Exception as e:
         return (False, f"Error: {e}")
 
 
+@cached_result(lambda: mesh_validation)
 def validate_is_number(col_idx: str) -> str:
     """Method to validate if a column index is a number"""
     try:
@@ -196,6 +260,7 @@ def validate_is_number(col_idx: str) -> str:
         return False
 
 
+@cached_result(lambda: mesh_validation)
 def validate_date_type(col_idx: str) -> str:
     """Method to validate if a column index contains date values."""
     try:
@@ -224,6 +289,7 @@ def validate_date_type(col_idx: str) -> str:
         return f"Error: {e}"
 
 
+@cached_result(lambda: mesh_validation)
 def validate_siniestro_number() -> str:
     try:
         # Set local variables
@@ -235,51 +301,29 @@ def validate_siniestro_number() -> str:
             dtype={"No. SINIESTRO": str},
         )
 
-        # Subfunction to validate multiple columns that make up the siniestro column
-        def validate_siniestro(siniestro: str, documento: str, fecha: pd.Timestamp):
-            """
-            This function makes a validation to enure that the siniestro number is valid
-            The siniestro number is make up with two columns specify bellow
-                siniestro: No. SINIESTRO = documento + fecha (0)
-                documento: DOCUMENTO RIESGO (Asegurado) (18)
-                fecha: FECHA SINIESTRO (27)
-            """
-            # Convert the date passed into string with the format: "DDMMYYYY"
-            fecha = fecha.strftime("%d%m%Y")
-            # Check if the siniestro number is in the exception list
-            # Validate if all the values are present and passed
-            if siniestro or documento or fecha:
-                # Check if the siniestro number is composed by two columns
-                # Create a key composted by DOCUMENTO RIESGO + FECHA SINIESTRO
-                siniestro_composed: str = documento + fecha
-                # Check if the siniestro and siniestro composed are the same and return it
-                return siniestro == siniestro_composed
-            else:
-                return False
-
-        data_frame["is_siniestro_valid"] = data_frame.apply(
-            lambda row: validate_siniestro(
-                str(row.iloc[0]),  # No. SINIESTRO
-                str(int(row.iloc[18])),  # DOCUMENTO RIESGO (Asegurado)
-                row.iloc[27],  # FECHA SINIESTRO
-            ),
-            axis=1,
+        # The siniestro number is make up with two columns specify bellow
+        #     No. SINIESTRO (0) = DOCUMENTO RIESGO (Asegurado) (18) + FECHA SINIESTRO (27)
+        # with the date in the format "DDMMYYYY", a missing value is never valid
+        documento: pd.Series = pd.to_numeric(data_frame.iloc[:, 18], errors="coerce")
+        documento = np.trunc(documento).astype("Int64").astype("string")
+        fecha: pd.Series = parse_dates(data_frame.iloc[:, 27]).values.dt.strftime(
+            "%d%m%Y"
+        )
+        siniestro_composed: pd.Series = documento + fecha.astype("string")
+        data_frame["is_siniestro_valid"] = (
+            (data_frame.iloc[:, 0].astype("string") == siniestro_composed)
+            .fillna(False)
+            .astype(bool)
         )
 
         # Validate if there is inconsistencies
         inconsistencies = data_frame[~data_frame["is_siniestro_valid"]].copy()
         # Get the exception list
-        exception_df: pd.DataFrame = pd.read_excel(
-            mesh_validation.exception_file,
-            sheet_name="EXCEPCIONES GENERALES",
-            engine="openpyxl",
-            dtype=str,
-        )
-        exception_list: list[str] = (
-            exception_df.iloc[:, 0].dropna().astype(str).to_list()
+        exception_index: pd.Index = mesh_validation.get_exception_index(
+            "EXCEPCIONES GENERALES", 0
         )
         inconsistencies["is_exception"] = inconsistencies.iloc[:, 0].isin(
-            exception_list
+            exception_index
         )
         inconsistencies = inconsistencies[~inconsistencies["is_exception"]]
         print(inconsistencies)
@@ -290,6 +334,7 @@ def validate_siniestro_number() -> str:
         return (False, f"Error: {e}")
 
 
+@cached_result(lambda: mesh_validation)
 def validate_poliza_number() -> str:
     try:
         # Set local variables
@@ -303,16 +348,9 @@ def validate_poliza_number() -> str:
             lambda poliza: str(poliza).startswith("31") or str(poliza).startswith("35")
         )
         inconsistencies = data_frame[~data_frame["is_poliza_number_valid"]].copy()
-        # Create a exception data frame
-        exception_df: pd.DataFrame = pd.read_excel(
-            mesh_validation.exception_file,
-            sheet_name="EXCEPCIONES GENERALES",
-            engine="openpyxl",
-            dtype=str,
-        )
-        # Get the exception list from the exception data frame
-        exception_list: list[str] = (
-            exception_df.iloc[:, 1].dropna().astype(str).to_list()
+        # Get the exception list from the exception sheet
+        exception_list: pd.Index = mesh_validation.get_exception_index(
+            "EXCEPCIONES GENERALES", 1
         )
         # Add the exception list to the inconsistencies data frame
         inconsistencies["exception_poliza"] = (
@@ -331,6 +369,7 @@ def validate_poliza_number() -> str:
         return (False, f"Error: {e}")
 
 
+@cached_result(lambda: mesh_validation)
 def validate_spaces(col_idx: str) -> str:
     """Method to validate if a column index has spaces"""
     try:
@@ -339,14 +378,10 @@ def validate_spaces(col_idx: str) -> str:
             mesh_validation.file_path,
             mesh_validation.sheet_name,
         )
-        # Validate spaces using regex expression: s\
-        # Validate double withe spaces using regex expression: s\{2,}
-        data_frame["has_spaces"] = (
-            data_frame.iloc[:, col_idx].astype(str).str.contains(r"\s", regex=True)
-            == False
-        )
+        # Validate that the value has no white spaces (compiled format rule)
+        data_frame["is_valid"] = rules.NO_SPACES(data_frame, col_idx)
         # Validate if there is inconsistencies
-        inconsistencies = data_frame[~data_frame["has_spaces"]].copy()
+        inconsistencies = data_frame[~data_frame["is_valid"]].copy()
         return mesh_validation.validate_inconsistencies(
             inconsistencies, [col_idx], "ValidacionEspacios"
         )
@@ -354,6 +389,7 @@ def validate_spaces(col_idx: str) -> str:
         return (False, f"Error: {e}")
 
 
+@cached_result(lambda: mesh_validation)
 def validate_observaciones_col() -> str:
     try:
         # Get the PROPUESTA PAGOS data frame
@@ -361,15 +397,8 @@ def validate_observaciones_col() -> str:
             mesh_validation.file_path,
             mesh_validation.sheet_name,
         )
-        # Get the ACM report data frame
-        acm_df: pd.DataFrame = pd.read_excel(
-            mesh_validation.acm_report,
-            sheet_name="FCT_RS_REPORTE_WS_AUDITORIA",
-            engine="openpyxl",
-            dtype=str,
-        )
-        # Transform the data frame
-        df_transformed: pd.DataFrame = mesh_validation.transform_acm_report(acm_df)
+        # Get the ACM report data frame (parsed once and shared with the values validation)
+        df_transformed: pd.DataFrame = mesh_validation.get_acm_report()
 
         # Get columns to make the merge
         left_col = data_frame.columns[2]
@@ -414,16 +443,9 @@ def validate_observaciones_col() -> str:
         # Validate if there is inconsistencies
         inconsistencies = merged_df[~merged_df["is_valid"]].copy()
 
-        # Create a exception data frame
-        exception_df: pd.DataFrame = pd.read_excel(
-            mesh_validation.exception_file,
-            sheet_name="EXCEPCIONES GENERALES",
-            engine="openpyxl",
-            dtype=str,
-        )
-        # Get the exception list from the exception data frame
-        exception_list: list[str] = (
-            exception_df.iloc[:, 2].dropna().astype(str).to_list()
+        # Get the exception list from the exception sheet
+        exception_list: pd.Index = mesh_validation.get_exception_index(
+            "EXCEPCIONES GENERALES", 2
         )
         # Add the exception list to the inconsistencies data frame
         inconsistencies["is_exception"] = inconsistencies.iloc[:, 2].isin(
@@ -440,6 +462,7 @@ def validate_observaciones_col() -> str:
         return (False, f"Error: {e}")
 
 
+@cached_result(lambda: mesh_validation)
 def validate_coaseguro_sheet() -> Tuple[bool, str]:
     try:
         # Get main data frame
@@ -447,69 +470,46 @@ def validate_coaseguro_sheet() -> Tuple[bool, str]:
             mesh_validation.file_path,
             mesh_validation.sheet_name,
         )
+        if propuesta_df.empty:
+            raise Exception("the propuesta has no rows")
         # Get COASEGURO data frame
         coaseguro_df: pd.DataFrame = mesh_validation.read_excel(
             mesh_validation.exception_file,
-            "COASEGURO",
+            COASEGURO_SHEET,
         )
-        # Get only the important columns from coaseguro data frame
-        # The first 6 columns with data
-        coaseguro_df = coaseguro_df.iloc[:, :6]
 
-        # Merge the data frames using the key: N° poliza
+        # Merge the data frames once using the key: N° poliza
         # N° poliza propuesta pagos: index 6
         # N° poliza coaseguro sheet: index 0
-        merged_df: pd.DataFrame = pd.merge(
-            propuesta_df,
-            coaseguro_df,
-            how="left",
-            left_on=propuesta_df.columns[6],
-            right_on=coaseguro_df.columns[0],
-            suffixes=("_propuesta", "_coaseguro"),
-        )
-
-        # * Validate "TIPO EXPEDICIÓN PÓLIZA"
-        bool_tipo_exp, msg_tipo_exp = mesh_validation.validate_vs_coaseguro(
-            merged_df, 42, 120, "ValidacionTipoExpedicionPoliza"
-        )
-        if not bool_tipo_exp:
-            raise Exception(msg_tipo_exp)
-
-        # * Validate "TOMADOR"
-        bool_tomador, msg_tomador = mesh_validation.validate_vs_coaseguro(
-            merged_df, 15, 116, "ValidacionTomadorCoaseguro"
-        )
-        if not bool_tomador:
-            raise Exception(msg_tomador)
-
-        # * Validate "TOMADOR"
-        bool_doc_tomador, msg_doc_tomador = mesh_validation.validate_vs_coaseguro(
-            merged_df, 16, 117, "ValidacionDocumentoTomador"
-        )
-        if not bool_doc_tomador:
-            raise Exception(msg_doc_tomador)
-
-        # * Validate sum of coaseguro POSITIVA PERCENTAGE AND COASEGURADORA PERCENTAGE
-        bool_sum_coaseguro, msg_sum_coaseguro = mesh_validation.validate_sum_percentage(
-            merged_df, 48, 50  # PORCENTAJE POSITIVA  # PORCENTAJE COASEGURADORA
-        )
-        if not bool_sum_coaseguro:
-            raise Exception(msg_sum_coaseguro)
-
-        # * Validate Valor Positiva MOVIMIENTO x %
-        bool_val_positiva, msg_val_positiva = (
-            mesh_validation.validate_positiva_plus_movimiento(
-                merged_df, vr_movimiento=45, positiva_percentage=118
-            )
-        )
-        if not bool_val_positiva:
-            raise Exception(msg_val_positiva)
+        suffixes: tuple[str, str] = ("_propuesta", "_coaseguro")
+        if mesh_validation.use_sql:
+            with SqlEngine() as engine:
+                merged_df: pd.DataFrame = merge_coaseguro(
+                    propuesta_df, coaseguro_df, suffixes=suffixes, engine=engine
+                )
+        else:
+            merged_df = merge_coaseguro(propuesta_df, coaseguro_df, suffixes=suffixes)
+
+        # Evaluate every check over the merged data frame and save the
+        # inconsistencies of all of them in one write
+        sheets: dict[str, pd.DataFrame] = {}
+        for sheet_name, (columns, is_valid) in mesh_validation.coaseguro_sheet_checks(
+            merged_df
+        ).items():
+            inconsistencies: pd.DataFrame = merged_df[~is_valid]
+            if not inconsistencies.empty:
+                sheets[sheet_name] = mesh_validation.inconsistencies_frame(
+                    inconsistencies, columns, sheet_name
+                )
+        if sheets:
+            mesh_validation.save_inconsistencies_sheets(sheets)
 
         return (True, "Validacion con hoja COASEGURO realizada correctamente")
     except Exception as e:
         return (False, f"Error: {e}")
 
 
+@cached_result(lambda: mesh_validation)
 def validate_empty(incomes: dict) -> Tuple[bool, str]:
     try:
         # Set local variables
@@ -541,6 +541,7 @@ def validate_empty(incomes: dict) -> Tuple[bool, str]:
         return (False, f"Error: {e}")
 
 
+@cached_result(lambda: mesh_validation)
 def validate_using_list(incomes: dict) -> Tuple[bool, str]:
     try:
         # Set local variables
@@ -550,13 +551,13 @@ def validate_using_list(incomes: dict) -> Tuple[bool, str]:
         inconsistencies_sheet_name = incomes.get("inconsistencies_sheet_name")
 
         # Get main data frame
-        df: pd.DataFrame = pd.read_excel(
-            mesh_validation.file_path, sheet_name=mesh_validation.sheet_name, dtype=str
+        df: pd.DataFrame = read_excel(
+            mesh_validation.file_path, mesh_validation.sheet_name, dtype=str
         )
         df = df.dropna(subset=[df.columns[col]])
         # Get the list of the exception
-        exception_df: list[str] = pd.read_excel(
-            mesh_validation.exception_file, sheet_name=exception_sheet, dtype=str
+        exception_df: list[str] = read_excel(
+            mesh_validation.exception_file, exception_sheet, dtype=str
         )
         exception_list: list[str] = (
             exception_df[exception_col_name].dropna().astype(str).to_list()
@@ -576,6 +577,7 @@ def validate_using_list(incomes: dict) -> Tuple[bool, str]:
         return (False, f"Error: {e}")
 
 
+@cached_result(lambda: mesh_validation)
 def validate_length(incomes: dict) -> Tuple[bool, str]:
     try:
         # Set local variables
@@ -602,6 +604,7 @@ def validate_length(incomes: dict) -> Tuple[bool, str]:
         return (False, f"Error: {e}")
 
 
+@cached_result(lambda: mesh_validation)
 def validate_coaseguradora() -> str:
     try:
         # Column to validate COMPAÑIA COASEGURADORA
@@ -614,24 +617,18 @@ def validate_coaseguradora() -> str:
             sheet_name=mesh_validation.sheet_name,
         )
         # Get the exception list
-        exception_df: pd.DataFrame = pd.read_excel(
-            mesh_validation.exception_file,
-            sheet_name="OTRO",
-        )
+        exception_df: pd.DataFrame = read_excel(mesh_validation.exception_file, "OTRO")
         exception_list: list[str] = (
             exception_df["COMPAÑIA COASEGURADORA"].dropna().astype(str).to_list()
         )
 
-        def validate_coa(percentage_positiva: str, company: str):
-            return float(percentage_positiva) == 1.0 or company in exception_list
-
-        df["is_valid"] = df.apply(
-            lambda row: validate_coa(
-                percentage_positiva=str(row.iloc[percentage]),
-                company=str(row.iloc[col]),
-            ),
-            axis=1,
+        ## The positiva percentage must be 100% unless the company is an exception
+        is_full: pd.Series = (
+            (to_basis_points(df.iloc[:, percentage]) == BASIS_POINTS)
+            .fillna(False)
+            .astype(bool)
         )
+        df["is_valid"] = is_full | df.iloc[:, col].astype(str).isin(exception_list)
         # Validate inconsistencies
         inconsistencies = df[~df["is_valid"]].copy()
         # Return the inconsistencies
@@ -0,0 +1,122 @@
+import os
+import sys
+from typing import Tuple
+
+## Make the shared "common" package importable from the bot folders
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.pipeline import Pipeline, Stage, run_pipeline
+
+MESH_VALIDATION: str = "04_pagos_red/mesh_validation.py"
+VALIDATION_VALUES: str = "04_pagos_red/validation_values.py"
+
+
+def mesh(name: str, function: str, inputs: tuple = ()) -> Stage:
+    """Validation of the mesh (propuesta de pago) saved into the inconsistencies"""
+    return Stage(
+        name,
+        MESH_VALIDATION,
+        function,
+        depends_on=("mesh_validation",),
+        inputs=("{file_path}", "{exception_file}") + inputs,
+        outputs=("{inconsistencies_file}",),
+    )
+
+
+## The validador pagos file is updated by the bot after the review of the
+## inconsistencies, it is not part of the pipeline
+PIPELINE = Pipeline(
+    "pagos_red",
+    [
+        ## Check of the sheets and headers of the inputs before any of them is
+        ## read: it has no outputs, so it runs again with the stages after it
+        Stage(
+            "preflight",
+            "04_pagos_red/preflight.py",
+            args=(
+                {
+                    "file_path": "{file_path}",
+                    "sheet_name": "{sheet_name}",
+                    "exception_file": "{exception_file}",
+                    "acm_report": "{acm_report}",
+                },
+            ),
+        ),
+        Stage(
+            "mesh_validation",
+            MESH_VALIDATION,
+            args=(
+                {
+                    "file_path": "{file_path}",
+                    "sheet_name": "{sheet_name}",
+                    "exception_file": "{exception_file}",
+                    "inconsistencies_file": "{inconsistencies_file}",
+                    "acm_report": "{acm_report}",
+                },
+            ),
+            depends_on=("preflight",),
+        ),
+        mesh("siniestro_number", "validate_siniestro_number"),
+        mesh("poliza_number", "validate_poliza_number"),
+        mesh("observaciones", "validate_observaciones_col", ("{acm_report}",)),
+        mesh("coaseguro_sheet", "validate_coaseguro_sheet"),
+        mesh("coaseguradora", "validate_coaseguradora"),
+        Stage(
+            "validation_values",
+            VALIDATION_VALUES,
+            args=(
+                {
+                    "file_path": "{file_path}",
+                    "inconsistencies_file": "{inconsistencies_file}",
+                    "exception_file": "{exception_file}",
+                    "sheet_name": "{sheet_name}",
+                    "file_name": "{file_name}",
+                    "previous_file": "{previous_file}",
+                    "temp_file": "{temp_file}",
+                    "historic_file": "{historic_file}",
+                },
+            ),
+            depends_on=("preflight",),
+        ),
+        Stage(
+            "validate_values",
+            VALIDATION_VALUES,
+            "validate_values",
+            args=("{acm_report}",),
+            depends_on=("validation_values",),
+            inputs=(
+                "{file_path}",
+                "{exception_file}",
+                "{acm_report}",
+                "{previous_file}",
+                "{historic_file}",
+            ),
+            outputs=("{inconsistencies_file}", "{temp_file}"),
+        ),
+    ],
+)
+
+
+def main(params: dict) -> Tuple[bool, str]:
+    """Run the pagos red asistencial process: validations of the mesh and of the
+    values against the ACM report. Only the stages whose inputs changed since the
+    last run (and the ones downstream) are executed when cache_file is given"""
+    try:
+        return run_pipeline(PIPELINE, params)
+    except Exception as e:
+        return False, f"ERROR: {e}"
+
+
+if __name__ == "__main__":
+    params = {
+        "file_path": r"C:\ProgramData\AutomationAnywhere\Bots\AD_GI_BasePagosRedAsistencial_SabanaPagosBasesSiniestralidad\Input\PROPUESTA DE PAGO 1 Y 2  (02-01-2025).xlsx",
+        "sheet_name": "Propuesta",
+        "inconsistencies_file": r"C:\ProgramData\AutomationAnywhere\Bots\AD_GI_BasePagosRedAsistencial_SabanaPagosBasesSiniestralidad\Temp\InconsistenciasBasePagosRedAsistencial.xlsx",
+        "exception_file": r"C:\ProgramData\AutomationAnywhere\Bots\AD_GI_BasePagosRedAsistencial_SabanaPagosBasesSiniestralidad\Input\EXCEPCIONES BASE PAGOS RED ASISTENCIAL.xlsx",
+        "acm_report": r"C:\ProgramData\AutomationAnywhere\Bots\AD_GI_BasePagosRedAsistencial_SabanaPagosBasesSiniestralidad\Temp\FCT_RS_REPORTE_WS_AUDITORIA.xlsx",
+        "file_name": "PROPUESTA DE PAGO 1 Y 2  (02-01-2025).xlsx",
+        "previous_file": r"C:\ProgramData\AutomationAnywhere\Bots\AD_GI_BasePagosRedAsistencial_SabanaPagosBasesSiniestralidad\Output\Validacion valores\Validacion valores 04122024.xlsx",
+        "temp_file": r"C:\ProgramData\AutomationAnywhere\Bots\AD_GI_BasePagosRedAsistencial_SabanaPagosBasesSiniestralidad\Temp\Pagos red asistencial 18122024.xlsx",
+        "historic_file": r"C:\ProgramData\AutomationAnywhere\Bots\AD_GI_BasePagosRedAsistencial_SabanaPagosBasesSiniestralidad\Input\VALIDADOR PAGOS.xlsx",
+        "cache_file": r"C:\ProgramData\AutomationAnywhere\Bots\AD_GI_BasePagosRedAsistencial_SabanaPagosBasesSiniestralidad\Temp\pipeline_pagos_red.json",
+    }
+    print(main(params))
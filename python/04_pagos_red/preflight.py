@@ -0,0 +1,49 @@
+import os
+import sys
+from typing import Tuple
+
+## Make the shared "common" package importable from the bot folders
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.acm_report import ACM_SHEET
+from common.schema import SheetLayout, preflight
+
+## The rules of the mesh read the propuesta by position (iloc), the last column
+## used is 27
+PROPUESTA_COLUMNS: int = 28
+
+
+def main(params: dict) -> Tuple[bool, str]:
+    """Check the sheets and headers of the inputs of the pagos red asistencial
+    process before the propuesta is read, the process fails in milliseconds when
+    a sheet was renamed or the columns moved"""
+    try:
+        return preflight(
+            [
+                (
+                    params.get("file_path"),
+                    [SheetLayout(params.get("sheet_name"), PROPUESTA_COLUMNS)],
+                ),
+                (
+                    params.get("exception_file"),
+                    [
+                        SheetLayout("OTRO", columns=("COMPAÑIA COASEGURADORA",)),
+                        SheetLayout("VALIDACION VALORES"),
+                        SheetLayout("VALIDACION DUPLICADOS"),
+                        SheetLayout("VALIDACION FORMATOS"),
+                    ],
+                ),
+                (params.get("acm_report"), [SheetLayout(ACM_SHEET)]),
+            ]
+        )
+    except Exception as e:
+        return False, f"ERROR: {e}"
+
+
+if __name__ == "__main__":
+    params = {
+        "file_path": r"C:\ProgramData\AutomationAnywhere\Bots\AD_GI_BasePagosRedAsistencial_SabanaPagosBasesSiniestralidad\Input\PROPUESTA DE PAGO 1 Y 2  (02-01-2025).xlsx",
+        "sheet_name": "Propuesta",
+        "exception_file": r"C:\ProgramData\AutomationAnywhere\Bots\AD_GI_BasePagosRedAsistencial_SabanaPagosBasesSiniestralidad\Input\EXCEPCIONES BASE PAGOS RED ASISTENCIAL.xlsx",
+        "acm_report": r"C:\ProgramData\AutomationAnywhere\Bots\AD_GI_BasePagosRedAsistencial_SabanaPagosBasesSiniestralidad\Temp\FCT_RS_REPORTE_WS_AUDITORIA.xlsx",
+    }
+    print(main(params))
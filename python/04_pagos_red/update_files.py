@@ -1,7 +1,13 @@
+import os
+import sys
 import pandas as pd  # type: ignore
 from openpyxl import load_workbook  # type: ignore
 from datetime import datetime
 
+## Make the shared "common" package importable from the bot folders
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.xlsx_stream import write_frame
+
 
 def update_validador_pagos_file(params: dict) -> tuple:
     try:
@@ -77,13 +83,8 @@ def update_final_file(params: dict) -> tuple:
             [historical_df, values_validation_df], ignore_index=True
         )
 
-        # Save the final file
-        final_df.to_excel(
-            final_path,
-            sheet_name="Propuesta",
-            engine="openpyxl",
-            index=False,
-        )
+        # Save the final file (streamed, the historical keeps growing)
+        write_frame(final_df, final_path, "Propuesta")
 
         return (
             True,
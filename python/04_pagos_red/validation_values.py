@@ -1,8 +1,16 @@
+import os
+import sys
 import pandas as pd  # type: ignore
 from typing import Optional
 from datetime import datetime
 from openpyxl import load_workbook  # type: ignore
 
+## Make the shared "common" package importable from the bot folders
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.acm_report import acm_columns
+from common.inconsistencies import project
+from common.xlsx_stream import write_frame
+
 
 class ValuesValidation:
     def __init__(
@@ -15,6 +23,8 @@ class ValuesValidation:
         previous_file: str,
         temp_file: str,
         historic_file: str,
+        compact_rows: Optional[str] = None,
+        acm_cache: Optional[str] = None,
     ):
         self.file_path = file_path
         self.inconsistencies_file = inconsistencies_file
@@ -24,6 +34,10 @@ class ValuesValidation:
         self.previous_file = previous_file
         self.temp_file = temp_file
         self.historic_file = historic_file
+        ## Rules whose inconsistencies are saved compact (the rows are whole by default)
+        self.compact_rows = compact_rows
+        ## Folder to keep the parsed ACM report for the next steps (optional)
+        self.acm_cache = acm_cache
 
     def read_excel(self, file_path: str, sheet_name: str) -> pd.DataFrame:
         """Method for returning a data frame"""
@@ -67,17 +81,13 @@ class ValuesValidation:
         """Method to validate the inconsistencies before append in a inconsistencies file"""
         if not df.empty:
             df = df.copy()
+            rows: pd.Series = pd.Series(df.index + 2, index=df.index).astype(str)
             if isinstance(col_idx, int):
-                df[f"COORDENADAS"] = df.apply(
-                    lambda row: f"{self.excel_col_name(col_idx + 1)}{row.name + 2}",
-                    axis=1,
-                )
+                df["COORDENADAS"] = self.excel_col_name(col_idx + 1) + rows
             else:
                 for i in col_idx:
-                    df[f"COORDENADAS_{i + 2}"] = df.apply(
-                        lambda row: f"{self.excel_col_name(i+1)}{row.name + 2}",
-                        axis=1,
-                    )
+                    df[f"COORDENADAS_{i + 2}"] = self.excel_col_name(i + 1) + rows
+            df = project(df, col_idx, sheet_name, self.compact_rows)
             self.save_inconsistencies_file(df, sheet_name)
             return "SUCCESS: Inconsistencies guardadas correctamente"
         else:
@@ -391,15 +401,10 @@ def validate_values(acm_file: str) -> None:
         historical_df: pd.DataFrame = values_validation.read_excel(
             values_validation.previous_file, values_validation.sheet_name
         )
-        # Get the ACM report data fame
-        acm_report: pd.DataFrame = values_validation.read_excel(
-            acm_file, "FCT_RS_REPORTE_WS_AUDITORIA"
+        # Get the ACM report data fame (parsed once and shared with the mesh validation)
+        acm_report: pd.DataFrame = acm_columns(
+            acm_file, ["valor aprobado", "Valor Liquidado"], values_validation.acm_cache
         )
-        # Delete te no needed columns and rows
-        acm_report = acm_report.iloc[3:, 1:]
-        acm_report.columns = acm_report.iloc[0]
-        acm_report = acm_report.iloc[1:].reset_index(drop=True)
-        acm_report = acm_report[["id cuenta", "valor aprobado", "Valor Liquidado"]]
 
         # Validate and extract the important data from propuesta and acm report
         propuesta_df: pd.DataFrame = extract_data_from_propuesta(propuesta_pago_df)
@@ -409,10 +414,8 @@ def validate_values(acm_file: str) -> None:
         # Report inconsistencies
         report_inconsistencies(filled_df)
         # Save the final file into temp file folder
-        filled_df.to_excel(
-            values_validation.temp_file,
-            sheet_name=values_validation.sheet_name,
-            index=False,
+        write_frame(
+            filled_df, values_validation.temp_file, values_validation.sheet_name
         )
         return True, f"Function '{validate_values.__name__}' executed successfully"
 
@@ -488,6 +491,8 @@ def main(params: dict) -> bool:
                 previous_file=params.get("previous_file"),
                 temp_file=params.get("temp_file"),
                 historic_file=params.get("historic_file"),
+                compact_rows=params.get("compact_rows"),
+                acm_cache=params.get("acm_cache"),
             )
             return True
     except Exception as e:
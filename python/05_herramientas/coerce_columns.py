@@ -0,0 +1,338 @@
+import io
+import math
+import os
+import re
+import sys
+import zipfile
+from typing import IO, Any, Callable, Optional, Tuple
+from xml.sax.saxutils import escape
+import pandas as pd  # type: ignore
+from openpyxl import load_workbook  # type: ignore
+from openpyxl.utils import column_index_from_string, get_column_letter  # type: ignore
+
+## Make the shared "common" package importable from the bot folders
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.params import split_param
+from common.xlsx_package import rewrite_package, sheet_part
+
+## Cells of the worksheet part and their reference ("AB12")
+CELL: re.Pattern = re.compile(r"<c\b([^>]*?)(?:/>|>(.*?)</c>)", re.S)
+REFERENCE: re.Pattern = re.compile(r'\sr="([A-Z]+)(\d+)"')
+STYLE: re.Pattern = re.compile(r'\ss="(\d+)"')
+## Attributes of the cell replaced with the new value (type, style and metadata)
+VALUE_ATTRIBUTES: re.Pattern = re.compile(r'\s(?:t|s|cm|vm)="[^"]*"')
+CELL_XFS: re.Pattern = re.compile(r"(<cellXfs\b[^>]*>)(.*?)(</cellXfs>)", re.S)
+XF: re.Pattern = re.compile(r"<xf\b[^>]*?(?:/>|>.*?</xf>)", re.S)
+NUMBER_FORMAT_ATTRIBUTES: re.Pattern = re.compile(
+    r'\s(?:numFmtId|applyNumberFormat)="[^"]*"'
+)
+COUNT: re.Pattern = re.compile(r'\scount="\d+"')
+
+## Builtin number format "0", the one the ParseToNumberFormat macro gives
+NUMBER_FORMAT_ID: int = 1
+
+
+def text_value(value: Any) -> str:
+    """Text of a single value, the integer numbers are written without decimals"""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def as_text(column: pd.Series) -> pd.Series:
+    """Convert a column into text, the integer numbers are written without decimals
+    (pandas reads them as float when the column has empty cells)"""
+    if pd.api.types.is_numeric_dtype(column) and not pd.api.types.is_bool_dtype(
+        column
+    ):
+        numbers: pd.Series = column.astype(float)
+        is_integer: pd.Series = numbers.notna() & (numbers % 1 == 0)
+        text: pd.Series = numbers.astype(str).where(numbers.notna())
+        text[is_integer] = numbers[is_integer].astype("int64").astype(str)
+        return text.astype(object)
+    ## Mixed columns (numbers and texts) are converted value by value
+    return column.map(text_value, na_action="ignore").astype(object)
+
+
+def only_digits(column: pd.Series) -> pd.Series:
+    """Remove every character that is not a digit (0-9)"""
+    return as_text(column).str.replace(r"\D", "", regex=True)
+
+
+def as_number(column: pd.Series) -> pd.Series:
+    """Convert a column into numbers, the values that are not numbers are left empty.
+    Integer columns use the integer type to be written without decimals"""
+    numbers: pd.Series = pd.to_numeric(column, errors="coerce")
+    if numbers.notna().any() and (numbers.dropna() % 1 == 0).all():
+        return numbers.astype("Int64")
+    return numbers
+
+
+## Coercions available, the same of the ParseToNumberFormat, ParseToStringValues
+## and ProcesarColumnas macros. The numbers get the "0" format, as in the macro
+COERCIONS: dict[str, Callable[[pd.Series], pd.Series]] = {
+    "number": as_number,
+    "text": as_text,
+    "digits": only_digits,
+}
+
+
+def column_position(column: str) -> int:
+    """Return the 0-based position of a column given by letter ("A") or number ("0")"""
+    return int(column) if column.isdigit() else column_index_from_string(column) - 1
+
+
+def cell_value(value: Any) -> Any:
+    """Value of a coerced cell as it is written: None for the empty values and
+    Python types for the numpy ones"""
+    if hasattr(value, "item"):
+        value = value.item()
+    if value is None or value is pd.NA or value != value:
+        return None
+    if isinstance(value, float) and math.isinf(value):
+        return None
+    return value
+
+
+def read_cells(
+    file_path: str, sheet_name: str, positions: list[int]
+) -> Tuple[dict[int, pd.Series], int]:
+    """Read the values of the columns given (0-based) indexed by the Excel row, in
+    read-only mode. The header, the empty cells and the cells with formulas are
+    left out. Return them with the number of rows of the sheet"""
+    cells: dict[int, Tuple[list, list]] = {position: ([], []) for position in positions}
+    last_row: int = 1
+    workbook = load_workbook(file_path, read_only=True)
+    try:
+        worksheet = workbook[sheet_name]
+        ## The dimension saved in the file can be stale and cut the rows
+        worksheet.reset_dimensions()
+        for row in worksheet.iter_rows(
+            min_row=2, min_col=min(positions) + 1, max_col=max(positions) + 1
+        ):
+            for cell in row:
+                ## The empty cells between the cells with data have no position
+                if cell.value is None or getattr(cell, "row", None) is None:
+                    continue
+                last_row = max(last_row, cell.row)
+                if cell.column - 1 in cells and cell.data_type != "f":
+                    cells[cell.column - 1][0].append(cell.row)
+                    cells[cell.column - 1][1].append(cell.value)
+    finally:
+        workbook.close()
+    return {
+        position: pd.Series(values, index=rows, dtype=None if values else object)
+        for position, (rows, values) in cells.items()
+    }, last_row - 1
+
+
+def cell_xml(attributes: str, value: Any, style: Optional[int]) -> str:
+    """Build the cell with its new value, the texts are written inline"""
+    attributes = VALUE_ATTRIBUTES.sub("", attributes)
+    if style is not None:
+        attributes += f' s="{style}"'
+    if value is None:
+        return f"<c{attributes}/>"
+    if isinstance(value, str):
+        return (
+            f'<c{attributes} t="inlineStr"><is><t xml:space="preserve">'
+            f"{escape(value)}</t></is></c>"
+        )
+    if isinstance(value, bool):
+        return f'<c{attributes} t="b"><v>{int(value)}</v></c>'
+    return f"<c{attributes}><v>{text_value(value)}</v></c>"
+
+
+class CellWriter:
+    """Rewrite the coerced cells of a worksheet part while it is streamed. The
+    numbers of the columns with a number format get a copy of their style with
+    that format, the copies are added at the end of the cellXfs of styles.xml"""
+
+    def __init__(
+        self,
+        values: dict[str, dict[int, Any]],
+        number_formats: dict[str, int],
+        styles_count: int,
+    ):
+        self.values = values
+        self.number_formats = number_formats
+        self.styles_count = styles_count
+        ## Style of the cell: (style copied, number format) -> new style
+        self.new_styles: dict[Tuple[int, int], int] = {}
+
+    def style(self, style: Optional[int], column: str, value: Any) -> Optional[int]:
+        """Style of the new cell, the one it had unless it is a number"""
+        number_format: Optional[int] = self.number_formats.get(column)
+        if number_format is None or isinstance(value, (str, bool)) or value is None:
+            return style
+        key: Tuple[int, int] = (style or 0, number_format)
+        if key not in self.new_styles:
+            self.new_styles[key] = self.styles_count + len(self.new_styles)
+        return self.new_styles[key]
+
+    def replace(self, match: re.Match) -> str:
+        attributes: str = match.group(1)
+        reference = REFERENCE.search(attributes)
+        if reference is None:
+            raise ValueError("the cells of the sheet have no reference")
+        column, row = reference.group(1), int(reference.group(2))
+        column_values: Optional[dict[int, Any]] = self.values.get(column)
+        ## The cells with formulas are kept as they are
+        if column_values is None or row not in column_values:
+            return match.group(0)
+        if "<f" in (match.group(2) or ""):
+            return match.group(0)
+        current = STYLE.search(attributes)
+        value: Any = column_values[row]
+        return cell_xml(
+            attributes,
+            value,
+            self.style(int(current.group(1)) if current else None, column, value),
+        )
+
+    def rewrite_sheet(self, source: IO[bytes], target: IO[bytes]) -> None:
+        """Stream the worksheet part, rewriting the cells of each block of
+        complete rows"""
+        text = io.TextIOWrapper(source, encoding="utf-8")
+        pending: str = ""
+        while True:
+            chunk: str = text.read(1 << 20)
+            pending += chunk
+            end: int = len(pending)
+            if chunk:
+                end = pending.rfind("</row>")
+                if end < 0:
+                    continue
+                end += len("</row>")
+            target.write(CELL.sub(self.replace, pending[:end]).encode("utf-8"))
+            pending = pending[end:]
+            if not chunk:
+                return
+
+    def rewrite_styles(self, source: IO[bytes], target: IO[bytes]) -> None:
+        """Add the copies of the styles with the number format of the coerced
+        cells, it runs after rewrite_sheet"""
+        styles: str = source.read().decode("utf-8")
+        if self.new_styles:
+            cell_xfs = CELL_XFS.search(styles)
+            if cell_xfs is None:
+                raise ValueError("the workbook has no cell styles")
+            opening, content, closing = cell_xfs.groups()
+            xfs: list[str] = XF.findall(content)
+            for style, number_format in self.new_styles:
+                xf: str = NUMBER_FORMAT_ATTRIBUTES.sub("", xfs[style])
+                content += xf.replace(
+                    "<xf",
+                    f'<xf numFmtId="{number_format}" applyNumberFormat="1"',
+                    1,
+                )
+            opening = COUNT.sub(f' count="{len(xfs) + len(self.new_styles)}"', opening)
+            styles = (
+                styles[: cell_xfs.start()]
+                + opening
+                + content
+                + closing
+                + styles[cell_xfs.end() :]
+            )
+        target.write(styles.encode("utf-8"))
+
+
+def recalculate_on_load(source: IO[bytes], target: IO[bytes]) -> None:
+    """Ask Excel to recalculate the formulas when the workbook is opened, their
+    saved values can depend on the cells coerced"""
+    workbook: str = source.read().decode("utf-8")
+    workbook = re.sub(
+        r"<calcPr([^>]*?)\s*(/?)>",
+        lambda match: "<calcPr"
+        + re.sub(r'\sfullCalcOnLoad="[^"]*"', "", match.group(1))
+        + f' fullCalcOnLoad="1"{match.group(2)}>',
+        workbook,
+        count=1,
+    )
+    target.write(workbook.encode("utf-8"))
+
+
+def coerce_file(
+    file_path: str, sheet_name: str, columns: list[str], coercions: list[str]
+) -> str:
+    """Apply the coercions to the columns of a sheet and save the workbook once.
+    Only the cells coerced are changed: the worksheet part is streamed and the
+    other parts are copied, so the formats, the formulas and the other sheets
+    are kept and the workbook is never loaded in memory"""
+    positions: list[int] = [column_position(column) for column in columns]
+    values, rows = read_cells(file_path, sheet_name, positions)
+    number_formats: dict[str, int] = {}
+    for position, coercion in zip(positions, coercions):
+        values[position] = COERCIONS[coercion](values[position])
+        letter: str = get_column_letter(position + 1)
+        if coercion == "number":
+            number_formats[letter] = NUMBER_FORMAT_ID
+        else:
+            number_formats.pop(letter, None)
+
+    with zipfile.ZipFile(file_path) as package:
+        worksheet: str = sheet_part(package, sheet_name)
+        styles: str = package.read("xl/styles.xml").decode("utf-8")
+    cell_xfs = CELL_XFS.search(styles)
+    writer = CellWriter(
+        {
+            get_column_letter(position + 1): {
+                row: cell_value(value) for row, value in column.items()
+            }
+            for position, column in values.items()
+        },
+        number_formats,
+        len(XF.findall(cell_xfs.group(2))) if cell_xfs else 0,
+    )
+    ## styles.xml is written after the sheet, once the new styles are known
+    rewrite_package(
+        file_path,
+        {
+            worksheet: writer.rewrite_sheet,
+            "xl/styles.xml": writer.rewrite_styles,
+            "xl/workbook.xml": recalculate_on_load,
+        },
+    )
+    return f"{os.path.basename(file_path)}: {rows} rows"
+
+
+def main(params: dict) -> Tuple[bool, str]:
+    """Coerce columns of one or several workbooks. file_path and sheet_name accept
+    several values separated by "¶", columns and coercions are separated by commas
+    ("A,C,F" and "digits,number,text"), one coercion can be used for every column"""
+    try:
+        file_paths: list[str] = split_param(params.get("file_path"))
+        sheet_names: list[str] = split_param(params.get("sheet_name"))
+        columns: list[str] = split_param(params.get("columns"), ",")
+        coercions: list[str] = [
+            coercion.lower() for coercion in split_param(params.get("coercions"), ",")
+        ]
+        if not all(file_paths + sheet_names + columns + coercions):
+            return False, "ERROR: an input param required is missing"
+        if len(sheet_names) == 1:
+            sheet_names = sheet_names * len(file_paths)
+        if len(coercions) == 1:
+            coercions = coercions * len(columns)
+        if len(file_paths) != len(sheet_names) or len(columns) != len(coercions):
+            return False, "ERROR: the number of values of the params does not match"
+        unknown: list[str] = [c for c in coercions if c not in COERCIONS]
+        if unknown:
+            return False, f"ERROR: coercion not supported: {', '.join(unknown)}"
+
+        messages: list[str] = [
+            coerce_file(file_path, sheet_name, columns, coercions)
+            for file_path, sheet_name in zip(file_paths, sheet_names)
+        ]
+        return True, f"SUCCESS: {'; '.join(messages)}"
+    except Exception as e:
+        return False, f"ERROR: {e}"
+
+
+if __name__ == "__main__":
+    params = {
+        "file_path": r"C:\ProgramData\AutomationAnywhere\Bots\Logs\AD_RCSN_SabanaPagosYBasesParaSinestralidad\TempFolder\BASE DE REPARTO 2024.xlsx",
+        "sheet_name": "CASOS NUEVOS",
+        "columns": "A,S",
+        "coercions": "digits,text",
+    }
+    print(main(params))
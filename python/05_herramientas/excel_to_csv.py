@@ -0,0 +1,210 @@
+import csv
+import os
+import sys
+from datetime import date, datetime, time
+from typing import Any, Optional, Tuple
+from openpyxl import load_workbook  # type: ignore
+from openpyxl.utils import column_index_from_string  # type: ignore
+
+## Make the shared "common" package importable from the bot folders
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.params import split_param
+from common.workers import run_processes
+
+QUOTING: dict[str, int] = {
+    "minimal": csv.QUOTE_MINIMAL,
+    "all": csv.QUOTE_ALL,
+    "nonnumeric": csv.QUOTE_NONNUMERIC,
+    "none": csv.QUOTE_NONE,
+}
+
+
+class CsvFormat:
+    def __init__(
+        self,
+        delimiter: str = "|",
+        quoting: str = "minimal",
+        encoding: str = "cp1252",
+        date_format: str = "%d/%m/%Y",
+        decimal_separator: str = ".",
+        thousands_separator: str = "",
+    ):
+        self.delimiter = delimiter
+        self.quoting = QUOTING[quoting.lower()]
+        ## Excel saves the CSV files with the ANSI code page of Windows
+        self.encoding = encoding
+        self.date_format = date_format
+        self.decimal_separator = decimal_separator
+        self.thousands_separator = thousands_separator
+
+    def format_number(self, value) -> str:
+        """Method to write a number with the separators configured"""
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        text: str = f"{value:,}" if self.thousands_separator else str(value)
+        ## Temporary marker to swap both separators
+        text = text.replace(",", "\0").replace(".", self.decimal_separator)
+        return text.replace("\0", self.thousands_separator)
+
+    def format_value(self, value: Any) -> str:
+        """Method to convert a cell value into text"""
+        if value is None:
+            return ""
+        if isinstance(value, bool):
+            return "VERDADERO" if value else "FALSO"
+        if isinstance(value, datetime) and value.time() != time():
+            ## The time is kept when the cell has one, as Excel shows it
+            return value.strftime(f"{self.date_format} %H:%M:%S")
+        if isinstance(value, (datetime, date)):
+            return value.strftime(self.date_format)
+        if isinstance(value, time):
+            return value.strftime("%H:%M:%S")
+        if isinstance(value, (int, float)):
+            return self.format_number(value)
+        return str(value)
+
+
+def export_sheet(
+    file_path: str,
+    dest_file: str,
+    sheet_name: str,
+    csv_format: CsvFormat,
+    last_column: Optional[str] = None,
+) -> int:
+    """Write the sheet into a delimited text file row by row (constant memory)
+    and return the number of rows written. The columns after last_column are
+    not exported"""
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        ## The sheet can be given by name or by its position (1-based), as in the macro
+        if sheet_name not in workbook.sheetnames and str(sheet_name).isdigit():
+            sheet_name = workbook.sheetnames[int(sheet_name) - 1]
+        worksheet = workbook[sheet_name]
+        ## The dimension saved in the file can be stale and cut the rows, it is
+        ## only kept as the minimum width of the rows
+        saved_width: int = worksheet.max_column or 0
+        worksheet.reset_dimensions()
+        max_col: Optional[int] = (
+            column_index_from_string(last_column) if last_column else None
+        )
+        ## Every row has the width of the used range, as in the CSV saved by Excel
+        width: Optional[int] = max_col
+
+        rows_written: int = 0
+        ## Empty rows are only written when there are more data below them
+        pending_empty: int = 0
+        with open(dest_file, "w", newline="", encoding=csv_format.encoding) as file:
+            writer = csv.writer(
+                file,
+                delimiter=csv_format.delimiter,
+                quoting=csv_format.quoting,
+                escapechar="\\" if csv_format.quoting == csv.QUOTE_NONE else None,
+            )
+            for row in worksheet.iter_rows(max_col=max_col, values_only=True):
+                if all(value is None for value in row):
+                    pending_empty += 1
+                    continue
+                if width is None:
+                    ## The header row gives the width when no last column is set
+                    width = max(saved_width, len(row))
+                values: list[str] = [csv_format.format_value(value) for value in row]
+                values += [""] * (width - len(values))
+                ## A single empty field would be written as ""
+                empty_row: list[str] = [""] * width if width > 1 else []
+                try:
+                    for _ in range(pending_empty):
+                        writer.writerow(empty_row)
+                    writer.writerow(values)
+                except UnicodeEncodeError as e:
+                    raise ValueError(
+                        f"row {rows_written + pending_empty + 1} has characters that "
+                        f"can not be written with the encoding {csv_format.encoding}"
+                        f" ({e.object[e.start:e.end]!r}), use utf-8"
+                    ) from e
+                rows_written += pending_empty + 1
+                pending_empty = 0
+        return rows_written
+    finally:
+        workbook.close()
+
+
+def export_job(job: dict) -> Tuple[bool, str]:
+    """Convert one file, the function runs into the worker processes"""
+    try:
+        rows: int = export_sheet(
+            job["file_path"],
+            job["dest_file"],
+            job["sheet_name"],
+            CsvFormat(**job["csv_format"]),
+            job.get("last_column"),
+        )
+        return True, f"{os.path.basename(job['dest_file'])}: {rows} rows"
+    except Exception as e:
+        return False, f"{os.path.basename(job['file_path'])}: {e}"
+
+
+def main(params: dict) -> Tuple[bool, str]:
+    """Convert one or several excel sheets into delimited text files. file_path,
+    dest_file and sheet_name accept several values separated by "¶" and the files
+    are converted in parallel"""
+    try:
+        file_paths: list[str] = split_param(params.get("file_path"))
+        dest_files: list[str] = split_param(params.get("dest_file"))
+        sheet_names: list[str] = split_param(params.get("sheet_name"))
+        if not all(file_paths + dest_files + sheet_names):
+            return False, "Error: an input param required is missing"
+        ## One sheet name can be used for every file
+        if len(sheet_names) == 1:
+            sheet_names = sheet_names * len(file_paths)
+        if not len(file_paths) == len(dest_files) == len(sheet_names):
+            return False, "Error: file_path, dest_file and sheet_name lengths differ"
+
+        csv_format: dict = {
+            key: params[key]
+            for key in (
+                "delimiter",
+                "quoting",
+                "encoding",
+                "date_format",
+                "decimal_separator",
+                "thousands_separator",
+            )
+            if params.get(key) is not None
+        }
+        ## Validate the format before starting the workers
+        CsvFormat(**csv_format)
+        jobs: list[dict] = [
+            {
+                "file_path": file_path,
+                "dest_file": dest_file,
+                "sheet_name": sheet_name,
+                "csv_format": csv_format,
+                "last_column": params.get("last_column"),
+            }
+            for file_path, dest_file, sheet_name in zip(
+                file_paths, dest_files, sheet_names
+            )
+        ]
+
+        workers: Optional[int] = (
+            int(params["workers"]) if params.get("workers") else None
+        )
+        results = run_processes(export_job, [(job,) for job in jobs], workers)
+
+        messages: str = "; ".join(message for _, message in results)
+        if all(success for success, _ in results):
+            return True, f"SUCCESS: {messages}"
+        return False, f"ERROR: {messages}"
+    except Exception as e:
+        return False, f"ERROR: {e}"
+
+
+if __name__ == "__main__":
+    params = {
+        "file_path": r"C:\ProgramData\AutomationAnywhere\Bots\Logs\AD_RCSN_SabanaPagosYBasesParaSinestralidad\TempFolder\BASE DE REPARTO 2024.xlsx",
+        "dest_file": r"C:\ProgramData\AutomationAnywhere\Bots\Logs\AD_RCSN_SabanaPagosYBasesParaSinestralidad\OutputFolder\BASE DE REPARTO 2024.csv",
+        "sheet_name": "CASOS NUEVOS",
+        "delimiter": "|",
+        "decimal_separator": ",",
+    }
+    print(main(params))
@@ -0,0 +1,55 @@
+import os
+import sys
+from datetime import datetime
+from typing import Tuple
+
+## Make the shared "common" package importable from the bot folders
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.params import split_param
+from common.xlsx_stream import filter_copy
+
+
+def main(params: dict) -> Tuple[bool, str]:
+    """Copy the rows of a sheet with the date column between begin_date and
+    cut_off_date ("DD/MM/YYYY") into a new workbook. date_col is the header name
+    or the 0-based position. sheet_name accepts several sheets separated by "¶"
+    that are copied one after another under the header of the first one"""
+    try:
+        file_path: str = params.get("file_path")
+        sheet_names: list[str] = split_param(params.get("sheet_name"))
+        dest_file: str = params.get("dest_file")
+        dest_sheet: str = params.get("dest_sheet") or sheet_names[0]
+        date_col: str = str(params.get("date_col") or "")
+        begin_date: str = params.get("begin_date")
+        cut_off_date: str = params.get("cut_off_date")
+        last_col = params.get("last_col_idx")
+
+        if not all([file_path, dest_file, date_col, begin_date, cut_off_date]):
+            return False, "ERROR: an input param required is missing"
+        if not all(sheet_names):
+            return False, "ERROR: an input param required is missing"
+
+        rows: int = filter_copy(
+            [(file_path, sheet_name) for sheet_name in sheet_names],
+            dest_file,
+            dest_sheet,
+            int(date_col) if date_col.isdigit() else date_col,
+            datetime.strptime(begin_date, "%d/%m/%Y"),
+            datetime.strptime(cut_off_date, "%d/%m/%Y"),
+            max_col=int(last_col) + 1 if last_col else None,
+        )
+        return True, f"SUCCESS: {rows} rows copied into {os.path.basename(dest_file)}"
+    except Exception as e:
+        return False, f"ERROR: {e}"
+
+
+if __name__ == "__main__":
+    params = {
+        "file_path": r"C:\ProgramData\AutomationAnywhere\Bots\AD_GI_BaseObjetados_SabanaPagosBasesSiniestralidad\Input\Objetados 2022 - 2023 - 2024.xlsx",
+        "sheet_name": "Objeciones 2022 - 2023 -2024",
+        "dest_file": r"C:\ProgramData\AutomationAnywhere\Bots\AD_GI_BaseObjetados_SabanaPagosBasesSiniestralidad\Temp\Objetados.xlsx",
+        "date_col": "44",
+        "begin_date": "01/01/2024",
+        "cut_off_date": "29/06/2024",
+    }
+    print(main(params))
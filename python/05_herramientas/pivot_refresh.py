@@ -0,0 +1,252 @@
+import os
+import re
+import sys
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Any, Tuple
+from xml.sax.saxutils import quoteattr
+import pandas as pd  # type: ignore
+from openpyxl import load_workbook  # type: ignore
+from openpyxl.utils.cell import (  # type: ignore
+    column_index_from_string,
+    range_boundaries,
+)
+from pandas.io.parsers import TextParser  # type: ignore
+
+## Make the shared "common" package importable from the bot folders
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.xlsx_package import MAIN_NS, read_rels, rewrite_package, sheet_part
+from common.xlsx_stream import convert_value, iter_columns, write_frame
+
+
+def find_pivot_cache(
+    package: zipfile.ZipFile, sheet_name: str, pivot_cell: str
+) -> str:
+    """Return the cache definition part of the pivot table that contains the cell"""
+    column, row, _, _ = range_boundaries(pivot_cell)
+    for pivot_part in read_rels(package, sheet_part(package, sheet_name)).values():
+        if "pivotTables/" not in pivot_part:
+            continue
+        location = re.search(
+            rb'<location[^>]*\sref="([^"]+)"', package.read(pivot_part)
+        )
+        min_col, min_row, max_col, max_row = range_boundaries(
+            location.group(1).decode()
+        )
+        if min_col <= column <= max_col and min_row <= row <= max_row:
+            for target in read_rels(package, pivot_part).values():
+                if "pivotCacheDefinition" in target:
+                    return target
+    raise ValueError(f"There is no pivot table in '{sheet_name}'!{pivot_cell}")
+
+
+def resolve_source_range(file_path: str, source_range: str) -> Tuple[str, str]:
+    """Split "SHEET!A:BX" into sheet and reference. Whole columns are limited to
+    the last row with data, as Excel does when it creates the cache"""
+    source_sheet, ref = source_range.rsplit("!", 1)
+    ## Quoted sheet names double their apostrophes ('It''s'!A:B)
+    if source_sheet.startswith("'") and source_sheet.endswith("'"):
+        source_sheet = source_sheet[1:-1].replace("''", "'")
+    ref = ref.replace("$", "")
+    if re.fullmatch(r"[A-Z]+:[A-Z]+", ref):
+        first, last = ref.split(":")
+        workbook = load_workbook(file_path, read_only=True)
+        try:
+            worksheet = workbook[source_sheet]
+            ## The dimension saved in the file can be stale ("A1"), count the rows
+            worksheet.reset_dimensions()
+            max_row: int = 1
+            for row_number, row in enumerate(
+                worksheet.iter_rows(
+                    min_col=column_index_from_string(first),
+                    max_col=column_index_from_string(last),
+                    values_only=True,
+                ),
+                start=1,
+            ):
+                if any(value is not None for value in row):
+                    max_row = row_number
+        finally:
+            workbook.close()
+        ref = f"{first}1:{last}{max_row}"
+    return source_sheet, ref
+
+
+def header_text(value: Any) -> str:
+    """Text of a header cell, as Excel names the fields of the pivot cache"""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return "" if value is None else str(value)
+
+
+def source_headers(file_path: str, source_sheet: str, ref: str) -> list[str]:
+    """Return the header row (the first row of the reference) of the source"""
+    min_col, min_row, max_col, _ = range_boundaries(ref)
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[source_sheet]
+        worksheet.reset_dimensions()
+        row: tuple = next(
+            worksheet.iter_rows(
+                min_row=min_row,
+                max_row=min_row,
+                min_col=min_col,
+                max_col=max_col,
+                values_only=True,
+            ),
+            (),
+        )
+    finally:
+        workbook.close()
+    row = row + (None,) * (max_col - min_col + 1 - len(row))
+    return [header_text(value) for value in row]
+
+
+def cache_fields(definition: str) -> list[str]:
+    """Return the names of the fields of the cache that come from the source
+    columns (the calculated fields are not columns of the source)"""
+    root = ET.fromstring(definition.encode("utf-8"))
+    return [
+        field.get("name", "")
+        for field in root.iter(f"{MAIN_NS}cacheField")
+        if field.get("databaseField", "1") not in ("0", "false")
+    ]
+
+
+def refresh_pivot_source(params: dict) -> Tuple[bool, str]:
+    """Change the source range of a pivot table and mark its cache to be refreshed
+    when the workbook is opened. Only the cache definition part is rewritten,
+    every other part of the file is copied as it is, so the size of the source
+    data does not matter. The cache fields and records are not rebuilt: the new
+    range must have the same header as the cache, otherwise nothing is changed"""
+    try:
+        file_path: str = params.get("file_path")
+        sheet_name: str = params.get("sheet_name")
+        pivot_cell: str = params.get("pivot_cell")
+        source_range: str = params.get("source_range")
+        if not all([file_path, sheet_name, pivot_cell, source_range]):
+            return False, "ERROR: an input param required is missing"
+
+        source_sheet, ref = resolve_source_range(file_path, source_range)
+        with zipfile.ZipFile(file_path) as package:
+            cache_part: str = find_pivot_cache(package, sheet_name, pivot_cell)
+            definition: str = package.read(cache_part).decode("utf-8")
+
+            ## Excel rejects the pivot table when its fields do not match the source
+            headers: list[str] = source_headers(file_path, source_sheet, ref)
+            fields: list[str] = cache_fields(definition)
+            if headers != fields:
+                return False, (
+                    "ERROR: the header of the new range does not match the fields "
+                    f"of the pivot cache ({', '.join(headers)} instead of "
+                    f"{', '.join(fields)}), the pivot table must be created again"
+                )
+
+            ## Text replacements keep the namespaces of the part as they are
+            source_tag: str = (
+                f"<worksheetSource ref={quoteattr(ref)}"
+                f" sheet={quoteattr(source_sheet)}/>"
+            )
+            definition, found = re.subn(
+                r"<worksheetSource\b[^>]*/>", lambda _: source_tag, definition, count=1
+            )
+            if not found:
+                return False, "ERROR: the pivot table is not based on a sheet range"
+            definition = re.sub(r'\srefreshOnLoad="[^"]*"', "", definition, count=1)
+            definition = re.sub(
+                r"<pivotCacheDefinition\b",
+                '<pivotCacheDefinition refreshOnLoad="1"',
+                definition,
+                count=1,
+            )
+
+        ## Only the cache definition part is replaced
+        rewrite_package(
+            file_path,
+            {cache_part: lambda _, target: target.write(definition.encode("utf-8"))},
+        )
+        return True, f"SUCCESS: pivot table source updated to {source_sheet}!{ref}"
+    except Exception as e:
+        return False, f"ERROR: {e}"
+
+
+def read_source_columns(
+    file_path: str, source_sheet: str, names: list[str]
+) -> pd.DataFrame:
+    """Read only the columns given (by header name) of the source sheet in
+    read-only mode, with the types pd.read_excel gives"""
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[source_sheet]
+        worksheet.reset_dimensions()
+        header: list[str] = [
+            header_text(value)
+            for value in next(worksheet.iter_rows(max_row=1, values_only=True), ())
+        ]
+    finally:
+        workbook.close()
+    missing: list[str] = [name for name in names if name not in header]
+    if missing:
+        raise ValueError(f"the columns {', '.join(missing)} are not in {source_sheet}")
+    rows: list[list] = [
+        [convert_value(value) for value in row]
+        for row in iter_columns(
+            file_path, source_sheet, [header.index(name) for name in names]
+        )
+    ]
+    return TextParser(rows, header=None, names=names).read()
+
+
+def write_pivot_table(params: dict) -> Tuple[bool, str]:
+    """Write a precomputed pivot table (values only) into the sheet pivot_sheet
+    of a new workbook (dest_file), for the reports that do not need an Excel
+    pivot table. Only the columns used are read from the source and the source
+    workbook is not rewritten"""
+    try:
+        file_path: str = params.get("file_path")
+        source_sheet: str = params.get("source_sheet")
+        pivot_sheet: str = params.get("pivot_sheet")
+        index: str = params.get("index")
+        columns: str = params.get("columns")
+        values: str = params.get("values")
+        aggfunc: str = params.get("aggfunc") or "sum"
+        if not all([file_path, source_sheet, pivot_sheet, index, values]):
+            return False, "ERROR: an input param required is missing"
+        ## By default the pivot table is saved next to the source workbook
+        dest_file: str = params.get("dest_file") or os.path.join(
+            os.path.dirname(os.path.abspath(file_path)),
+            f"{os.path.splitext(os.path.basename(file_path))[0]} {pivot_sheet}.xlsx",
+        )
+        if os.path.abspath(dest_file) == os.path.abspath(file_path):
+            return False, "ERROR: dest_file must be a different file than file_path"
+
+        usecols: list[str] = list(
+            dict.fromkeys(col for col in (index, columns, values) if col)
+        )
+        data_frame: pd.DataFrame = read_source_columns(
+            file_path, source_sheet, usecols
+        )
+        pivot: pd.DataFrame = pd.pivot_table(
+            data_frame,
+            values=values,
+            index=index,
+            columns=columns,
+            aggfunc=aggfunc,
+            fill_value=0,
+            margins=True,
+            margins_name="Total general",
+        )
+        write_frame(pivot, dest_file, pivot_sheet, index=True)
+        return True, f"SUCCESS: pivot table saved into {dest_file}"
+    except Exception as e:
+        return False, f"ERROR: {e}"
+
+
+if __name__ == "__main__":
+    params = {
+        "file_path": r"\\boinfii10d09\RepositorioAA\R_RPAOPM-197_LiquidacionDeIncentivos\RutaCompartida\clusterwinfs2fs\Gerencia_BancaSeguros\incentivos\Recaudos JUNIO 2024 Final.xlsx",
+        "sheet_name": "TABLA",
+        "pivot_cell": "A3",
+        "source_range": "RECAUDOS!A:BX",
+    }
+    print(refresh_pivot_source(params))
@@ -0,0 +1,6 @@
+"""Shared helpers used by the validation scripts of every process (reparto, pagos,
+objetados and pagos red asistencial).
+
+The scripts live in numbered folders that are not importable packages, so each one
+adds the ``python`` folder to ``sys.path`` before importing from ``common``.
+"""
@@ -0,0 +1,110 @@
+import hashlib
+import json
+import os
+from typing import Optional
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+from common.result_cache import track_read
+
+ACM_SHEET: str = "FCT_RS_REPORTE_WS_AUDITORIA"
+ACM_KEY: str = "id cuenta"
+
+## Parsed reports of the current session by (file, modified time, size)
+_cache: dict[tuple, pd.DataFrame] = {}
+
+
+def normalize(acm_report: pd.DataFrame) -> pd.DataFrame:
+    """Drop the title rows and the first column of the ACM export, use the
+    header row (row 3) as column names and index the table by id cuenta. Every
+    column is kept, each validation selects the ones it uses"""
+    acm_report = acm_report.iloc[3:, 1:]
+    acm_report.columns = list(acm_report.iloc[0])
+    acm_report = acm_report.iloc[1:].reset_index(drop=True)
+    if ACM_KEY not in acm_report.columns:
+        raise ValueError(f"the ACM report has no column '{ACM_KEY}'")
+    return acm_report.set_index(ACM_KEY)
+
+
+def _cache_file(cache_dir: str, file_path: str) -> str:
+    """Path of the parsed copy of the report into the cache folder"""
+    name: str = hashlib.sha256(os.path.abspath(file_path).encode()).hexdigest()[:16]
+    return os.path.join(cache_dir, f"acm_report_{name}.json")
+
+
+def _write_cache_file(cache_file: str, key: tuple, table: pd.DataFrame) -> None:
+    """Save the parsed table as JSON (texts and nulls, nothing is executed when
+    it is read back)"""
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    content: dict = {
+        "key": list(key),
+        "columns": list(table.columns),
+        "index": [None if pd.isna(value) else value for value in table.index],
+        "data": table.astype(object).where(table.notna(), None).values.tolist(),
+    }
+    with open(cache_file, "w", encoding="utf-8") as file:
+        json.dump(content, file)
+
+
+def _read_cache_file(cache_file: str, key: tuple) -> Optional[pd.DataFrame]:
+    """Return the parsed copy saved by a previous step, if it is up to date"""
+    try:
+        with open(cache_file, encoding="utf-8") as file:
+            content: dict = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if content.get("key") != list(key):
+        return None
+    table: pd.DataFrame = pd.DataFrame(
+        content["data"],
+        columns=content["columns"],
+        index=pd.Index(content["index"], name=ACM_KEY, dtype=object),
+        dtype=object,
+    )
+    ## The empty cells are NaN, as read_excel gives them
+    table.index = table.index.fillna(np.nan)
+    return table.fillna(np.nan)
+
+
+def load_acm_report(file_path: str, cache_dir: Optional[str] = None) -> pd.DataFrame:
+    """Return the normalized ACM report indexed by id cuenta (every value as str).
+    The workbook is parsed once: the table is kept for the session and, with a
+    cache_dir, saved there to be reused by the next steps while the report is
+    not modified"""
+    track_read(file_path)
+    key: tuple = (
+        os.path.abspath(file_path),
+        os.path.getmtime(file_path),
+        os.path.getsize(file_path),
+    )
+    if key not in _cache:
+        cache_file: Optional[str] = (
+            _cache_file(cache_dir, file_path) if cache_dir else None
+        )
+        table: Optional[pd.DataFrame] = (
+            _read_cache_file(cache_file, key) if cache_file else None
+        )
+        if table is None:
+            raw: pd.DataFrame = pd.read_excel(
+                file_path, sheet_name=ACM_SHEET, engine="openpyxl", dtype=str
+            )
+            table = normalize(raw)
+            if cache_file:
+                try:
+                    _write_cache_file(cache_file, key, table)
+                except OSError as e:
+                    print(f"Warning: the parsed ACM report could not be saved: {e}")
+        _cache[key] = table
+    return _cache[key]
+
+
+def acm_columns(
+    file_path: str, columns: list[str], cache_dir: Optional[str] = None
+) -> pd.DataFrame:
+    """Return id cuenta as the first column followed by the columns given,
+    ready to merge with the propuesta de pago. Only the columns given are
+    required in the report"""
+    acm_report: pd.DataFrame = load_acm_report(file_path, cache_dir)
+    missing: list[str] = [c for c in columns if c not in acm_report.columns]
+    if missing:
+        raise ValueError(f"the ACM report has no columns: {', '.join(missing)}")
+    return acm_report[columns].reset_index()
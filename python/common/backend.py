@@ -0,0 +1,247 @@
+import os
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+from pandas.io.parsers import TextParser  # type: ignore
+from common.result_cache import track_read
+
+## Polars is optional: it reads the workbooks with a multi-threaded engine
+## (calamine, through fastexcel). The rules keep working over pandas data frames
+try:
+    import fastexcel  # type: ignore
+    import polars as pl  # type: ignore
+except ImportError:
+    pl = None
+
+PANDAS: str = "pandas"
+POLARS: str = "polars"
+
+## Frames read while shared_frames() is active, by file, sheet and version of the file
+_shared: Optional[dict[tuple, pd.DataFrame]] = None
+_shared_locks: dict[tuple, threading.Lock] = {}
+_shared_lock = threading.Lock()
+
+
+def get_backend(name: Optional[str] = None) -> str:
+    """Return the backend to use, pandas when the one requested is not installed"""
+    if name == POLARS and pl is not None:
+        return POLARS
+    return PANDAS
+
+
+def pandas_column_names(names: list) -> list[str]:
+    """Name the columns as pandas does: "Unnamed: n" for the empty headers and
+    ".n" suffixes for the repeated ones"""
+    columns: list[str] = []
+    seen: dict[str, int] = {}
+    for position, name in enumerate(names):
+        if name is None or str(name).startswith("__UNNAMED__") or name == "":
+            name = f"Unnamed: {position}"
+        name = str(name)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        columns.append(name)
+    return columns
+
+
+def _polars_header(file_path: str, sheet_name: str) -> Optional[list]:
+    """Return the raw values of the first row, None when the sheet is empty or one
+    of them is not a text (pandas keeps the numbers and dates of the header)"""
+    reader = fastexcel.read_excel(file_path)
+    first_rows = reader.load_sheet(sheet_name, header_row=None, n_rows=1).to_polars()
+    if first_rows.height == 0:
+        return None
+    first_row: tuple = first_rows.row(0)
+    if not all(value is None or isinstance(value, str) for value in first_row):
+        return None
+    return list(first_row)
+
+
+def _text_columns(columns: list) -> pd.DataFrame:
+    """Convert the text columns with the parser of pandas.read_excel, it infers
+    the numbers and booleans written as text and takes "", "N/A", "NULL", ... as
+    NaN"""
+    values: list[list] = [
+        ["" if value is None else value for value in column.to_list()]
+        for column in columns
+    ]
+    parser = TextParser(
+        list(zip(*values)),
+        header=None,
+        skip_blank_lines=False,
+        thousands=None,
+        decimal=".",
+    )
+    return parser.read()
+
+
+def _polars_column(column) -> Optional[pd.Series]:
+    """Convert a polars column (not text) into the values pandas reads with
+    openpyxl, None when its type has no conversion"""
+    dtype = column.dtype
+    null: np.ndarray = column.is_null().to_numpy()
+    if dtype == pl.Boolean:
+        ## With empty cells pandas keeps True/False as 1.0/0.0
+        if null.any():
+            return pd.Series(column.cast(pl.Float64).to_numpy(), dtype="float64")
+        return pd.Series(column.to_numpy(), dtype=bool)
+    if dtype.is_numeric():
+        values: np.ndarray = column.cast(pl.Float64).to_numpy()
+        ## Excel keeps every number as float, openpyxl returns the integer ones as int
+        if not null.any() and np.all(np.mod(values, 1) == 0):
+            return pd.Series(values.astype("int64"))
+        return pd.Series(values, dtype="float64")
+    if dtype in (pl.Date, pl.Datetime):
+        dates: pd.Series = pd.Series(
+            column.cast(pl.Datetime("us")).to_numpy()
+        ).astype("datetime64[ns]")
+        ## Cells with only a time are before 1900, openpyxl returns datetime.time
+        if (dates[~null] < pd.Timestamp(1900, 1, 1)).all():
+            times: pd.Series = pd.Series(dates.dt.time, dtype=object)
+            return times.where(~null, np.nan)
+        return dates
+    return None
+
+
+def _read_with_polars(file_path: str, sheet_name: str) -> Optional[pd.DataFrame]:
+    """Read the sheet with polars and return it with the values and types pandas
+    reads with openpyxl: integer numbers without empty cells as int64, dates as
+    datetime64[ns], times as datetime.time and empty cells as NaN in every
+    column. Returns None when the sheet can not be converted exactly, a column
+    mixing numbers, texts or dates (pandas keeps the type of each cell) or a
+    header that is not text, pandas reads it then"""
+    header: Optional[list] = _polars_header(file_path, sheet_name)
+    if header is None:
+        return None
+    try:
+        frame = pl.read_excel(
+            file_path,
+            sheet_name=sheet_name,
+            engine="calamine",
+            infer_schema_length=None,
+            drop_empty_rows=False,
+            drop_empty_cols=False,
+            read_options={"dtype_coercion": "strict"},
+        )
+    except fastexcel.UnsupportedColumnTypeCombinationError:
+        return None
+
+    ## openpyxl does not return the empty rows at the end of the sheet
+    with_data: np.ndarray = np.flatnonzero(
+        ~np.all([column.is_null().to_numpy() for column in frame.get_columns()], axis=0)
+    )
+    last_row: int = int(with_data[-1]) + 1 if len(with_data) else 0
+
+    columns: list[Optional[pd.Series]] = []
+    text: list[int] = []
+    for position, column in enumerate(frame.get_columns()):
+        column = column.head(last_row)
+        if column.dtype in (pl.String, pl.Null):
+            text.append(position)
+            columns.append(None)
+            continue
+        converted: Optional[pd.Series] = _polars_column(column)
+        if converted is None:
+            return None
+        columns.append(converted)
+    if text and last_row:
+        parsed: pd.DataFrame = _text_columns(
+            [frame.to_series(position).head(last_row) for position in text]
+        )
+        for number, position in enumerate(text):
+            columns[position] = parsed.iloc[:, number]
+    elif text:
+        for position in text:
+            columns[position] = pd.Series(dtype=object)
+    data_frame: pd.DataFrame = pd.concat(columns, axis=1, ignore_index=True)
+    data_frame.columns = pandas_column_names(
+        header + [None] * (frame.width - len(header))
+    )
+    return data_frame
+
+
+def compare_with_pandas(file_path: str, sheet_name: str) -> list[str]:
+    """Read a sheet with both backends and return the differences found (empty
+    when polars returns the same frame as pandas or leaves the sheet to it)"""
+    expected: pd.DataFrame = pd.read_excel(
+        file_path, sheet_name=sheet_name, engine="openpyxl"
+    )
+    found: Optional[pd.DataFrame] = _read_with_polars(file_path, sheet_name)
+    if found is None:
+        return []
+    if list(found.columns) != list(expected.columns):
+        return [f"columns: {list(found.columns)} != {list(expected.columns)}"]
+    if len(found) != len(expected):
+        return [f"rows: {len(found)} != {len(expected)}"]
+    differences: list[str] = []
+    for name in expected.columns:
+        if found[name].dtype != expected[name].dtype:
+            differences.append(
+                f"{name}: dtype {found[name].dtype} != {expected[name].dtype}"
+            )
+        elif not found[name].equals(expected[name]):
+            differences.append(f"{name}: values differ")
+    return differences
+
+
+@contextmanager
+def shared_frames() -> Iterator[None]:
+    """Share the sheets read between the steps of a process: each sheet is read
+    once and every read_excel call gets its own copy of the frame"""
+    global _shared
+    _shared = {}
+    try:
+        yield
+    finally:
+        _shared = None
+        _shared_locks.clear()
+
+
+def _read_sheet(
+    file_path: str, sheet_name: str, backend: str = PANDAS, **kwargs
+) -> pd.DataFrame:
+    if backend == POLARS and pl is not None and not kwargs:
+        data_frame: Optional[pd.DataFrame] = _read_with_polars(file_path, sheet_name)
+        if data_frame is not None:
+            return data_frame
+    return pd.read_excel(file_path, sheet_name=sheet_name, engine="openpyxl", **kwargs)
+
+
+def read_excel(
+    file_path: str, sheet_name: str, backend: str = PANDAS, **kwargs
+) -> pd.DataFrame:
+    """Read a sheet into a pandas data frame with the backend given. The reads
+    with extra options (dtype, usecols, ...) always use pandas"""
+    track_read(file_path)
+    shared = _shared
+    if shared is None or kwargs:
+        return _read_sheet(file_path, sheet_name, backend, **kwargs)
+
+    stat = os.stat(file_path)
+    key: tuple = (
+        os.path.abspath(file_path),
+        sheet_name,
+        backend,
+        stat.st_mtime_ns,
+        stat.st_size,
+    )
+    ## One lock per sheet, the steps running at the same time wait for the first read
+    with _shared_lock:
+        lock: threading.Lock = _shared_locks.setdefault(key, threading.Lock())
+    with lock:
+        if key not in shared:
+            shared[key] = _read_sheet(file_path, sheet_name, backend)
+    return shared[key].copy()
+
+
+if __name__ == "__main__":
+    ## python -m common.backend <file> <sheet>: check the polars reader on a sheet
+    import sys
+
+    differences: list[str] = compare_with_pandas(sys.argv[1], sys.argv[2])
+    print("\n".join(differences) or "SUCCESS: polars returns the same frame as pandas")
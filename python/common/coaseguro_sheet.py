@@ -0,0 +1,45 @@
+from typing import Optional
+import pandas as pd  # type: ignore
+from common.sql_engine import SqlEngine
+
+## Columns with data of the COASEGURO sheet of the exception files, the first
+## one is the poliza number
+COASEGURO_SHEET: str = "COASEGURO"
+COASEGURO_COLUMNS: int = 6
+
+
+def merge_coaseguro(
+    data_frame: pd.DataFrame,
+    coaseguro_df: pd.DataFrame,
+    poliza_idx: int = 6,
+    suffixes: tuple[str, str] = ("_PAGOS", "_COASEGURO"),
+    engine: Optional[SqlEngine] = None,
+) -> pd.DataFrame:
+    """Left join of a base with the COASEGURO sheet by the poliza number (column
+    poliza_idx of the base, the first one of the sheet). The columns of the sheet
+    are added after the ones of the base, so the base keeps its positions. The
+    rows keep the index of the base (their coordinates) when each poliza is
+    once in the sheet. With an engine the join runs into it"""
+    coaseguro_df = coaseguro_df.iloc[:, :COASEGURO_COLUMNS]
+    if engine is not None:
+        merged_df: pd.DataFrame = engine.left_join(
+            data_frame, coaseguro_df, poliza_idx, 0, suffixes
+        )
+    else:
+        merged_df = data_frame.merge(
+            coaseguro_df,
+            how="left",
+            left_on=data_frame.columns[poliza_idx],
+            right_on=coaseguro_df.columns[0],
+            suffixes=suffixes,
+        )
+    if len(merged_df) == len(data_frame):
+        merged_df.index = data_frame.index
+    return merged_df
+
+
+def equal_as_text(data_frame: pd.DataFrame, column1: int, column2: int) -> pd.Series:
+    """The two columns have the same value once converted to text"""
+    return data_frame.iloc[:, column1].astype(str) == data_frame.iloc[
+        :, column2
+    ].astype(str)
@@ -0,0 +1,77 @@
+from typing import NamedTuple
+import pandas as pd  # type: ignore
+from common.session_cache import ColumnCache
+
+## Formats found in the bases, tried in order before the generic parser
+KNOWN_FORMATS: tuple[str, ...] = (
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d",
+    "%d/%m/%Y",
+)
+
+MONTHS: dict[int, str] = {
+    1: "ENERO",
+    2: "FEBRERO",
+    3: "MARZO",
+    4: "ABRIL",
+    5: "MAYO",
+    6: "JUNIO",
+    7: "JULIO",
+    8: "AGOSTO",
+    9: "SEPTIEMBRE",
+    10: "OCTUBRE",
+    11: "NOVIEMBRE",
+    12: "DICIEMBRE",
+}
+
+
+class ParsedDates(NamedTuple):
+    """Date column parsed once: datetime64 values plus the validity mask"""
+
+    values: pd.Series
+    is_valid: pd.Series
+
+    def month_names(self) -> pd.Series:
+        """Return the month name in spanish for each date (NaN when invalid)"""
+        return self.values.dt.month.map(MONTHS)
+
+
+def parse_dates(column: pd.Series) -> ParsedDates:
+    """Parse a column into datetime64 using the known formats first and
+    the generic parser only for the values that are still pending"""
+    if pd.api.types.is_datetime64_any_dtype(column):
+        values = column.astype("datetime64[ns]")
+        return ParsedDates(values, values.notna())
+
+    values = pd.Series(pd.NaT, index=column.index, dtype="datetime64[ns]")
+    pending: pd.Series = column.notna()
+    for date_format in KNOWN_FORMATS:
+        if not pending.any():
+            break
+        parsed = pd.to_datetime(column[pending], format=date_format, errors="coerce")
+        values.loc[parsed.index] = parsed
+        pending &= values.isna()
+
+    ## Fallback for the few values with a format not listed above
+    if pending.any():
+        values.loc[pending] = pd.to_datetime(
+            column[pending].astype(str), format="mixed", errors="coerce"
+        )
+    return ParsedDates(values, values.notna())
+
+
+## Parsed columns of the current session
+_cache: ColumnCache[ParsedDates] = ColumnCache(parse_dates)
+
+
+def cached_dates(
+    file_path: str, sheet_name: str, col_idx: int, column: pd.Series
+) -> ParsedDates:
+    """Return the parsed column from the session cache, parsing it on the first call
+    or when the column has other rows (index) than the cached one"""
+    return _cache.get(file_path, sheet_name, col_idx, column)
+
+
+def clear_cache() -> None:
+    """Drop every parsed column of the session"""
+    _cache.clear()
@@ -0,0 +1,50 @@
+from typing import Optional
+import pandas as pd  # type: ignore
+from common.params import split_param
+
+## Column with the code of the rule (the inconsistencies sheet) in compact mode
+RULE_COLUMN: str = "REGLA"
+
+
+def compact_keys(
+    sheet_name: str, compact_rows: Optional[str] = None
+) -> Optional[list[int]]:
+    """compact_rows lists the rules (their inconsistencies sheet) saved in compact
+    mode separated by "¶", each one with the positions of its key columns after
+    ":" separated by ",", e.g. "FormatoNumeroRadicado:0,2¶LongitudValor:0,2,12".
+    Return the key positions of the sheet, None when its rows are saved whole"""
+    for item in split_param(compact_rows):
+        name, _, keys = item.partition(":")
+        if name.strip() == sheet_name:
+            return [int(col) for col in keys.split(",") if col.strip()]
+    return None
+
+
+def project(
+    df: pd.DataFrame,
+    col_idx,
+    sheet_name: str,
+    compact_rows: Optional[str] = None,
+) -> pd.DataFrame:
+    """Keep the columns of the inconsistencies to save. The rows are saved whole
+    unless the rule is in compact_rows, then only its key columns, the columns
+    validated by the rule (col_idx), the coordinates and the code of the rule
+    are kept. df must hold rows of the base, the positions point to its columns"""
+    keys: Optional[list[int]] = compact_keys(sheet_name, compact_rows)
+    if keys is None:
+        return df
+    validated: list[int] = [col_idx] if isinstance(col_idx, int) else list(col_idx)
+    positions: list[int] = list(
+        dict.fromkeys(
+            position for position in keys + validated if 0 <= position < df.shape[1]
+        )
+    )
+    coordinates: list[str] = [
+        name for name in df.columns if str(name).startswith("COORDENADAS")
+    ]
+
+    compact: pd.DataFrame = df.iloc[:, positions].copy()
+    for name in coordinates:
+        compact[name] = df[name]
+    compact[RULE_COLUMN] = sheet_name
+    return compact
@@ -0,0 +1,60 @@
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+
+## Scale of the fixed point values
+CENTS: int = 100
+BASIS_POINTS: int = 10_000
+## Percentages multiplied by money keep 8 decimals (0.33333333), rounding them to
+## basis points first moves the product by pesos
+RATE_SCALE: int = 100_000_000
+
+## Default tolerances, one unit of the smallest scale
+MONEY_TOLERANCE: int = 1  # cents
+PERCENTAGE_TOLERANCE: int = 1  # basis points
+
+
+def _to_fixed_point(column: pd.Series, scale: int) -> pd.Series:
+    """Convert a column into nullable integers using the scale given"""
+    values: pd.Series = pd.to_numeric(column, errors="coerce").astype(float)
+    return pd.Series(np.rint(values * scale), index=column.index).astype("Int64")
+
+
+def to_cents(column: pd.Series) -> pd.Series:
+    """Convert a money column into integer cents (values that are not numbers are NA)"""
+    return _to_fixed_point(column, CENTS)
+
+
+def to_basis_points(column: pd.Series) -> pd.Series:
+    """Convert a percentage column (1 = 100%) into integer basis points"""
+    return _to_fixed_point(column, BASIS_POINTS)
+
+
+def to_rate(column: pd.Series) -> pd.Series:
+    """Convert a percentage column (1 = 100%) into integers with 8 decimals, the
+    precision used to multiply it by money"""
+    return _to_fixed_point(column, RATE_SCALE)
+
+
+def to_pesos(cents: pd.Series) -> pd.Series:
+    """Convert integer cents back to money values to show them in the files"""
+    return cents.astype(float) / CENTS
+
+
+def apply_percentage(cents: pd.Series, rate: pd.Series) -> pd.Series:
+    """Multiply a money column by a percentage column (to_rate), only the product
+    is rounded to cents, half away from zero.
+    The rate is split in two halves of 4 digits so the partial products fit in
+    int64 (cents * rate would overflow from 920 million pesos)"""
+    half: int = 10_000
+    money: pd.Series = cents.abs()
+    high, low = rate.abs() // half, rate.abs() % half
+    ## cents * rate = (money * high) * half + money * low
+    upper: pd.Series = money * high
+    remainder: pd.Series = (upper % half) * half + money * low
+    quotient: pd.Series = upper // half + (remainder + RATE_SCALE // 2) // RATE_SCALE
+    return quotient.where((cents >= 0) == (rate >= 0), -quotient)
+
+
+def equal_within(left: pd.Series, right: pd.Series, tolerance: int) -> pd.Series:
+    """Compare two fixed point columns, a missing value is never equal"""
+    return ((left - right).abs() <= tolerance).fillna(False).astype(bool)
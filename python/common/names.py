@@ -0,0 +1,79 @@
+import re
+import pandas as pd  # type: ignore
+
+## rapidfuzz is optional: it scores the pairs of names in C, indel_similarity (the
+## same score in python) is used when it is not installed
+try:
+    from rapidfuzz.distance import Indel  # type: ignore
+    from rapidfuzz.process import cpdist  # type: ignore
+except ImportError:
+    cpdist = None
+
+## Legal forms at the end of the names, once the dots are removed ("S.A.S." is "SAS")
+LEGAL_SUFFIXES: re.Pattern = re.compile(
+    r"(?:\s(?:S\s?A\s?S|S\s?A|LTDA|LIMITADA|E\s?U|S\s?EN\s?C|E\s?S\s?P))+$"
+)
+
+## Similarity from which two names are taken as the same one
+DEFAULT_THRESHOLD: float = 0.9
+
+
+def normalize_names(names: pd.Series) -> pd.Series:
+    """Uppercase the names and remove the accents, the punctuation, the extra
+    spaces and the legal forms (S.A., SAS, LTDA, ...) and sort their words.
+    Each distinct name is normalized once. Empty cells become \"\""""
+    codes, uniques = pd.factorize(names.fillna("").astype(str))
+    text: pd.Series = pd.Series(uniques, dtype=object).str.upper()
+    text = text.str.normalize("NFKD").str.encode("ascii", "ignore").str.decode("ascii")
+    text = text.str.replace(r"[.,]", "", regex=True)
+    text = text.str.replace(r"[^A-Z0-9]+", " ", regex=True).str.strip()
+    text = text.str.replace(LEGAL_SUFFIXES, "", regex=True)
+    ## The order of the words does not count
+    text = text.str.split().map(lambda tokens: " ".join(sorted(tokens)))
+    return pd.Series(text.to_numpy()[codes], index=names.index)
+
+
+def indel_similarity(a: str, b: str) -> float:
+    """Indel normalized similarity, 2 * LCS / (len(a) + len(b)), the score of
+    rapidfuzz. The length of the longest common subsequence is computed with the
+    bit-parallel algorithm of Hyyrö, one integer operation per character of b"""
+    if not a and not b:
+        return 1.0
+    masks: dict[str, int] = {}
+    for position, char in enumerate(a):
+        masks[char] = masks.get(char, 0) | (1 << position)
+    row: int = 0
+    for char in b:
+        matches: int = masks.get(char, 0) | row
+        row = matches & ((matches - ((row << 1) | 1)) ^ matches)
+    return 2 * bin(row).count("1") / (len(a) + len(b))
+
+
+def name_similarity(left: pd.Series, right: pd.Series) -> pd.Series:
+    """Similarity (0 to 1) of each pair of normalized names with the same index.
+    The pairs are already blocked (the names of the same poliza), each distinct
+    pair is scored once and the equal ones are not scored. The empty names do not
+    match any name"""
+    pairs: pd.DataFrame = pd.DataFrame({"left": left, "right": right})
+    unique: pd.DataFrame = pairs.drop_duplicates()
+    pending: pd.DataFrame = unique[unique["left"] != unique["right"]]
+
+    scores: dict[tuple[str, str], float] = {}
+    if cpdist is not None and not pending.empty:
+        values = cpdist(
+            pending["left"].to_list(),
+            pending["right"].to_list(),
+            scorer=Indel.normalized_similarity,
+        )
+    else:
+        values = [
+            indel_similarity(a, b)
+            for a, b in zip(pending["left"], pending["right"])
+        ]
+    scores.update(zip(zip(pending["left"], pending["right"]), map(float, values)))
+
+    similarity: pd.Series = pd.Series(
+        [scores.get(pair, 1.0) for pair in zip(pairs["left"], pairs["right"])],
+        index=pairs.index,
+    )
+    return similarity.where((pairs["left"] != "") & (pairs["right"] != ""), 0.0)
@@ -0,0 +1,9 @@
+from typing import Optional
+
+## Separator between the items of a param with several values, the same used by the macros
+LIST_SEPARATOR: str = "¶"
+
+
+def split_param(value: Optional[str], separator: str = LIST_SEPARATOR) -> list[str]:
+    """Split a param with several values, an empty param returns [""]"""
+    return [item.strip() for item in str(value or "").split(separator)]
@@ -0,0 +1,39 @@
+from typing import Callable, Optional
+import pandas as pd  # type: ignore
+from common.workers import run_processes
+
+
+def split_partitions(data_frame: pd.DataFrame, partition_by: str) -> list[pd.DataFrame]:
+    """Split the data frame by the values of a column (RAMO), keeping the index
+    of each row, the empty values make their own partition"""
+    return [
+        partition
+        for _, partition in data_frame.groupby(partition_by, sort=False, dropna=False)
+    ]
+
+
+def run_partitioned(
+    data_frame: pd.DataFrame,
+    partition_by: str,
+    rule: Callable[..., pd.Series],
+    col_idxs: list[int],
+    args: tuple = (),
+    workers: Optional[int] = None,
+) -> pd.Series:
+    """Evaluate a partition-safe rule (a module level function from common.rules)
+    over each partition in the pool of processes of the bot. The rule receives
+    the positions of the columns it reads first: each job only gets those
+    columns and the rule is called with their positions in the job frame.
+    The partitions keep the original index, so the mask returned is in the
+    original order and the coordinates of the inconsistencies point to the rows
+    of the excel file"""
+    partitions: list[pd.DataFrame] = split_partitions(data_frame, partition_by)
+    if len(partitions) < 2:
+        return rule(data_frame, *col_idxs, *args)
+
+    positions: tuple = tuple(range(len(col_idxs)))
+    jobs: list[tuple] = [
+        (partition.iloc[:, col_idxs], *positions, *args) for partition in partitions
+    ]
+    masks: list[pd.Series] = run_processes(rule, jobs, workers)
+    return pd.concat(masks).reindex(data_frame.index)
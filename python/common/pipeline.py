@@ -0,0 +1,298 @@
+import hashlib
+import importlib.util
+import json
+import os
+import shutil
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from types import ModuleType
+from typing import Any, Optional
+from common.backend import shared_frames
+from common.result_cache import file_hash, is_failure
+
+## Folder with the bot scripts (01_reparto, 02_pagos, ...)
+SCRIPTS_DIR: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+## Result of the stages taken from the cache and of the ones after a failure
+CACHED: str = "CACHED"
+SKIPPED: str = "SKIPPED"
+
+
+class Stage:
+    """Step of a pipeline: a function of a bot script (path relative to the
+    scripts folder) called with the arguments given. The texts of the arguments,
+    inputs and outputs can use "{name}" to take the params of the run. inputs are
+    the files read that are not written by another stage and outputs the files
+    written by the stage"""
+
+    def __init__(
+        self,
+        name: str,
+        script: str,
+        function: str = "main",
+        args: tuple = (),
+        depends_on: tuple[str, ...] = (),
+        inputs: tuple[str, ...] = (),
+        outputs: tuple[str, ...] = (),
+    ):
+        self.name = name
+        self.script = script
+        self.function = function
+        self.args = args
+        self.depends_on = depends_on
+        self.inputs = inputs
+        self.outputs = outputs
+
+
+def resolve(value: Any, params: dict) -> Any:
+    """Replace the "{name}" of the texts (also inside dicts, lists and tuples)
+    with the params of the run"""
+    if isinstance(value, str):
+        try:
+            return value.format_map(params)
+        except KeyError as e:
+            raise ValueError(f"the param {e} is missing") from None
+    if isinstance(value, dict):
+        return {key: resolve(item, params) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(resolve(item, params) for item in value)
+    return value
+
+
+def load_script(script: str) -> ModuleType:
+    """Load a bot script as a new module, the stages of a run share its globals"""
+    name: str = "pipeline_" + os.path.splitext(script)[0].replace("/", "_")
+    spec = importlib.util.spec_from_file_location(
+        name, os.path.join(SCRIPTS_DIR, script)
+    )
+    module: ModuleType = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def restore_outputs(
+    name: str, resolved: dict, dirty: set[str], written: dict, snapshot_dir: str
+) -> None:
+    """Restore the outputs of a stage to their state before it in the last run,
+    when the previous writer of the output was taken from the cache (its changes
+    are kept and the ones of this stage removed), then keep the new snapshot.
+    The outputs changed outside the pipeline since the last run are not restored"""
+    os.makedirs(snapshot_dir, exist_ok=True)
+    for n, output in enumerate(resolved["outputs"]):
+        snapshot: str = os.path.join(
+            snapshot_dir, f"{name}.{n}{os.path.splitext(output)[1]}"
+        )
+        if (
+            os.path.exists(snapshot)
+            and resolved["previous"].get(output) not in dirty
+            and written.get(output) == file_hash(output)
+        ):
+            shutil.copyfile(snapshot, output)
+        if os.path.exists(output):
+            shutil.copyfile(output, snapshot)
+        elif os.path.exists(snapshot):
+            os.remove(snapshot)
+
+
+class Pipeline:
+    """Stages of a bot process run as a DAG. The stages without pending
+    dependencies run at the same time and the sheets read are shared between
+    them. Each stage is cached by a hash of its script, arguments, input files
+    and the hashes of its dependencies, so a rerun only executes the stages
+    whose inputs changed and the stages downstream of them.
+
+    The stages writing the same output file run one after another in the order
+    given and depend on the previous writer: before a writer runs, the output is
+    kept in a snapshot, which is restored when the stage has to run again"""
+
+    def __init__(self, name: str, stages: list[Stage]):
+        self.name = name
+        self.stages: dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Stage repeated: {stage.name}")
+            self.stages[stage.name] = stage
+        for stage in stages:
+            for dependency in stage.depends_on:
+                if dependency not in self.stages:
+                    raise ValueError(
+                        f"Unknown dependency of {stage.name}: {dependency}"
+                    )
+
+    def plan(self, params: dict) -> tuple[list[str], dict[str, set], dict[str, dict]]:
+        """Return the stages in topological order, the dependencies of each one
+        (also the previous writer of its outputs) and the resolved arguments,
+        inputs, outputs and previous writer of each output"""
+        resolved: dict[str, dict] = {}
+        dependencies: dict[str, set] = {}
+        last_writer: dict[str, str] = {}
+        for name, stage in self.stages.items():
+            resolved[name] = {
+                "args": resolve(stage.args, params),
+                "inputs": [os.path.abspath(f) for f in resolve(stage.inputs, params)],
+                "outputs": [os.path.abspath(f) for f in resolve(stage.outputs, params)],
+                "previous": {},
+            }
+            dependencies[name] = set(stage.depends_on)
+            for output in resolved[name]["outputs"]:
+                if output in last_writer:
+                    dependencies[name].add(last_writer[output])
+                    resolved[name]["previous"][output] = last_writer[output]
+                last_writer[output] = name
+
+        order: list[str] = []
+        pending: dict[str, set] = {
+            name: set(deps) for name, deps in dependencies.items()
+        }
+        while pending:
+            ready: list[str] = [name for name, deps in pending.items() if not deps]
+            if not ready:
+                raise ValueError(f"Cycle between the stages: {', '.join(pending)}")
+            for name in ready:
+                order.append(name)
+                del pending[name]
+            for deps in pending.values():
+                deps.difference_update(ready)
+        return order, dependencies, resolved
+
+    def run(
+        self,
+        params: dict,
+        cache_file: Optional[str] = None,
+        workers: Optional[int] = None,
+        force: bool = False,
+    ) -> dict[str, Any]:
+        """Run the pipeline and return the result of each stage. The stages whose
+        dependencies failed are reported as "SKIPPED\""""
+        order, dependencies, resolved = self.plan(params)
+        ## Key and result of each stage and hash of the outputs after the last run
+        cache: dict = {"stages": {}, "outputs": {}}
+        if cache_file and os.path.exists(cache_file) and not force:
+            with open(cache_file, encoding="utf-8") as file:
+                cache = json.load(file)
+        snapshot_dir: Optional[str] = None
+        if cache_file:
+            snapshot_dir = os.path.join(
+                os.path.dirname(os.path.abspath(cache_file)), f"{self.name}_snapshots"
+            )
+
+        ## Hash of each stage, it changes when the stage or anything upstream changes
+        keys: dict[str, str] = {}
+        for name in order:
+            stage: Stage = self.stages[name]
+            content: dict = {
+                "script": stage.script,
+                "function": stage.function,
+                "args": resolved[name]["args"],
+                "inputs": {f: file_hash(f) for f in resolved[name]["inputs"]},
+                "outputs": resolved[name]["outputs"],
+                "depends_on": sorted(keys[dep] for dep in dependencies[name]),
+            }
+            keys[name] = hashlib.sha256(
+                json.dumps(content, sort_keys=True, default=str).encode()
+            ).hexdigest()
+
+        ## The stages without outputs keep their work in memory (the main of the
+        ## scripts): they run again when a stage downstream has to run
+        dirty: set[str] = set()
+        for name in order:
+            entry: dict = cache["stages"].get(name, {})
+            outputs: list[str] = resolved[name]["outputs"]
+            if entry.get("key") != keys[name] or not all(map(os.path.exists, outputs)):
+                dirty.add(name)
+        for name in reversed(order):
+            if name in dirty:
+                dirty.update(
+                    dependency
+                    for dependency in dependencies[name]
+                    if not resolved[dependency]["outputs"]
+                )
+
+        results: dict[str, Any] = {}
+        failed: set[str] = set()
+        modules: dict[str, ModuleType] = {}
+        modules_lock = threading.Lock()
+
+        def module_for(script: str) -> ModuleType:
+            with modules_lock:
+                if script not in modules:
+                    modules[script] = load_script(script)
+                return modules[script]
+
+        def execute(name: str) -> Any:
+            stage: Stage = self.stages[name]
+            if snapshot_dir:
+                restore_outputs(
+                    name, resolved[name], dirty, cache["outputs"], snapshot_dir
+                )
+            function = getattr(module_for(stage.script), stage.function)
+            return function(*resolved[name]["args"])
+
+        with shared_frames(), ThreadPoolExecutor(max_workers=workers) as executor:
+            running: dict[Future, str] = {}
+            waiting: list[str] = list(order)
+            while waiting or running:
+                for name in list(waiting):
+                    if dependencies[name] & failed:
+                        results[name] = SKIPPED
+                        failed.add(name)
+                        waiting.remove(name)
+                    elif not dependencies[name] - set(results):
+                        waiting.remove(name)
+                        if name in dirty:
+                            running[executor.submit(execute, name)] = name
+                        else:
+                            results[name] = CACHED
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        result: Any = future.result()
+                    except Exception as e:
+                        result = f"ERROR: {e}"
+                    results[name] = result
+                    if is_failure(result):
+                        failed.add(name)
+                        cache["stages"].pop(name, None)
+                    else:
+                        cache["stages"][name] = {
+                            "key": keys[name],
+                            "result": str(result),
+                        }
+                    for output in resolved[name]["outputs"]:
+                        cache["outputs"][output] = file_hash(output)
+                    if cache_file:
+                        with open(cache_file, "w", encoding="utf-8") as file:
+                            json.dump(cache, file, indent=2)
+        return results
+
+
+def summary(results: dict[str, Any]) -> tuple[bool, str]:
+    """Return the result of a run as the bots expect: (True, "SUCCESS: ...") or
+    (False, "ERROR: ...") with the stages that failed"""
+    failures: list[str] = [
+        f"{name}: {result}" for name, result in results.items() if is_failure(result)
+    ]
+    failures += [name for name, result in results.items() if result == SKIPPED]
+    cached: int = sum(1 for result in results.values() if result == CACHED)
+    if failures:
+        return False, f"ERROR: {'; '.join(failures)}"
+    return True, (
+        f"SUCCESS: {len(results) - cached} stages executed, {cached} taken from cache"
+    )
+
+
+def run_pipeline(pipeline: Pipeline, params: dict) -> tuple[bool, str]:
+    """Run a pipeline with the params of the bot: cache_file (optional) keeps the
+    hashes of the stages, workers limits the stages running at the same time and
+    force ("true") runs every stage again"""
+    workers = params.get("workers")
+    results: dict[str, Any] = pipeline.run(
+        params,
+        cache_file=params.get("cache_file"),
+        workers=int(workers) if workers else None,
+        force=str(params.get("force")).lower() == "true",
+    )
+    return summary(results)
@@ -0,0 +1,162 @@
+import functools
+import glob
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import threading
+from typing import Any, Callable, Optional
+import pandas as pd  # type: ignore
+
+## Shared modules, a change in any of them invalidates every result
+COMMON_DIR: str = os.path.dirname(os.path.abspath(__file__))
+
+## Hashes of the files by path, modification time and size
+_file_hashes: dict[tuple, str] = {}
+
+## Files read and sheets saved by the rules being recorded in each thread
+_recording = threading.local()
+
+
+def file_hash(file_path: str) -> str:
+    """Hash of the content of a file, computed once per version of the file"""
+    if not os.path.exists(file_path):
+        return ""
+    stat = os.stat(file_path)
+    key: tuple = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+    if key not in _file_hashes:
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as file:
+            for block in iter(lambda: file.read(1024 * 1024), b""):
+                digest.update(block)
+        _file_hashes[key] = digest.hexdigest()
+    return _file_hashes[key]
+
+
+def is_failure(result: Any) -> bool:
+    """The scripts return False, (False, message) or "ERROR: ..." when they fail"""
+    if isinstance(result, tuple):
+        return not result[0]
+    if isinstance(result, str):
+        return result.strip().upper().startswith("ERROR")
+    return result is False
+
+
+def _records() -> list[dict]:
+    return getattr(_recording, "records", [])
+
+
+def track_read(file_path: str) -> None:
+    """Register a workbook read by the rules being recorded (no-op otherwise)"""
+    for record in _records():
+        record["files"].add(os.path.abspath(file_path))
+
+
+def track_save(df: pd.DataFrame, new_sheet: str) -> None:
+    """Register the inconsistencies saved by the rules being recorded, before
+    they are appended to the existing sheet"""
+    for record in _records():
+        record["saves"].append((new_sheet, df.copy()))
+
+
+def code_hash(function: Callable) -> str:
+    """Hash of the script of the function and of the shared modules"""
+    files: list[str] = [inspect.getsourcefile(function)]
+    files += sorted(glob.glob(os.path.join(COMMON_DIR, "*.py")))
+    return hashlib.sha256("".join(map(file_hash, files)).encode()).hexdigest()
+
+
+class ResultCache:
+    """Results of the rules saved in a folder by a hash of the rule, its
+    arguments, the settings of the validation object and the code. Each entry
+    keeps the hash of every workbook the rule read, the result and the
+    inconsistencies saved, which are saved again when the entry is replayed.
+    A rule runs again only when one of the workbooks it read changed"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, function: Callable, owner: Any, args: tuple, kwargs: dict) -> str:
+        settings: dict = {
+            name: value
+            for name, value in vars(owner).items()
+            if isinstance(value, (str, int, float, bool, type(None)))
+        }
+        content: dict = {
+            "rule": [inspect.getsourcefile(function), function.__qualname__],
+            "code": code_hash(function),
+            "settings": settings,
+            "args": args,
+            "kwargs": kwargs,
+        }
+        return hashlib.sha256(
+            json.dumps(content, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+    def load(self, key: str) -> Optional[dict]:
+        """Return the entry when every workbook read still has the same content"""
+        entry_file: str = os.path.join(self.directory, f"{key}.pkl")
+        try:
+            with open(entry_file, "rb") as file:
+                entry: dict = pickle.load(file)
+        except (OSError, pickle.PickleError, EOFError):
+            return None
+        for file_path, content_hash in entry["files"].items():
+            if file_hash(file_path) != content_hash:
+                return None
+        return entry
+
+    def store(self, key: str, entry: dict) -> None:
+        entry_file: str = os.path.join(self.directory, f"{key}.pkl")
+        try:
+            with open(f"{entry_file}.tmp", "wb") as file:
+                pickle.dump(entry, file)
+            os.replace(f"{entry_file}.tmp", entry_file)
+        except OSError as e:
+            print(f"Warning: the result could not be cached: {e}")
+
+    def call(
+        self, function: Callable, owner: Any, args: tuple, kwargs: dict
+    ) -> Any:
+        """Replay the saved result of the rule or run it recording what it reads
+        and saves. The failed results are not saved"""
+        key: str = self.key(function, owner, args, kwargs)
+        entry: Optional[dict] = self.load(key)
+        if entry is not None:
+            for new_sheet, df in entry["saves"]:
+                owner.save_inconsistencies_file(df, new_sheet)
+            return entry["result"]
+
+        record: dict = {"files": set(), "saves": []}
+        _recording.records = _records() + [record]
+        try:
+            result: Any = function(*args, **kwargs)
+        finally:
+            _recording.records = [r for r in _records() if r is not record]
+        if not is_failure(result):
+            files: dict[str, str] = {f: file_hash(f) for f in record["files"]}
+            self.store(
+                key, {"files": files, "result": result, "saves": record["saves"]}
+            )
+        return result
+
+
+def cached_result(owner: Callable[[], Any]) -> Callable:
+    """Decorator for the validate_ functions of the scripts: the result is taken
+    from the result cache of the validation object returned by owner, when it
+    has one"""
+
+    def decorator(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs) -> Any:
+            instance: Any = owner()
+            cache: Optional[ResultCache] = getattr(instance, "result_cache", None)
+            if cache is None:
+                return function(*args, **kwargs)
+            return cache.call(function, instance, args, kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,109 @@
+import re
+from typing import Optional
+import pandas as pd  # type: ignore
+
+## Row rules of the validation groups: each one receives the data frame (or a
+## chunk of it) and returns the "is_valid" mask with the same index. The module
+## level functions take the positions of the columns they read right after the
+## frame, so common.partition can send them only those columns
+
+
+class FormatRule:
+    """Format rule over a column read as text. The patterns are compiled once
+    into a single pattern: the value is valid when it matches one of them
+    completely or, with forbidden=True, when none of them is found in it.
+    nullable accepts the empty cells ("nan") and remove_spaces drops the spaces
+    before matching"""
+
+    def __init__(
+        self,
+        patterns: list[str],
+        nullable: bool = False,
+        forbidden: bool = False,
+        remove_spaces: bool = False,
+        col_idx: Optional[int] = None,
+    ):
+        alternatives: list[str] = [f"(?:{pattern})" for pattern in patterns]
+        if nullable:
+            alternatives.append("(?i:nan)")
+        self.pattern = re.compile("|".join(alternatives))
+        self.forbidden = forbidden
+        self.remove_spaces = remove_spaces
+        self.col_idx = col_idx
+
+    def match(self, column: pd.Series, is_text: bool = False) -> pd.Series:
+        """Return the "is_valid" mask of a column, is_text skips the conversion of
+        the columns already read as text (common.strings)"""
+        values: pd.Series = column if is_text else column.astype(str)
+        if self.remove_spaces:
+            values = values.str.replace(" ", "", regex=False)
+        if self.forbidden:
+            return ~values.str.contains(self.pattern)
+        return values.str.fullmatch(self.pattern)
+
+    def __call__(
+        self, data_frame: pd.DataFrame, col_idx: Optional[int] = None
+    ) -> pd.Series:
+        return self.match(
+            data_frame.iloc[:, self.col_idx if col_idx is None else col_idx]
+        )
+
+
+RADICADO_FORMAT = FormatRule([r"\d{4}\s\d{2}\s\d{3}\s\d{6}"])
+PERCENTAGE_FORMAT = FormatRule(
+    [r"\d+\.\d{1,2}", r"\d{2}%;\d{2}%", "1"], remove_spaces=True
+)
+NULLABLE_PERCENTAGE_FORMAT = FormatRule(
+    [r"\d+\.\d{1,2}", r"\d{2}%;\d{2}%"], nullable=True, remove_spaces=True
+)
+## Fecha de vencimiento of DESEMPLEO: "DD/MM/YYYY;<number>"
+EXPIRATION_DATE_FORMAT = FormatRule([r"\d{2}/\d{2}/\d{4};\d{1,12}"], col_idx=97)
+NO_DOUBLE_SPACES = FormatRule([r"\s\s+"], forbidden=True)
+NO_SPACES = FormatRule([r"\s"], forbidden=True)
+NO_EXTRA_SPACES = FormatRule([r"^\s+", r"\s+$", r"\s{2,}"], forbidden=True)
+NO_SPECIAL_CHARACTERS = FormatRule([r"[^a-zA-Z0-9]"], forbidden=True)
+
+
+def value_length(data_frame: pd.DataFrame, col_idx: int, length: int) -> pd.Series:
+    """The value must have the length given"""
+    return data_frame.iloc[:, col_idx].astype(str).str.len() == length
+
+
+def radicado_format(data_frame: pd.DataFrame, col_idx: int) -> pd.Series:
+    """The radicado number must have the format "YYYY MM NNN NNNNNN\""""
+    return RADICADO_FORMAT(data_frame, col_idx)
+
+
+def no_white_spaces(data_frame: pd.DataFrame, col_idx: int) -> pd.Series:
+    """The value can not have two or more white spaces together"""
+    return NO_DOUBLE_SPACES(data_frame, col_idx)
+
+
+def percentage_format(
+    data_frame: pd.DataFrame, col_idx: int, can_be_null: bool
+) -> pd.Series:
+    """The percentage must be a decimal number ("0.5") or two concatenated
+    percentages ("50%;50%"), "1" when it can not be empty"""
+    if can_be_null:
+        return NULLABLE_PERCENTAGE_FORMAT(data_frame, col_idx)
+    return PERCENTAGE_FORMAT(data_frame, col_idx)
+
+
+def no_special_characters(data_frame: pd.DataFrame, col_idx: int) -> pd.Series:
+    """The value can only have letters and numbers"""
+    return NO_SPECIAL_CHARACTERS(data_frame, col_idx)
+
+
+def identification_pagos_iaxis(
+    data_frame: pd.DataFrame,
+    identification_idx: int,
+    radicado_idx: int,
+    exception_list: list[str],
+) -> pd.Series:
+    """The identification (75) can not have extra white spaces and can only be
+    empty when the radicado (2) is in the exception list"""
+    identification: pd.Series = data_frame.iloc[:, identification_idx].astype(str)
+    radicado: pd.Series = data_frame.iloc[:, radicado_idx].astype(str)
+    return NO_EXTRA_SPACES.match(identification) & (
+        (identification != "nan") | radicado.isin(exception_list)
+    )
@@ -0,0 +1,173 @@
+import os
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Optional
+from openpyxl.utils.cell import column_index_from_string  # type: ignore
+
+REL_NS: str = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+MAIN_NS: str = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+DOC_REL_NS: str = (
+    "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+)
+
+
+class SheetLayout:
+    """Layout expected for a sheet of an input: the sheet must exist, its header
+    row must have at least min_columns columns, the names of headers at their
+    positions (0-based, as used with iloc) and the names of columns anywhere"""
+
+    def __init__(
+        self,
+        sheet_name: str,
+        min_columns: int = 0,
+        headers: Optional[dict[int, str]] = None,
+        columns: tuple[str, ...] = (),
+    ):
+        self.sheet_name = sheet_name
+        self.min_columns = min_columns
+        self.headers = headers or {}
+        self.columns = columns
+
+    def needs_header(self) -> bool:
+        return bool(self.min_columns or self.headers or self.columns)
+
+
+def sheet_parts(package: zipfile.ZipFile) -> dict[str, str]:
+    """Return {sheet name: path of the worksheet part} from the workbook part"""
+    targets: dict[str, str] = {}
+    for rel in ET.fromstring(package.read("xl/_rels/workbook.xml.rels")).iter(
+        f"{REL_NS}Relationship"
+    ):
+        target: str = rel.get("Target")
+        targets[rel.get("Id")] = (
+            target.lstrip("/")
+            if target.startswith("/")
+            else posixpath.normpath(posixpath.join("xl", target))
+        )
+    return {
+        sheet.get("name"): targets[sheet.get(f"{DOC_REL_NS}id")]
+        for sheet in ET.fromstring(package.read("xl/workbook.xml")).iter(
+            f"{MAIN_NS}sheet"
+        )
+    }
+
+
+def shared_strings(package: zipfile.ZipFile, indexes: set[int]) -> dict[int, str]:
+    """Return the shared strings given, the table is read only up to the last one"""
+    strings: dict[int, str] = {}
+    if not indexes or "xl/sharedStrings.xml" not in package.namelist():
+        return strings
+    last: int = max(indexes)
+    with package.open("xl/sharedStrings.xml") as stream:
+        position: int = 0
+        for _, element in ET.iterparse(stream):
+            if element.tag != f"{MAIN_NS}si":
+                continue
+            if position in indexes:
+                ## Plain text or rich text runs, without the phonetic runs
+                texts: list[str] = [
+                    text.text or ""
+                    for child in element
+                    for text in ([child] if child.tag == f"{MAIN_NS}t" else child)
+                    if child.tag in (f"{MAIN_NS}t", f"{MAIN_NS}r")
+                    and text.tag == f"{MAIN_NS}t"
+                ]
+                strings[position] = "".join(texts)
+            element.clear()
+            if position >= last:
+                break
+            position += 1
+    return strings
+
+
+def header_row(package: zipfile.ZipFile, part: str) -> list[Optional[str]]:
+    """Return the values of the first row of a worksheet as text, parsing the
+    part only until that row ends. Empty cells are None"""
+    cells: dict[int, tuple[Optional[str], str]] = {}
+    with package.open(part) as stream:
+        for _, element in ET.iterparse(stream):
+            if element.tag != f"{MAIN_NS}row":
+                continue
+            if element.get("r", "1") == "1":
+                for position, cell in enumerate(element.iter(f"{MAIN_NS}c")):
+                    reference: Optional[str] = cell.get("r")
+                    if reference:
+                        letters: str = reference.rstrip("0123456789")
+                        position = column_index_from_string(letters) - 1
+                    cell_type: str = cell.get("t", "n")
+                    if cell_type == "inlineStr":
+                        value = "".join(
+                            text.text or "" for text in cell.iter(f"{MAIN_NS}t")
+                        )
+                    else:
+                        value = cell.findtext(f"{MAIN_NS}v")
+                    cells[position] = (value, cell_type)
+            break
+
+    strings: dict[int, str] = shared_strings(
+        package,
+        {int(value) for value, cell_type in cells.values() if cell_type == "s"},
+    )
+    header: list[Optional[str]] = [None] * (max(cells) + 1 if cells else 0)
+    for position, (value, cell_type) in cells.items():
+        header[position] = strings.get(int(value)) if cell_type == "s" else value
+    while header and header[-1] in (None, ""):
+        header.pop()
+    return header
+
+
+def check_file(file_path: str, layouts: list[SheetLayout]) -> list[str]:
+    """Validate the sheet names and header rows of a workbook, return the errors"""
+    name: str = os.path.basename(file_path)
+    if not os.path.exists(file_path):
+        return [f"{name}: the file does not exist"]
+    errors: list[str] = []
+    try:
+        with zipfile.ZipFile(file_path) as package:
+            parts: dict[str, str] = sheet_parts(package)
+            for layout in layouts:
+                if layout.sheet_name not in parts:
+                    errors.append(
+                        f"{name}: the sheet '{layout.sheet_name}' does not exist"
+                        f" (sheets: {', '.join(parts)})"
+                    )
+                    continue
+                if not layout.needs_header():
+                    continue
+                header: list[Optional[str]] = header_row(
+                    package, parts[layout.sheet_name]
+                )
+                where: str = f"{name} [{layout.sheet_name}]"
+                if len(header) < layout.min_columns:
+                    errors.append(
+                        f"{where}: {len(header)} columns,"
+                        f" at least {layout.min_columns} expected"
+                    )
+                for position, expected in layout.headers.items():
+                    found = header[position] if position < len(header) else None
+                    if found != expected:
+                        errors.append(
+                            f"{where}: column {position} is '{found}',"
+                            f" '{expected}' expected"
+                        )
+                for column in layout.columns:
+                    if column not in header:
+                        errors.append(f"{where}: the column '{column}' is missing")
+    except (zipfile.BadZipFile, KeyError) as e:
+        errors.append(f"{name}: it is not a valid xlsx workbook ({e})")
+    return errors
+
+
+def preflight(
+    checks: list[tuple[str, list[SheetLayout]]], errors: Optional[list[str]] = None
+) -> tuple[bool, str]:
+    """Validate the layout of the inputs of a process before reading them, only
+    the sheet names and the header rows are read. Return (False, "ERROR: ...")
+    with every problem found (also the errors given by the caller)"""
+    errors = list(errors or [])
+    for file_path, layouts in checks:
+        errors += check_file(file_path, layouts)
+    if errors:
+        return False, f"ERROR: {'; '.join(errors)}"
+    return True, f"SUCCESS: the layout of {len(checks)} files is valid"
@@ -0,0 +1,36 @@
+import os
+from typing import Callable, Generic, Optional, TypeVar
+import pandas as pd  # type: ignore
+
+T = TypeVar("T")
+
+
+class ColumnCache(Generic[T]):
+    """Columns of the sheets converted once per session, by (file, sheet, column,
+    modified time). A converted column is only given back for a column with the
+    same index, other rows of the sheet (a filtered frame, a chunk) are converted
+    again and replace it"""
+
+    def __init__(self, convert: Callable[[pd.Series], T]):
+        self.convert = convert
+        self._items: dict[tuple, tuple[pd.Index, T]] = {}
+
+    def get(
+        self, file_path: str, sheet_name: str, col_idx: int, column: pd.Series
+    ) -> T:
+        """Return the converted column, converting it when it is not cached yet"""
+        key: tuple = (
+            os.path.abspath(file_path),
+            sheet_name,
+            col_idx,
+            os.path.getmtime(file_path) if os.path.exists(file_path) else None,
+        )
+        item: Optional[tuple[pd.Index, T]] = self._items.get(key)
+        if item is None or not item[0].equals(column.index):
+            item = (column.index, self.convert(column))
+            self._items[key] = item
+        return item[1]
+
+    def clear(self) -> None:
+        """Drop every converted column of the session"""
+        self._items.clear()
@@ -0,0 +1,218 @@
+import os
+import re
+import sqlite3
+import tempfile
+from typing import Any, Optional
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+from common.xlsx_stream import convert_value, iter_columns
+
+## DuckDB is optional: columnar, multi-threaded and able to spill to disk.
+## Without it the rules run on SQLite with its temporary storage on disk
+try:
+    import duckdb  # type: ignore
+except ImportError:
+    duckdb = None
+
+## Name of the column with the index of the data frame in every table
+ROW_ID: str = "_row"
+
+## Rows of a sheet inserted at a time by register_sheet
+CHUNK_SIZE: int = 50_000
+
+## Memory limits DuckDB accepts: a number and a unit ("4GB", "512MiB")
+MEMORY_LIMIT: re.Pattern = re.compile(
+    r"\d+(\.\d+)?\s*(B|KB|MB|GB|TB|KiB|MiB|GiB|TiB)", re.IGNORECASE
+)
+
+
+def cell_text(value: Any) -> Optional[str]:
+    """Text of a cell as pd.read_excel(dtype=str) gives it, None when empty"""
+    value = convert_value(value)
+    if value == "" or (isinstance(value, float) and np.isnan(value)):
+        return None
+    return str(value)
+
+
+class SqlEngine:
+    """In-process SQL engine to run the join and anti-join rules over the bases.
+    The columns of each table are named by position (c0, c1, ...) to write the
+    rules with the same indexes used by pandas (iloc). Only the columns a rule
+    uses are registered, and the large bases can be streamed from their files
+    without loading them in pandas. The queries must be sorted by _row to give
+    the rows in the order of the sheet"""
+
+    def __init__(
+        self,
+        threads: Optional[int] = None,
+        memory_limit: Optional[str] = None,
+        temp_directory: Optional[str] = None,
+    ):
+        self.temp_directory = temp_directory or tempfile.gettempdir()
+        ## Database file of SQLite, removed when the engine is closed
+        self.database: Optional[str] = None
+        if memory_limit and not MEMORY_LIMIT.fullmatch(str(memory_limit).strip()):
+            raise ValueError(f"memory_limit not valid: {memory_limit}")
+        if duckdb is not None:
+            self.name = "duckdb"
+            self.connection = duckdb.connect(database=":memory:")
+            self.connection.execute(f"SET threads TO {int(threads or os.cpu_count())}")
+            ## Quotes are doubled inside SQL texts
+            temp_directory: str = self.temp_directory.replace("'", "''")
+            self.connection.execute(f"SET temp_directory = '{temp_directory}'")
+            if memory_limit:
+                self.connection.execute(
+                    f"SET memory_limit = '{str(memory_limit).strip()}'"
+                )
+        else:
+            self.name = "sqlite"
+            ## The tables are written into a temporary file, only its page cache
+            ## stays in memory
+            handle, self.database = tempfile.mkstemp(
+                suffix=".sqlite", dir=self.temp_directory
+            )
+            os.close(handle)
+            self.connection = sqlite3.connect(self.database)
+            ## Scratch database: no journal and no waiting for the disk
+            self.connection.execute("PRAGMA journal_mode = OFF")
+            self.connection.execute("PRAGMA synchronous = OFF")
+            self.connection.execute("PRAGMA temp_store = FILE")
+        self.tables: dict[str, pd.DataFrame] = {}
+
+    def register(
+        self,
+        name: str,
+        data_frame: pd.DataFrame,
+        col_idxs: Optional[list[int]] = None,
+    ) -> None:
+        """Register the columns given (every one by default) of a data frame as a
+        table. The text columns are registered as text (empty cells as NULL) and
+        the index is kept into the _row column"""
+        if col_idxs is None:
+            col_idxs = list(range(data_frame.shape[1]))
+        table: pd.DataFrame = pd.DataFrame(
+            {f"c{i}": data_frame.iloc[:, i].reset_index(drop=True) for i in col_idxs}
+        )
+        for column in table.columns:
+            if table[column].dtype == object:
+                table[column] = table[column].where(
+                    table[column].isna(), table[column].astype(str)
+                )
+        table.insert(0, ROW_ID, data_frame.index.to_numpy())
+        if self.name == "duckdb":
+            self.connection.register(name, table)
+            ## Keep a reference, DuckDB reads the data frame when the query runs
+            self.tables[name] = table
+        else:
+            table.to_sql(name, self.connection, index=False, if_exists="replace")
+
+    def register_sheet(
+        self, name: str, file_path: str, sheet_name: str, col_idxs: list[int]
+    ) -> None:
+        """Stream the columns given of a sheet into a table, as text (the values
+        pd.read_excel(dtype=str) gives), without loading the sheet in pandas.
+        _row is the index pd.read_excel gives to each row"""
+        columns: list[str] = [ROW_ID] + [f"c{i}" for i in col_idxs]
+        self.connection.execute(f"DROP TABLE IF EXISTS {name}")
+        self.connection.execute(
+            f"CREATE TABLE {name} ({ROW_ID} BIGINT, "
+            + ", ".join(f"{column} VARCHAR" for column in columns[1:])
+            + ")"
+        )
+        chunk: list[tuple] = []
+        for row_id, values in enumerate(
+            iter_columns(file_path, sheet_name, col_idxs)
+        ):
+            chunk.append((row_id, *(cell_text(value) for value in values)))
+            if len(chunk) >= CHUNK_SIZE:
+                self._insert(name, columns, chunk)
+                chunk = []
+        if chunk:
+            self._insert(name, columns, chunk)
+
+    def _insert(self, name: str, columns: list[str], chunk: list[tuple]) -> None:
+        if self.name == "duckdb":
+            self.connection.register("_chunk", pd.DataFrame(chunk, columns=columns))
+            self.connection.execute(f"INSERT INTO {name} SELECT * FROM _chunk")
+            self.connection.unregister("_chunk")
+        else:
+            self.connection.executemany(
+                f"INSERT INTO {name} VALUES ({', '.join('?' * len(columns))})", chunk
+            )
+
+    def same(self, left: str, right: str) -> str:
+        """SQL condition of two equal values, the NULL values are equal to each
+        other (as pandas compares the keys of a merge)"""
+        if self.name == "duckdb":
+            return f"{left} IS NOT DISTINCT FROM {right}"
+        return f"{left} IS {right}"
+
+    def query(self, sql: str, params: tuple = ()) -> pd.DataFrame:
+        """Run a query and return the result as a data frame, the NULL values
+        are NaN as pandas reads the empty cells"""
+        if self.name == "duckdb":
+            result: pd.DataFrame = self.connection.execute(sql, list(params)).df()
+        else:
+            result = pd.read_sql_query(sql, self.connection, params=params)
+        return result.fillna(np.nan)
+
+    def rows(self, sql: str, params: tuple = ()) -> pd.Index:
+        """Run a query that selects the _row column and return the indexes,
+        to get the rows from the data frame registered"""
+        return pd.Index(self.query(sql, params)[ROW_ID])
+
+    def left_join(
+        self,
+        left: pd.DataFrame,
+        right: pd.DataFrame,
+        left_idx: int,
+        right_idx: int,
+        suffixes: tuple[str, str] = ("_x", "_y"),
+    ) -> pd.DataFrame:
+        """Left join of two data frames by a column of each one, the same frame
+        left.merge(right, how="left") gives. Only the key columns are registered,
+        the rows are taken back from the data frames so they keep their types"""
+        self.register("_left", left, [left_idx])
+        self.register("_right", right, [right_idx])
+        pairs: pd.DataFrame = self.query(
+            f"SELECT l.{ROW_ID} AS left_row, r.{ROW_ID} AS right_row"
+            " FROM _left l LEFT JOIN _right r"
+            f" ON {self.same(f'l.c{left_idx}', f'r.c{right_idx}')}"
+            f" ORDER BY l.{ROW_ID}, r.{ROW_ID}"
+        )
+        ## The names of the columns are the ones merge gives
+        columns: pd.Index = (
+            left.iloc[:0]
+            .merge(
+                right.iloc[:0],
+                how="left",
+                left_on=left.columns[left_idx],
+                right_on=right.columns[right_idx],
+                suffixes=suffixes,
+            )
+            .columns
+        )
+        if len(columns) < left.shape[1] + right.shape[1]:
+            ## Keys with the same name are kept once
+            right = right.drop(columns=right.columns[right_idx])
+        merged: pd.DataFrame = pd.concat(
+            [
+                left.loc[pairs["left_row"]].reset_index(drop=True),
+                right.reindex(pairs["right_row"]).reset_index(drop=True),
+            ],
+            axis=1,
+        )
+        merged.columns = columns
+        return merged
+
+    def close(self) -> None:
+        self.tables.clear()
+        self.connection.close()
+        if self.database is not None and os.path.exists(self.database):
+            os.remove(self.database)
+
+    def __enter__(self) -> "SqlEngine":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
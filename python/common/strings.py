@@ -0,0 +1,33 @@
+from typing import NamedTuple
+import pandas as pd  # type: ignore
+from common.session_cache import ColumnCache
+
+
+class StringView(NamedTuple):
+    """Column converted to text once: the values as astype(str) leaves them and
+    the mask of the empty cells, to check them without comparing with "nan\""""
+
+    values: pd.Series
+    is_null: pd.Series
+
+
+def string_view(column: pd.Series) -> StringView:
+    """Convert a column to text and keep its empty cells apart"""
+    return StringView(column.astype(str), column.isna())
+
+
+## Text columns of the current session
+_cache: ColumnCache[StringView] = ColumnCache(string_view)
+
+
+def cached_strings(
+    file_path: str, sheet_name: str, col_idx: int, column: pd.Series
+) -> StringView:
+    """Return the text column from the session cache, converting it on the first
+    call or when the column has other rows (index) than the cached one"""
+    return _cache.get(file_path, sheet_name, col_idx, column)
+
+
+def clear_cache() -> None:
+    """Drop every text column of the session"""
+    _cache.clear()
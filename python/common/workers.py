@@ -0,0 +1,91 @@
+import atexit
+import importlib.util
+import inspect
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from types import ModuleType
+from typing import Any, Callable, Optional
+
+## Scripts loaded by the workers, by path
+_scripts: dict[str, ModuleType] = {}
+## Pool shared by the calls of the bot, started on the first one
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers: int = 0
+
+
+def _load_script(script_path: str) -> ModuleType:
+    """Load a bot script by its path, once per worker"""
+    if script_path not in _scripts:
+        name: str = "worker_" + os.path.splitext(os.path.basename(script_path))[0]
+        spec = importlib.util.spec_from_file_location(name, script_path)
+        module: ModuleType = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _scripts[script_path] = module
+    return _scripts[script_path]
+
+
+def _call(script_path: str, function: str, args: tuple) -> Any:
+    return getattr(_load_script(script_path), function)(*args)
+
+
+def can_spawn() -> bool:
+    """The workers are started with the interpreter of the bot, it must be a
+    python executable (not a host application embedding python)"""
+    executable: str = os.path.basename(sys.executable or "").lower()
+    return executable.startswith("python")
+
+
+def _shared_pool(workers: int) -> ProcessPoolExecutor:
+    """Return the pool of the bot, starting it again when a worker died or other
+    number of workers is requested. The workers load each script once, so the
+    next calls do not pay the start of the processes or the imports again"""
+    global _pool, _pool_workers
+    if _pool is None or _pool_workers != workers or getattr(_pool, "_broken", False):
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+        ## spawn is the only start method on Windows, the same one is used everywhere
+        _pool = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        _pool_workers = workers
+    return _pool
+
+
+@atexit.register
+def _shutdown_pool() -> None:
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+
+
+def run_processes(
+    function: Callable, jobs: list[tuple], workers: Optional[int] = None
+) -> list:
+    """Call a module level function of a bot script with each tuple of arguments
+    in a pool of processes and return the results in order.
+    The bot and the pipeline load the scripts by path under names that spawn can
+    not import again, so the workers load the script from its file and look the
+    function up by name. The pool is kept for the next calls of the bot. The jobs
+    run one after another in this process when there is only one or the host can
+    not start processes"""
+    if len(jobs) < 2 or not can_spawn():
+        return [function(*args) for args in jobs]
+
+    script_path: str = os.path.abspath(inspect.getfile(function))
+    try:
+        executor: ProcessPoolExecutor = _shared_pool(
+            workers or os.cpu_count() or 1
+        )
+        futures: list = [
+            executor.submit(_call, script_path, function.__name__, args)
+            for args in jobs
+        ]
+    except OSError:
+        ## The host can not start processes
+        return [function(*args) for args in jobs]
+    try:
+        return [future.result() for future in futures]
+    except BrokenProcessPool:
+        return [function(*args) for args in jobs]
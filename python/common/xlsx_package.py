@@ -0,0 +1,89 @@
+import copy
+import os
+import posixpath
+import shutil
+import tempfile
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import IO, Callable
+
+REL_NS: str = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+MAIN_NS: str = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+DOC_REL_NS: str = (
+    "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+)
+
+
+def rels_path(part: str) -> str:
+    """Path of the relationships part of a part of the package"""
+    folder, name = posixpath.split(part)
+    return posixpath.join(folder, "_rels", f"{name}.rels")
+
+
+def read_rels(package: zipfile.ZipFile, part: str) -> dict[str, str]:
+    """Return {relationship id: target part} of a part of the package"""
+    path: str = rels_path(part)
+    if path not in package.namelist():
+        return {}
+    folder: str = posixpath.dirname(part)
+    targets: dict[str, str] = {}
+    for rel in ET.fromstring(package.read(path)).iter(f"{REL_NS}Relationship"):
+        target: str = rel.get("Target")
+        targets[rel.get("Id")] = (
+            target.lstrip("/")
+            if target.startswith("/")
+            else posixpath.normpath(posixpath.join(folder, target))
+        )
+    return targets
+
+
+def sheet_part(package: zipfile.ZipFile, sheet_name: str) -> str:
+    """Return the path of the worksheet part of the sheet given"""
+    workbook = ET.fromstring(package.read("xl/workbook.xml"))
+    workbook_rels: dict[str, str] = read_rels(package, "xl/workbook.xml")
+    for sheet in workbook.iter(f"{MAIN_NS}sheet"):
+        if sheet.get("name") == sheet_name:
+            return workbook_rels[sheet.get(f"{DOC_REL_NS}id")]
+    raise ValueError(f"The sheet '{sheet_name}' does not exist")
+
+
+def rewrite_package(
+    file_path: str, parts: dict[str, Callable[[IO[bytes], IO[bytes]], None]]
+) -> None:
+    """Replace some parts of the package without loading the workbook. Each
+    function reads the original part and writes the new one, so a large part is
+    streamed. Every other part is copied as it is and the replaced parts are
+    written at the end, in the order given. The package is written into a
+    temporal file that replaces the original one"""
+    folder: str = os.path.dirname(os.path.abspath(file_path))
+    with tempfile.NamedTemporaryFile(dir=folder, suffix=".xlsx", delete=False) as temp:
+        temp_path: str = temp.name
+    try:
+        with zipfile.ZipFile(file_path) as package, zipfile.ZipFile(
+            temp_path, "w", compression=zipfile.ZIP_DEFLATED
+        ) as output:
+            infos: dict[str, zipfile.ZipInfo] = {
+                item.filename: item for item in package.infolist()
+            }
+            missing: list[str] = [part for part in parts if part not in infos]
+            if missing:
+                raise ValueError(f"The parts {', '.join(missing)} do not exist")
+            for item in package.infolist():
+                if item.filename in parts:
+                    continue
+                ## Writing updates the sizes of the info, use a copy of it
+                with package.open(item.filename) as source, output.open(
+                    copy.copy(item), "w"
+                ) as target:
+                    shutil.copyfileobj(source, target)
+            for part, rewrite in parts.items():
+                item = zipfile.ZipInfo(part, infos[part].date_time)
+                item.compress_type = zipfile.ZIP_DEFLATED
+                with package.open(part) as source, output.open(
+                    item, "w", force_zip64=True
+                ) as target:
+                    rewrite(source, target)
+    except Exception:
+        os.remove(temp_path)
+        raise
+    os.replace(temp_path, file_path)
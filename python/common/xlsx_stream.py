@@ -0,0 +1,339 @@
+from datetime import date, datetime
+from typing import Any, Callable, Iterator, Optional, Union
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+from openpyxl import Workbook, load_workbook  # type: ignore
+from openpyxl.cell import WriteOnlyCell  # type: ignore
+from openpyxl.cell.cell import ERROR_CODES  # type: ignore
+from openpyxl.styles import Font  # type: ignore
+from pandas.io.parsers import TextParser  # type: ignore
+from common.backend import pandas_column_names
+from common.dates import KNOWN_FORMATS
+
+## XlsxWriter is optional: its constant_memory mode flushes each row to disk.
+## Without it the sheets are written with the write-only mode of openpyxl
+try:
+    import xlsxwriter  # type: ignore
+except ImportError:
+    xlsxwriter = None
+
+## Formats of the dates written, the same pandas uses with to_excel
+DATETIME_FORMAT: str = "yyyy-mm-dd hh:mm:ss"
+DATE_FORMAT: str = "yyyy-mm-dd"
+
+
+def iter_columns(
+    file_path: str, sheet_name: str, col_idxs: list[int], header: bool = True
+) -> Iterator[tuple]:
+    """Yield the values of the columns given (0-based) row by row, reading the
+    sheet in read-only mode without loading the workbook in memory"""
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet_name]
+        ## The dimension saved in the file can be stale and cut the rows
+        worksheet.reset_dimensions()
+        ## Only the cells between the first and the last column requested are read
+        first, last = min(col_idxs), max(col_idxs)
+        positions: list[int] = [col_idx - first for col_idx in col_idxs]
+        for row in worksheet.iter_rows(
+            min_row=2 if header else 1,
+            min_col=first + 1,
+            max_col=last + 1,
+            values_only=True,
+        ):
+            ## Short rows are filled with None
+            row = row + (None,) * (last - first + 1 - len(row))
+            yield tuple(row[position] for position in positions)
+    finally:
+        workbook.close()
+
+
+def convert_value(value: Any) -> Any:
+    """Convert a cell value as pandas does with openpyxl: empty cells as "",
+    errors as NaN and the numbers without decimals as int"""
+    if value is None:
+        return ""
+    if isinstance(value, str) and value in ERROR_CODES:
+        return np.nan
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def iter_frames(
+    file_path: str,
+    sheet_name: str,
+    chunk_size: int,
+    max_col: Optional[int] = None,
+    dtype: Any = None,
+) -> Iterator[pd.DataFrame]:
+    """Yield the sheet as data frames of chunk_size rows, reading it in read-only
+    mode. The chunks have the column names and types pd.read_excel gives (with
+    the same dtype param) and the index of each row in the whole sheet, so
+    row.name + 2 is the Excel row. Only one chunk is kept in memory at a time"""
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet_name]
+        worksheet.reset_dimensions()
+        rows = worksheet.iter_rows(max_col=max_col, values_only=True)
+        header: list = [convert_value(value) for value in next(rows, ())]
+        while header and header[-1] == "":
+            header.pop()
+        width: int = max_col or len(header)
+        columns: list[str] = pandas_column_names(
+            [value if value != "" else None for value in header]
+            + [None] * (width - len(header))
+        )
+
+        chunk: list[list] = []
+        ## Empty rows are kept only when there are rows with data after them
+        empty_rows: list[list] = []
+        start: int = 0
+        for row in rows:
+            values: list = [convert_value(value) for value in row[:width]]
+            values += [""] * (width - len(values))
+            if all(value == "" for value in values):
+                empty_rows.append(values)
+                continue
+            chunk += empty_rows
+            empty_rows = []
+            chunk.append(values)
+            if len(chunk) >= chunk_size:
+                yield _to_frame(chunk[:chunk_size], columns, start, dtype)
+                start += chunk_size
+                chunk = chunk[chunk_size:]
+        if chunk:
+            yield _to_frame(chunk, columns, start, dtype)
+    finally:
+        workbook.close()
+
+
+def _to_frame(
+    chunk: list[list], columns: list[str], start: int, dtype: Any = None
+) -> pd.DataFrame:
+    data_frame: pd.DataFrame = TextParser(
+        chunk, header=None, names=columns, dtype=dtype
+    ).read()
+    data_frame.index = pd.RangeIndex(start, start + len(data_frame))
+    return data_frame
+
+
+def select_rows(
+    file_path: str,
+    sheet_name: str,
+    rows: pd.Index,
+    chunk_size: int = 50_000,
+    dtype: Any = None,
+) -> pd.DataFrame:
+    """Read only the rows given (by their index in the sheet, as pd.read_excel
+    numbers them) in chunks, in the order of rows. The rows found by a query
+    are read without loading the whole sheet"""
+    wanted: set = set(rows)
+    selected: list[pd.DataFrame] = []
+    columns: list[str] = []
+    for chunk in iter_frames(file_path, sheet_name, chunk_size, dtype=dtype):
+        columns = list(chunk.columns)
+        selected.append(chunk[chunk.index.isin(wanted)])
+    if not selected:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(selected).loc[rows]
+
+
+def iter_column(
+    file_path: str, sheet_name: str, col_idx: int, header: bool = True
+) -> Iterator[Any]:
+    """Yield the non empty values of a single column"""
+    for (value,) in iter_columns(file_path, sheet_name, [col_idx], header):
+        if value is not None and value != "":
+            yield value
+
+
+def reduce_column(
+    file_path: str,
+    sheet_name: str,
+    col_idx: int,
+    reduction: str,
+    transform: Optional[Callable[[Any], Any]] = None,
+    header: bool = True,
+) -> Any:
+    """Reduce a column while it is read: "min", "max", "count" or "distinct"
+    (sorted list). transform is applied to each non empty value first"""
+    values: Iterator[Any] = iter_column(file_path, sheet_name, col_idx, header)
+    if transform is not None:
+        values = map(transform, values)
+
+    if reduction == "min":
+        return min(values, default=None)
+    if reduction == "max":
+        return max(values, default=None)
+    if reduction == "count":
+        return sum(1 for _ in values)
+    if reduction == "distinct":
+        return sorted(set(values))
+    raise ValueError(f"Reduction not supported: {reduction}")
+
+
+def to_datetime(value: Any) -> Optional[datetime]:
+    """Convert a cell value into datetime using the known formats, None if it is not a date"""
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    if isinstance(value, str):
+        for date_format in KNOWN_FORMATS:
+            try:
+                return datetime.strptime(value.strip(), date_format)
+            except ValueError:
+                continue
+    return None
+
+
+def filter_copy(
+    sources: list[tuple[str, str]],
+    dest_file: str,
+    dest_sheet: str,
+    date_col: Union[int, str],
+    begin_date: datetime,
+    end_date: datetime,
+    max_col: Optional[int] = None,
+) -> int:
+    """Copy the rows with the date column between begin_date and end_date (both
+    included) from the (file, sheet) sources into a new workbook, row by row.
+    The header is taken from the first source and the rows of every source are
+    appended under it. date_col is the header name or the 0-based position, the
+    dates are written as datetime. The rows with an empty date are not copied
+    and the ones with a date that can not be read raise a ValueError, as
+    pd.to_datetime does. Return the number of rows copied"""
+    output = Workbook(write_only=True)
+    output_sheet = output.create_sheet(dest_sheet)
+    rows_copied: int = 0
+    col_idx: Optional[int] = date_col if isinstance(date_col, int) else None
+    ## Excel rows of each sheet with a date that can not be read
+    wrong_dates: dict[str, list[int]] = {}
+
+    try:
+        for n, (file_path, sheet_name) in enumerate(sources):
+            workbook = load_workbook(file_path, read_only=True, data_only=True)
+            try:
+                worksheet = workbook[sheet_name]
+                ## The dimension saved in the file can be stale and cut the rows
+                worksheet.reset_dimensions()
+                rows = worksheet.iter_rows(max_col=max_col, values_only=True)
+                header: tuple = next(rows, ())
+                if n == 0:
+                    if col_idx is None and date_col not in header:
+                        raise ValueError(
+                            f"the column '{date_col}' is missing in the sheet"
+                            f" '{sheet_name}'"
+                        )
+                    if col_idx is None:
+                        col_idx = list(header).index(date_col)
+                    if col_idx >= len(header):
+                        raise ValueError(
+                            f"the column {col_idx} is missing in the sheet"
+                            f" '{sheet_name}', it has {len(header)} columns"
+                        )
+                    output_sheet.append(header)
+
+                for row_number, row in enumerate(rows, start=2):
+                    if col_idx >= len(row) or row[col_idx] in (None, ""):
+                        continue
+                    value: Optional[datetime] = to_datetime(row[col_idx])
+                    if value is None:
+                        wrong_dates.setdefault(sheet_name, []).append(row_number)
+                        continue
+                    if not begin_date <= value <= end_date:
+                        continue
+                    row = list(row)
+                    row[col_idx] = value
+                    output_sheet.append(row)
+                    rows_copied += 1
+            finally:
+                workbook.close()
+
+        if wrong_dates:
+            raise ValueError(
+                "dates that can not be read: "
+                + "; ".join(
+                    f"{len(numbers)} rows of '{sheet_name}' (rows"
+                    f" {', '.join(map(str, numbers[:10]))}"
+                    f"{', ...' if len(numbers) > 10 else ''})"
+                    for sheet_name, numbers in wrong_dates.items()
+                )
+            )
+    except Exception:
+        ## Close the temporary file of the rows written, the workbook is not saved
+        output_sheet.close()
+        raise
+    output.save(dest_file)
+    return rows_copied
+
+
+def cell_value(value: Any) -> Any:
+    """Convert a value of a data frame into a cell value: None for the empty
+    values, datetime for the timestamps and Python types for the numpy ones"""
+    if isinstance(value, pd.Timestamp):
+        return None if pd.isna(value) else value.to_pydatetime()
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not np.isfinite(value):
+        ## Infinite values are written as text, as to_excel does
+        return None if np.isnan(value) else str(value)
+    if value is None or value is pd.NA or value is pd.NaT:
+        return None
+    return value
+
+
+def iter_rows(data_frame: pd.DataFrame, index: bool = False) -> Iterator[list]:
+    """Yield the header and the rows of a data frame as cell values"""
+    header: list = [str(name) for name in data_frame.columns]
+    if index:
+        header = [data_frame.index.name or ""] + header
+    yield header
+    for row in data_frame.itertuples(index=index, name=None):
+        yield [cell_value(value) for value in row]
+
+
+def write_frame(
+    data_frame: pd.DataFrame, file_path: str, sheet_name: str, index: bool = False
+) -> None:
+    """Write a data frame into a new workbook row by row, as to_excel does but
+    without building the whole sheet in memory. The header is bold and the dates
+    keep their format"""
+    rows: Iterator[list] = iter_rows(data_frame, index)
+    if xlsxwriter is not None:
+        workbook = xlsxwriter.Workbook(
+            file_path, {"constant_memory": True, "strings_to_urls": False}
+        )
+        try:
+            worksheet = workbook.add_worksheet(sheet_name)
+            bold = workbook.add_format({"bold": True})
+            datetime_format = workbook.add_format({"num_format": DATETIME_FORMAT})
+            date_format = workbook.add_format({"num_format": DATE_FORMAT})
+            worksheet.write_row(0, 0, next(rows), bold)
+            for row_idx, row in enumerate(rows, start=1):
+                for col_idx, value in enumerate(row):
+                    if value is None:
+                        continue
+                    if isinstance(value, datetime):
+                        worksheet.write_datetime(row_idx, col_idx, value, datetime_format)
+                    elif isinstance(value, date):
+                        worksheet.write_datetime(row_idx, col_idx, value, date_format)
+                    else:
+                        worksheet.write(row_idx, col_idx, value)
+        finally:
+            workbook.close()
+        return
+
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(sheet_name)
+    header: list = []
+    for name in next(rows):
+        cell = WriteOnlyCell(worksheet, value=name)
+        cell.font = Font(bold=True)
+        header.append(cell)
+    worksheet.append(header)
+    ## openpyxl gives the dates their number format when the cells are created
+    for row in rows:
+        worksheet.append(row)
+    workbook.save(file_path)